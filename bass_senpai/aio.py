@@ -0,0 +1,100 @@
+"""asyncio runtime for bass-senpai."""
+import asyncio
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from .main import BassSenpai
+
+
+class AsyncBassSenpai(BassSenpai):
+    """BassSenpai driven by asyncio tasks instead of a blocking loop.
+    
+    Metadata polling and drawing run as separate tasks. playerctl calls go
+    to a worker thread and artwork fetch/decode runs on the ArtworkHandler
+    pool, so a slow fetch never delays the clock redraw. Terminal size is
+    only re-read on SIGWINCH, and SIGINT/SIGTERM cancel the tasks cleanly.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metadata_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bass-senpai-mpris')
+    
+    def _loop(self):
+        """Run the asyncio tasks until cancelled."""
+        asyncio.run(self._main())
+    
+    async def _main(self):
+        """Start the tasks and wire up signal handlers."""
+        loop = asyncio.get_running_loop()
+        self._redraw = asyncio.Event()
+        self._poll_now = asyncio.Event()
+        
+        self.ui._update_dimensions()
+        
+        main_task = asyncio.current_task()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, main_task.cancel)
+        loop.add_signal_handler(signal.SIGWINCH, self._on_resize)
+        self.mpris.on_change = lambda: loop.call_soon_threadsafe(self._poll_now.set)
+        self.artwork.on_ready = lambda: loop.call_soon_threadsafe(self._redraw.set)
+        
+        tasks = [
+            asyncio.ensure_future(self._metadata_task()),
+            asyncio.ensure_future(self._draw_task()),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGWINCH):
+                loop.remove_signal_handler(signum)
+            self.mpris.on_change = None
+            self.artwork.on_ready = None
+            self._metadata_executor.shutdown(wait=False)
+            self.running = False
+    
+    def _on_resize(self):
+        """SIGWINCH: re-read the terminal size and redraw."""
+        self.ui._update_dimensions()
+        self._redraw.set()
+    
+    async def _wait(self, event: asyncio.Event, timeout: Optional[float]):
+        """Wait for event or timeout, then clear it."""
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        event.clear()
+    
+    async def _metadata_task(self):
+        """Poll metadata on the scheduler's cadence or when the backend signals."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.stats.phase('metadata'):
+                metadata = await loop.run_in_executor(self._metadata_executor, self.mpris.get_metadata)
+            self.metadata = metadata
+            if metadata:
+                self.clock.sync(metadata['position'], metadata['status'])
+            self.scheduler.observe(metadata)
+            self._redraw.set()
+            
+            await self._wait(self._poll_now, self.scheduler.seconds_until_poll())
+    
+    async def _draw_task(self):
+        """Redraw at display rate while playing, otherwise only on changes."""
+        while True:
+            self.scheduler.record_wakeup()
+            with self.stats.phase('frame'):
+                state = self._current_state()
+                art_url = state.art_url if state else None
+                # Non-blocking: the placeholder is returned until the pool has the artwork
+                with self.stats.phase('artwork'):
+                    right_panel = self.artwork.render(art_url, self.ui.artwork_width, self.ui.artwork_height)
+                self._draw(state, right_panel)
+            self._frame_done()
+            timeout = self.update_interval if self.scheduler.state == 'Playing' else None
+            await self._wait(self._redraw, timeout)
@@ -1,66 +1,339 @@
 """Album artwork handling with caching and Kitty protocol support."""
 import os
+import sys
 import hashlib
 import tempfile
 import base64
+import json
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
-import requests
-from PIL import Image
+from typing import Optional, Tuple, Dict, List, Callable, NamedTuple, Union, BinaryIO, TYPE_CHECKING
+from .cache import DiskCache, DISK_CACHE_BYTES, DISK_CACHE_FILES, default_cache_dir
+from .pixels import PIXEL_HEADER, write_pixels, map_pixels
+from .palette import ENCODINGS, FG_256, BG_256, FG_16, BG_16, palette_indices
 from io import BytesIO
 
+# PIL and requests take longer to import than everything else together, so
+# they are only loaded once a cover is actually downloaded or decoded
+if TYPE_CHECKING:
+    import requests
+    from PIL import Image
+
+
+# Default memory budget for memoized render output
+RENDER_CACHE_BYTES = 4 * 1024 * 1024
+
+
+# Kitty transmission media: inline base64 PNG, or raw RGB the terminal reads itself
+KITTY_TRANSFERS = ('direct', 'file', 'temp', 'shm')
+
+# Kitty artwork is scaled to this many pixels per terminal cell
+KITTY_CELL_PIXELS = (10, 20)
+
+# Downloads larger than this are abandoned
+MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024
+DOWNLOAD_TIMEOUT = 5
+DOWNLOAD_CHUNK = 64 * 1024
+
+# Seconds before a cached HTTP cover is revalidated with its ETag/Last-Modified
+REVALIDATE_AFTER = 300
+
+# Seconds before a failed background fetch/decode is retried, doubling per failure
+RETRY_AFTER = 2.0
+RETRY_MAX = 300.0
+
+# Largest artwork tier in cells (see TerminalUI._calculate_artwork_size)
+LARGEST_TIER = (120, 60)
+
+# Modes Image.reduce() accepts; covers in other modes are converted first
+REDUCE_MODES = ('L', 'LA', 'RGB', 'RGBA')
+
+# Cached masters are reduced to the most pixels any tier will display
+MASTER_SIZE = (LARGEST_TIER[0] * KITTY_CELL_PIXELS[0], LARGEST_TIER[1] * KITTY_CELL_PIXELS[1])
+
+
+class KittyImage(NamedTuple):
+    """Artwork encoded for Kitty: transmitted once, then re-placed by id."""
+    image_id: int
+    transmit: str                       # Inline a=t command ('direct' medium)
+    pixel_path: Optional[Path] = None   # Pixel file for the local media
+    size: Tuple[int, int] = (0, 0)      # Pixel size of pixel_path
+
+
+def _colour_params(img: 'Image.Image') -> List[str]:
+    """SGR 'r;g;b' parameter string for every pixel of img, in raster order."""
+    pixel_count = img.width * img.height
+    rgbx = img.convert('RGBX')
+    # Few distinct colours: format each one once and map packed pixels onto them
+    counts = rgbx.getcolors(pixel_count // 4)
+    if counts is not None:
+        table = {int.from_bytes(bytes(colour), sys.byteorder): '%d;%d;%d' % colour[:3] for _, colour in counts}
+        return list(map(table.__getitem__, memoryview(rgbx.tobytes()).cast('I')))
+    data = img.convert('RGB').tobytes()
+    return list(map('%d;%d;%d'.__mod__, zip(data[0::3], data[1::3], data[2::3])))
+
+
+def encode_halfblocks(img: 'Image.Image', width: int, height: int, encoding: str = 'truecolor') -> List[str]:
+    """Encode a width x (height * 2) image as bordered half-block rows.
+    
+    Each cell is an upper half block (▀) with the top pixel as foreground
+    and the bottom pixel as background. SGR codes are only emitted when a
+    colour changes from the previous cell (merged into one sequence when
+    both change) and each row ends with a single reset. ``encoding`` is
+    one of ENCODINGS; the palette ones quantize to the nearest xterm
+    colour, which makes runs longer and every code shorter.
+    """
+    if encoding == 'truecolor':
+        colours = _colour_params(img)
+        fg_open, bg_open = '\x1b[38;2;', '\x1b[48;2;'
+    else:
+        # Whole SGR parameters: the foreground table for top rows, background for bottom rows
+        indices = palette_indices(img, encoding)
+        fg_table, bg_table = (FG_16, BG_16) if encoding == '16' else (FG_256, BG_256)
+        colours = []
+        for row in range(0, 2 * height * width, 2 * width):
+            colours += map(fg_table.__getitem__, indices[row:row + width])
+            colours += map(bg_table.__getitem__, indices[row + width:row + 2 * width])
+        fg_open, bg_open = '\x1b[', '\x1b['
+    bg_join = ';' + bg_open[2:]
+    lines = []
+    
+    for y in range(height):
+        row = 2 * y * width
+        parts = ['║']
+        fg = bg = None
+        for top, bottom in zip(colours[row:row + width], colours[row + width:row + 2 * width]):
+            if top != fg:
+                if bottom != bg:
+                    parts.append(fg_open + top + bg_join + bottom + 'm▀')
+                    bg = bottom
+                else:
+                    parts.append(fg_open + top + 'm▀')
+                fg = top
+            elif bottom != bg:
+                parts.append(bg_open + bottom + 'm▀')
+                bg = bottom
+            else:
+                parts.append('▀')
+        parts.append('\x1b[0m║')
+        lines.append(''.join(parts))
+    
+    return lines
+
+
+class RenderCache:
+    """Size-capped LRU of finished render output (escape sequence strings).
+    
+    ``on_evict`` is called with each value dropped over the cap, outside
+    the lock.
+    """
+    
+    def __init__(self, max_bytes: int = RENDER_CACHE_BYTES, on_evict: Optional[Callable[[object], None]] = None):
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Tuple[object, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple):
+        """Return cached output for key and mark it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Tuple, value, size: Optional[int] = None):
+        """Store output, evicting least recently used entries over the cap."""
+        if size is None:
+            size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        evicted = []
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (dropped, dropped_size) = self._entries.popitem(last=False)
+                self.size -= dropped_size
+                evicted.append(dropped)
+        if self.on_evict is not None:
+            for dropped in evicted:
+                self.on_evict(dropped)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 class ArtworkHandler:
     """Handles album artwork downloading, caching, and rendering."""
     
-    def __init__(self, cache_dir: Optional[Path] = None):
-        """Initialize artwork handler with cache directory."""
+    def __init__(self, cache_dir: Optional[Path] = None, background: bool = False, workers: int = 2,
+                 render_cache_bytes: int = RENDER_CACHE_BYTES, kitty_transfer: str = 'auto',
+                 cache_max_bytes: int = DISK_CACHE_BYTES, cache_max_files: int = DISK_CACHE_FILES,
+                 max_download_bytes: int = MAX_DOWNLOAD_BYTES, encoding: str = 'auto',
+                 frame_bytes: Optional[int] = None, read_only: bool = False):
+        """Initialize artwork handler with cache directory.
+        
+        Args:
+            cache_dir: Where downloaded artwork is cached
+            background: Fetch, decode and resize on a worker pool; render()
+                then returns the placeholder until the artwork is ready
+            workers: Size of the worker pool in background mode
+            render_cache_bytes: Memory cap for memoized render output
+            kitty_transfer: Kitty transmission medium, one of KITTY_TRANSFERS
+                or 'auto' (local file when not in an SSH session)
+            cache_max_bytes: Size limit of the on-disk cache
+            cache_max_files: File count limit of the on-disk cache
+            max_download_bytes: Size cap for a single artwork download
+            encoding: Text-art colour encoding, one of ENCODINGS or 'auto'
+                (the richest that fits frame_bytes)
+            frame_bytes: Byte budget for one text-art frame in 'auto' mode
+            read_only: Only use what another process (the daemon) put in
+                the cache: never download, write files or touch the index
+        """
         if cache_dir is None:
-            cache_dir = Path.home() / ".cache" / "bass-senpai" / "artwork"
+            cache_dir = default_cache_dir()
         
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.disk_cache = DiskCache(cache_dir, cache_max_bytes, cache_max_files, read_only=read_only)
+        self.max_download_bytes = max_download_bytes
+        self.encoding = encoding
+        self.frame_bytes = frame_bytes
+        self.last_encoding: Optional[str] = None  # Encoding of the last text-art render
+        
+        self.workers = workers
+        self._session: Optional['requests.Session'] = None
+        self._fetches: Dict[str, Future] = {}  # In-flight downloads by URL
+        self._transfer = threading.local()  # Bytes received by this thread, for prefetch()
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.read_only = read_only
         self.current_art_url = None
         self.current_cache_path = None
         self.is_kitty = self._detect_kitty()
+        self.kitty_transfer = kitty_transfer if kitty_transfer != 'auto' else self._detect_kitty_transfer()
+        self.render_cache = RenderCache(render_cache_bytes, on_evict=self._evicted)
+        self.kitty_image_id: Optional[int] = None  # Image currently held by the terminal
+        self._transfers: Dict[int, str] = {}  # Temp file / shm object last written per image id
+        
+        # Background pipeline state, keyed by (art_url, width, height)
+        self.on_ready: Optional[Callable[[], None]] = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bass-senpai-artwork') if background else None
+        self._jobs: Dict[Tuple[str, int, int], Future] = {}
+        self._ready: Dict[Tuple[str, int, int], Union[str, KittyImage]] = {}
+        self._failures: Dict[Tuple[str, int, int], Tuple[int, float]] = {}  # (failures, monotonic retry time)
+        self._wanted_url: Optional[str] = None
+        self._lock = threading.RLock()
+    
+    @property
+    def session(self) -> 'requests.Session':
+        """HTTP session with one keep-alive pool per host, shared by all workers.
+        
+        Created on the first download, so runs that only show cached or no
+        artwork never import requests.
+        """
+        with self._lock:
+            if self._session is None:
+                import requests
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max(self.workers, 1))
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
     
     def _detect_kitty(self) -> bool:
         """Detect if running in Kitty terminal."""
         term = os.environ.get('TERM', '')
         return 'kitty' in term.lower()
     
+    def _detect_kitty_transfer(self) -> str:
+        """Pick the Kitty medium: the terminal can only read our files if it is local."""
+        if any(key in os.environ for key in ('SSH_CONNECTION', 'SSH_CLIENT', 'SSH_TTY')):
+            return 'direct'
+        return 'file'
+    
     def _get_cache_path(self, art_url: str) -> Path:
         """Get cache file path for an artwork URL."""
         # Use hash of URL as filename
         url_hash = hashlib.md5(art_url.encode()).hexdigest()
         return self.cache_dir / f"{url_hash}.jpg"
     
+    def _meta_path(self, cache_path: Path) -> Path:
+        """Sidecar holding the HTTP validators of a cached cover."""
+        return cache_path.with_suffix('.meta')
+    
     def _download_artwork(self, art_url: str) -> Optional[Path]:
-        """Download artwork from URL and save to cache."""
+        """Download artwork from URL and save to cache.
+        
+        HTTP covers already in the cache are revalidated with their ETag /
+        Last-Modified once REVALIDATE_AFTER has passed; a 304 keeps the
+        cached file.
+        """
         try:
+            cache_path = self._get_cache_path(art_url)
+            
             # Handle file:// URLs
             if art_url.startswith('file://'):
                 local_path = art_url[7:]
-                cache_path = self._get_cache_path(art_url)
                 
                 # Copy local file to cache
                 with open(local_path, 'rb') as src:
-                    img = Image.open(src)
-                    img = img.convert('RGB')
-                    img.save(cache_path, 'JPEG', quality=85)
+                    self._count_received(os.fstat(src.fileno()).st_size)
+                    self._ingest(src, cache_path)
                 
+                self.disk_cache.add(cache_path)
                 return cache_path
             
-            # Download from HTTP(S)
-            response = requests.get(art_url, timeout=5)
-            response.raise_for_status()
+            # Download from HTTP(S), conditionally if we have a copy
+            meta_path = self._meta_path(cache_path)
+            headers = {}
+            meta = {}
+            if cache_path.exists():
+                try:
+                    meta = json.loads(meta_path.read_text())
+                except (OSError, ValueError):
+                    meta = {}
+                if meta.get('etag'):
+                    headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    headers['If-Modified-Since'] = meta['last_modified']
             
-            cache_path = self._get_cache_path(art_url)
+            with self.session.get(art_url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                if response.status_code == 304:
+                    body = None
+                else:
+                    response.raise_for_status()
+                    body = self._read_capped(response)
+                    if body is None:
+                        # Over the cap: a copy we are revalidating stays valid, validators and all
+                        return cache_path if cache_path.exists() else None
+                validators = {
+                    'etag': response.headers.get('ETag') or meta.get('etag'),
+                    'last_modified': response.headers.get('Last-Modified') or meta.get('last_modified'),
+                    'checked': time.time(),
+                }
             
             # Save as JPEG
-            img = Image.open(BytesIO(response.content))
-            img = img.convert('RGB')
-            img.save(cache_path, 'JPEG', quality=85)
+            if body is not None:
+                self._ingest(BytesIO(body), cache_path)
+                self.disk_cache.add(cache_path)
+            if validators['etag'] or validators['last_modified']:
+                meta_path.write_text(json.dumps(validators))
+                self.disk_cache.add(meta_path)
             
             return cache_path
         
@@ -68,6 +341,112 @@ class ArtworkHandler:
             # Silently fail, will use fallback
             return None
     
+    def _read_capped(self, response: 'requests.Response') -> Optional[bytes]:
+        """Read a streamed response body, or None if it exceeds max_download_bytes."""
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > self.max_download_bytes:
+            return None
+        
+        chunks = []
+        received = 0
+        try:
+            for chunk in response.iter_content(DOWNLOAD_CHUNK):
+                received += len(chunk)
+                if received > self.max_download_bytes:
+                    return None
+                chunks.append(chunk)
+        finally:
+            self._count_received(received)
+        return b''.join(chunks)
+    
+    def _count_received(self, size: int):
+        """Add to the bytes the current thread has received."""
+        self._transfer.received = getattr(self._transfer, 'received', 0) + size
+    
+    def _needs_revalidation(self, art_url: str, cache_path: Path) -> bool:
+        """Whether a cached HTTP cover is due for a conditional request."""
+        if art_url.startswith('file://'):
+            return False
+        try:
+            meta = json.loads(self._meta_path(cache_path).read_text())
+        except (OSError, ValueError):
+            return False  # No validators: nothing to revalidate with
+        return time.time() - meta.get('checked', 0) >= REVALIDATE_AFTER
+    
+    def _fetch_artwork(self, art_url: str) -> Optional[Path]:
+        """Cached cover for art_url, downloading (or revalidating) it if needed.
+        
+        Concurrent calls for the same URL share one download.
+        """
+        cache_path = self._get_cache_path(art_url)
+        if self.read_only:
+            return cache_path if cache_path.exists() else None
+        if cache_path.exists() and not self._needs_revalidation(art_url, cache_path):
+            self.disk_cache.touch(cache_path)
+            self.disk_hits += 1
+            return cache_path
+        self.disk_misses += 1
+        
+        with self._lock:
+            pending = self._fetches.get(art_url)
+            owner = pending is None
+            if owner:
+                pending = self._fetches[art_url] = Future()
+        if not owner:
+            return pending.result()
+        
+        try:
+            result = self._download_artwork(art_url)
+        finally:
+            with self._lock:
+                del self._fetches[art_url]
+        pending.set_result(result)
+        return result
+    
+    def prefetch(self, art_url: str) -> Optional[int]:
+        """Make sure art_url is in the cache, downloading it if needed.
+        
+        Returns the bytes this call transferred, 0 if the cover was cached
+        already (or another thread was downloading it), or None if it
+        could not be fetched.
+        """
+        self._transfer.received = 0
+        if self._fetch_artwork(art_url) is None:
+            return None
+        return self._transfer.received
+    
+    def _ingest(self, source: BinaryIO, cache_path: Path):
+        """Decode a cover at no more than MASTER_SIZE and store it as the cached JPEG.
+        
+        JPEGs are decoded with DCT scaling (draft), other formats are
+        shrunk by an integer reduce() first, so huge covers are never fully
+        decoded and the cache keeps a compact master instead of the original.
+        """
+        from PIL import Image
+        
+        with Image.open(source) as img:
+            # Only JPEG supports draft; it picks the smallest scale still >= MASTER_SIZE
+            img.draft('RGB', MASTER_SIZE)
+            factor = min(img.width // MASTER_SIZE[0], img.height // MASTER_SIZE[1])
+            if factor >= 2:
+                if img.mode not in REDUCE_MODES:
+                    # Palette, bilevel and 16-bit images: reduce() rejects them
+                    img = img.convert('RGB')
+                img = img.reduce(factor)
+            img = img.convert('RGB')
+        
+        if img.width > MASTER_SIZE[0] or img.height > MASTER_SIZE[1]:
+            # Less than 2x left to go; every tier is resampled from this again with LANCZOS
+            img.thumbnail(MASTER_SIZE, Image.Resampling.BILINEAR)
+        
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            img.save(tmp_path, 'JPEG', quality=85)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
     def get_artwork(self, art_url: Optional[str]) -> Optional[Path]:
         """Get artwork for the given URL, using cache if available."""
         if not art_url:
@@ -83,27 +462,86 @@ class ArtworkHandler:
         # Update current URL
         self.current_art_url = art_url
         
-        # Check cache first
-        cache_path = self._get_cache_path(art_url)
-        if cache_path.exists():
-            self.current_cache_path = cache_path
-            return cache_path
-        
-        # Download and cache
-        downloaded = self._download_artwork(art_url)
-        self.current_cache_path = downloaded
-        return downloaded
+        # Check cache first, then download and cache
+        cache_path = self._fetch_artwork(art_url)
+        self.current_cache_path = cache_path
+        return cache_path
     
     def render_kitty(self, image_path: Path, width: int = 40, height: int = 20) -> str:
         """Render image using Kitty graphics protocol."""
+        image = self._encode_kitty(image_path, width, height)
+        if image is None:
+            return ""
+        return self._place_kitty(image, height)
+    
+    def _pixel_path(self, image_path: Path, width: int, height: int, mode: str) -> Path:
+        """Pixel cache file for an artwork file, size tier and render mode."""
+        # Same stem as the cached JPEG, so both are evicted together
+        stem = Path(image_path).name.split('.', 1)[0]
+        return self.cache_dir / f"{stem}.{mode}{width}x{height}.px"
+    
+    def _scaled_pixels(self, image_path: Path, width: int, height: int, mode: str) -> 'Image.Image':
+        """Artwork resized for one size tier and render mode, via the pixel cache.
+        
+        Mode 'h' is the text-art geometry (width x height*2 half blocks),
+        mode 'k' the Kitty geometry (aspect-preserving, 10x20 px per cell).
+        A cache hit is memory-mapped: no JPEG decode and no resampling.
+        """
+        mtime_ns = Path(image_path).stat().st_mtime_ns
+        pixel_path = self._pixel_path(image_path, width, height, mode)
+        img = map_pixels(pixel_path, mtime_ns)
+        if img is not None:
+            return img
+        
+        from PIL import Image
+        with Image.open(image_path) as img:
+            if mode == 'k':
+                img.thumbnail((width * KITTY_CELL_PIXELS[0], height * KITTY_CELL_PIXELS[1]), Image.Resampling.LANCZOS)
+                # Convert to RGB (copies the pixels out of the file-backed image)
+                img = img.convert('RGB')
+            else:
+                img = img.resize((width, height * 2), Image.Resampling.LANCZOS).convert('RGB')
+        
+        if self.read_only:
+            return img
+        try:
+            write_pixels(pixel_path, img, mtime_ns)
+            self.disk_cache.add(pixel_path)
+        except OSError:
+            pass
+        return img
+    
+    def prepare(self, art_url: str, tiers: List[Tuple[int, int, str]]) -> Optional[Path]:
+        """Fetch artwork and pre-scale it for (width, height, mode) tiers.
+        
+        Afterwards any process rendering those tiers from the same cache
+        directory maps the pixels instead of decoding the JPEG.
+        """
+        cache_path = self._fetch_artwork(art_url)
+        if cache_path is None:
+            return None
+        for width, height, mode in tiers:
+            try:
+                self._scaled_pixels(cache_path, width, height, mode)
+            except Exception:
+                pass
+        return cache_path
+    
+    def _encode_kitty(self, image_path: Path, width: int, height: int) -> Optional[KittyImage]:
+        """Encode an image as a Kitty transmit-only (a=t) command with a stable id."""
         try:
-            # Load and resize image
-            img = Image.open(image_path)
-            img.thumbnail((width * 10, height * 20), Image.Resampling.LANCZOS)
+            img = self._scaled_pixels(image_path, width, height, 'k')
             
-            # Convert to RGB if needed
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+            # Same file version at the same size always gets the same id (1..2^31-1)
+            version = Path(image_path).stat().st_mtime_ns
+            digest = hashlib.md5(f"{image_path}|{version}|{width}x{height}".encode()).hexdigest()
+            image_id = int(digest[:8], 16) & 0x7fffffff or 1
+            
+            if self.kitty_transfer != 'direct':
+                # The terminal reads the pixels straight out of our pixel cache file
+                pixel_path = self._pixel_path(image_path, width, height, 'k')
+                if pixel_path.exists():
+                    return KittyImage(image_id, '', pixel_path, img.size)
             
             # Save to bytes
             buffer = BytesIO()
@@ -111,15 +549,15 @@ class ArtworkHandler:
             img_data = base64.b64encode(buffer.getvalue()).decode('ascii')
             
             # Kitty graphics protocol
-            # Using chunked transmission for large images
+            # Using chunked transmission for large images; q=2 silences replies
             chunk_size = 4096
             chunks = [img_data[i:i+chunk_size] for i in range(0, len(img_data), chunk_size)]
             
             output = []
             for i, chunk in enumerate(chunks):
                 if i == 0:
-                    # First chunk - specify format and size
-                    output.append(f"\x1b_Gf=100,a=T,m={(1 if i < len(chunks)-1 else 0)};{chunk}\x1b\\")
+                    # First chunk - specify format, id and size
+                    output.append(f"\x1b_Gf=100,a=t,i={image_id},q=2,m={(1 if i < len(chunks)-1 else 0)};{chunk}\x1b\\")
                 elif i == len(chunks) - 1:
                     # Last chunk
                     output.append(f"\x1b_Gm=0;{chunk}\x1b\\")
@@ -127,71 +565,250 @@ class ArtworkHandler:
                     # Middle chunks
                     output.append(f"\x1b_Gm=1;{chunk}\x1b\\")
             
-            # Add newlines to move cursor down after image
-            # The image will be displayed at current cursor position
-            # We need to advance the cursor to account for the image height
-            result = ''.join(output)
-            # Text-art format has: 1 top border + height content + 1 bottom border = height+2 lines
-            # For Kitty, we put the image on the first line, then add empty lines to match
-            lines = [result]
-            lines.extend([''] * (height + 1))  # height + 1 to match text-art's height + 2 total
-            return '\n'.join(lines)
+            return KittyImage(image_id, ''.join(output))
         
         except Exception as e:
-            return ""
+            return None
     
-    def render_textart(self, image_path: Path, width: int = 40, height: int = 20) -> str:
-        """Render image as colored text art using Unicode blocks."""
+    def _place_kitty(self, image: KittyImage, height: int) -> str:
+        """Place a Kitty image, transmitting it only if the terminal lacks it."""
+        output = []
+        if self.kitty_image_id != image.image_id:
+            # New artwork: free the old image and send the new one once
+            output.append(self.release_kitty())
+            output.append(self._kitty_transmit(image))
+            self.kitty_image_id = image.image_id
+        
+        # Fixed placement id, so each frame moves the placement instead of adding one
+        output.append(f"\x1b_Ga=p,i={image.image_id},p=1,q=2\x1b\\")
+        
+        # Add newlines to move cursor down after image
+        # The image will be displayed at current cursor position
+        # We need to advance the cursor to account for the image height
+        result = ''.join(output)
+        # Text-art format has: 1 top border + height content + 1 bottom border = height+2 lines
+        # For Kitty, we put the image on the first line, then add empty lines to match
+        lines = [result]
+        lines.extend([''] * (height + 1))  # height + 1 to match text-art's height + 2 total
+        return '\n'.join(lines)
+    
+    def _kitty_transmit(self, image: KittyImage) -> str:
+        """Build the a=t command for the configured transmission medium."""
+        if image.pixel_path is None:
+            return image.transmit
+        
+        width, height = image.size
+        length = width * height * 3
+        # The cache file has a header in front of the pixels; O/S select the pixels
+        medium, payload, window = 'f', str(image.pixel_path), f',O={PIXEL_HEADER.size},S={length}'
         try:
-            # Load and resize image
-            img = Image.open(image_path)
-            img = img.resize((width, height * 2), Image.Resampling.LANCZOS)
-            img = img.convert('RGB')
-            
-            pixels = img.load()
-            output = []
-            
-            # Top border
-            output.append('╔' + '═' * width + '╗')
-            
-            # Use half-block characters for better resolution
-            for y in range(0, height * 2, 2):
-                line = ['║']  # Left border
-                for x in range(width):
-                    # Get upper and lower pixel colors
-                    r1, g1, b1 = pixels[x, y]
-                    r2, g2, b2 = pixels[x, min(y + 1, height * 2 - 1)]
-                    
-                    # Use upper half block (▀) with appropriate colors
-                    # Top half is foreground, bottom half is background
-                    line.append(f"\x1b[38;2;{r1};{g1};{b1}m\x1b[48;2;{r2};{g2};{b2}m▀\x1b[0m")
-                
-                line.append('║')  # Right border
-                output.append(''.join(line))
+            if self.kitty_transfer in ('temp', 'shm'):
+                with open(image.pixel_path, 'rb') as f:
+                    f.seek(PIXEL_HEADER.size)
+                    pixels = f.read(length)
+            if self.kitty_transfer == 'temp':
+                # Kitty deletes temp files after reading; the name must contain this marker
+                fd, payload = tempfile.mkstemp(prefix='bass-senpai-tty-graphics-protocol-', suffix='.rgb')
+                with os.fdopen(fd, 'wb') as tmp:
+                    tmp.write(pixels)
+                self._transfers[image.image_id] = payload
+                medium, window = 't', ''
+            elif self.kitty_transfer == 'shm' and os.path.isdir('/dev/shm'):
+                # POSIX shared memory object (shm_open name); Kitty unlinks it after reading
+                payload = f"bass-senpai-{os.getpid()}-{image.image_id}"
+                fd = os.open(Path('/dev/shm') / payload, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, 'wb') as shm:
+                    shm.write(pixels)
+                self._transfers[image.image_id] = str(Path('/dev/shm') / payload)
+                medium, window = 's', ''
+        except OSError:
+            medium, payload, window = 'f', str(image.pixel_path), f',O={PIXEL_HEADER.size},S={length}'
+        
+        encoded = base64.b64encode(payload.encode()).decode('ascii')
+        return (f"\x1b_Ga=t,f=24,s={width},v={height},t={medium}{window},i={image.image_id},q=2;"
+                f"{encoded}\x1b\\")
+    
+    def release_kitty(self) -> str:
+        """Escape sequence deleting the image held by the terminal (if any)."""
+        if self.kitty_image_id is None:
+            return ''
+        image_id = self.kitty_image_id
+        self.kitty_image_id = None
+        self._discard_transfer(image_id)
+        # d=I also frees the image data, keeping terminal memory bounded
+        return f"\x1b_Ga=d,d=I,i={image_id},q=2\x1b\\"
+    
+    def _discard_transfer(self, image_id: int):
+        """Remove the temp file or shm object written for an image, if the terminal left it."""
+        path = self._transfers.pop(image_id, None)
+        if path is not None:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    
+    def _evicted(self, value):
+        """Clean up after a render cache entry dropped over the cap."""
+        if isinstance(value, KittyImage) and value.image_id != self.kitty_image_id:
+            self._discard_transfer(value.image_id)
+    
+    def render_textart(self, image_path: Path, width: int = 40, height: int = 20,
+                       encoding: Optional[str] = None) -> str:
+        """Render image as colored text art using Unicode blocks.
+        
+        With encoding 'auto' the richest of ENCODINGS whose output fits
+        frame_bytes is used (the smallest if none fits).
+        """
+        encoding = encoding or self.encoding
+        candidates = ENCODINGS if encoding == 'auto' else (encoding,)
+        try:
+            # Resized pixels straight from the pixel cache when possible
+            img = self._scaled_pixels(image_path, width, height, 'h')
             
-            # Bottom border
-            output.append('╚' + '═' * width + '╝')
+            for name in candidates:
+                output = ['╔' + '═' * width + '╗']
+                output.extend(encode_halfblocks(img, width, height, name))
+                output.append('╚' + '═' * width + '╝')
+                result = '\n'.join(output)
+                if self.frame_bytes is None or len(result.encode('utf-8')) <= self.frame_bytes:
+                    break
             
-            return '\n'.join(output)
+            self.last_encoding = name
+            return result
         
         except Exception as e:
             return ""
     
     def render(self, art_url: Optional[str], width: int = 40, height: int = 20) -> str:
         """Render artwork, automatically choosing best method."""
-        artwork_path = self.get_artwork(art_url)
+        if self._executor is not None:
+            result = self._render_background(art_url, width, height)
+        else:
+            artwork_path = self.get_artwork(art_url)
+            result = self._render_path(artwork_path, width, height)
+        
+        if isinstance(result, KittyImage):
+            return self._place_kitty(result, height)
+        
+        # Text art or placeholder: take any Kitty image off the screen first
+        return self.release_kitty() + result
+    
+    def _render_path(self, artwork_path: Optional[Path], width: int, height: int) -> Union[str, KittyImage]:
+        """Render a cached artwork file, or the placeholder if there is none.
+        
+        Kitty output is returned as a KittyImage, because what has to be
+        written depends on whether the terminal already holds the image.
+        """
+        try:
+            stat = artwork_path.stat() if artwork_path else None
+        except OSError:
+            stat = None
         
-        if not artwork_path or not artwork_path.exists():
+        if stat is None:
             # Return placeholder
             return self._render_placeholder(width, height)
         
+        # Same file, size and mode always produce the same output
+        mode = f'kitty-{self.kitty_transfer}' if self.is_kitty else f'textart-{self.encoding}-{self.frame_bytes}'
+        key = (str(artwork_path), stat.st_mtime_ns, width, height, mode)
+        cached = self.render_cache.get(key)
+        if cached is not None:
+            return cached
+        
         if self.is_kitty:
-            result = self.render_kitty(artwork_path, width, height)
-            if result:
-                return result
+            image = self._encode_kitty(artwork_path, width, height)
+            if image is not None:
+                # Local media carry only a path; charge them for the pixels they stand for
+                size = image.size[0] * image.size[1] * 3 if image.pixel_path else len(image.transmit)
+                self.render_cache.put(key, image, size=size)
+                return image
         
         # Fallback to text art
-        return self.render_textart(artwork_path, width, height)
+        result = self.render_textart(artwork_path, width, height)
+        
+        if result:
+            self.render_cache.put(key, result)
+        return result
+    
+    def _render_background(self, art_url: Optional[str], width: int, height: int) -> Union[str, KittyImage]:
+        """Return finished artwork or the placeholder, scheduling work as needed."""
+        if not art_url:
+            with self._lock:
+                self._drop_stale(None)
+            return self._render_placeholder(width, height)
+        
+        key = (art_url, width, height)
+        with self._lock:
+            if art_url != self._wanted_url:
+                self._drop_stale(art_url)
+            
+            ready = self._ready.get(key)
+            if ready is not None:
+                return ready
+            
+            failure = self._failures.get(key)
+            if key not in self._jobs and (failure is None or time.monotonic() >= failure[1]):
+                future = self._executor.submit(self._render_job, key)
+                self._jobs[key] = future
+                future.add_done_callback(lambda done, key=key: self._job_done(key, done))
+        
+        return self._render_placeholder(width, height)
+    
+    def _drop_stale(self, art_url: Optional[str]):
+        """Cancel jobs and forget results for anything but art_url (lock held)."""
+        self._wanted_url = art_url
+        for key in list(self._jobs):
+            if key[0] != art_url:
+                # Running jobs can't be interrupted; they notice and bail out
+                self._jobs.pop(key).cancel()
+        for key in list(self._ready):
+            if key[0] != art_url:
+                del self._ready[key]
+        for key in list(self._failures):
+            if key[0] != art_url:
+                del self._failures[key]
+    
+    def _render_job(self, key: Tuple[str, int, int]):
+        """Worker: download (if needed), decode and render one artwork size."""
+        art_url, width, height = key
+        cache_path = self._fetch_artwork(art_url)
+        
+        if self._wanted_url != art_url:
+            return  # Track changed during the download; skip the decode
+        
+        result = self._render_path(cache_path, width, height) if cache_path is not None else None
+        
+        with self._lock:
+            if self._wanted_url != art_url:
+                return
+            if not result:
+                # Keep showing the placeholder and retry later instead of caching the failure
+                failures = self._failures.get(key, (0, 0.0))[0] + 1
+                self._failures[key] = (failures, time.monotonic() + min(RETRY_AFTER * 2 ** (failures - 1), RETRY_MAX))
+                return
+            self._failures.pop(key, None)
+            self._ready[key] = result
+        
+        if self.on_ready is not None:
+            self.on_ready()
+    
+    def _job_done(self, key: Tuple[str, int, int], future: Future):
+        """Forget a finished job unless it was already replaced."""
+        with self._lock:
+            if self._jobs.get(key) is future:
+                del self._jobs[key]
+    
+    def close(self):
+        """Cancel pending background work, stop the worker pool, save the cache index and drop pooled connections."""
+        self.disk_cache.flush()
+        if self._executor is not None:
+            with self._lock:
+                for future in self._jobs.values():
+                    future.cancel()
+                self._jobs.clear()
+            self._executor.shutdown(wait=False)
+        if self._session is not None:
+            self._session.close()
     
     def _render_placeholder(self, width: int = 40, height: int = 20) -> str:
         """Render a placeholder when no artwork is available."""
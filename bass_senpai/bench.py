@@ -0,0 +1,251 @@
+"""Microbenchmarks for the bass-senpai hot paths."""
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Optional, Dict, List, Callable, Tuple
+from PIL import Image
+from .artwork import ArtworkHandler
+from .palette import ENCODINGS
+from .mpris import MPRISClient
+from .state import TrackState
+from .ui import TerminalUI
+
+BENCH_FORMAT = 'bass-senpai-bench 1'
+
+# Calls per case are divided by this weight (PNG encoding and spawning playerctl cost milliseconds)
+CASE_WEIGHTS = {'render_kitty': 50, 'mpris_get_metadata': 50}
+
+# Allocation tracing is slow, so it only looks at this many calls
+ALLOC_SAMPLES = 20
+
+BENCHMARKS = ('render_textart', 'render_textart_256', 'render_textart_16', 'render_kitty',
+              'render_track_info', 'render_split_layout', 'display_width', 'mpris_get_metadata')
+
+# Text-art size the per-encoding frame sizes are reported for
+ENCODING_TIER = (40, 20)
+
+FAKE_METADATA = 'Sigur Rós|Hoppípolla 🎵|Takk...|Playing|61000000|268000000|file://cover.png'
+
+
+def _cover(path: Path, size: int = 600) -> Path:
+    """Write a synthetic cover with gradients in every channel."""
+    gradient = Image.linear_gradient('L').resize((size, size))
+    radial = Image.radial_gradient('L').resize((size, size))
+    Image.merge('RGB', (gradient, radial, gradient.transpose(Image.Transpose.ROTATE_90))).save(path)
+    return path
+
+
+def sample_covers(directory: Path) -> Dict[str, Path]:
+    """Covers with different colour statistics: smooth, flat poster and photo-like noise."""
+    size = (300, 300)
+    noise = Image.effect_noise(size, 60)
+    photo = Image.merge('RGB', (noise, Image.linear_gradient('L').resize(size), noise.rotate(90)))
+    poster = photo.quantize(6).convert('RGB')
+    covers = {'gradient': _cover(directory / 'gradient.png', size[0])}
+    for name, img in (('poster', poster), ('photo', photo)):
+        img.save(directory / f'{name}.png')
+        covers[name] = directory / f'{name}.png'
+    return covers
+
+
+def encoding_sizes(workdir: Path) -> Dict[str, Dict[str, int]]:
+    """Bytes of one ENCODING_TIER text-art frame per sample cover and encoding."""
+    handler = ArtworkHandler(cache_dir=workdir / 'cache')
+    sizes = {}
+    try:
+        for name, path in sample_covers(workdir).items():
+            art_path = handler.get_artwork(f'file://{path}')
+            sizes[name] = {encoding: len(handler.render_textart(art_path, *ENCODING_TIER, encoding=encoding).encode())
+                           for encoding in ENCODINGS}
+    finally:
+        handler.close()
+    return sizes
+
+
+def _fake_playerctl(directory: Path) -> Path:
+    """Shell stand-in for playerctl that prints FAKE_METADATA."""
+    shim = directory / 'playerctl'
+    shim.write_text(f"#!/bin/sh\necho '{FAKE_METADATA}'\n")
+    shim.chmod(0o755)
+    return shim
+
+
+def build_cases(workdir: Path) -> Dict[str, Callable[[], object]]:
+    """Benchmark name -> zero-argument callable, using synthetic data in workdir."""
+    cover_url = f"file://{_cover(workdir / 'cover.png')}"
+    
+    textart = ArtworkHandler(cache_dir=workdir / 'cache', kitty_transfer='direct')
+    textart.is_kitty = False
+    art_path = textart.get_artwork(cover_url)
+    
+    kitty = ArtworkHandler(cache_dir=workdir / 'cache', kitty_transfer='direct')
+    kitty.is_kitty = True
+    
+    def render_kitty():
+        # A full transmit, as on a track change, not just a re-placement
+        kitty.release_kitty()
+        return kitty.render_kitty(art_path, 40, 20)
+    
+    ui = TerminalUI()
+    ui.term_width, ui.term_height = 120, 40
+    ui._calculate_artwork_size()
+    state = TrackState('Sigur Rós', 'Hoppípolla 🎵', 'Takk...', 'Playing', 61.5, 268.0, cover_url)
+    left = ui.render_track_info(state, ui.artwork_width)
+    right = textart.render_textart(art_path, ui.artwork_width, ui.artwork_height)
+    line = max(left.split('\n'), key=len)
+    
+    mpris = MPRISClient()
+    
+    return {
+        'render_textart': lambda: textart.render_textart(art_path, 40, 20),
+        'render_textart_256': lambda: textart.render_textart(art_path, 40, 20, encoding='256'),
+        'render_textart_16': lambda: textart.render_textart(art_path, 40, 20, encoding='16'),
+        'render_kitty': render_kitty,
+        'render_track_info': lambda: ui.render_track_info(state, ui.artwork_width),
+        'render_split_layout': lambda: ui.render_split_layout(left, right),
+        'display_width': lambda: ui._display_width(line),
+        'mpris_get_metadata': mpris.get_metadata,
+    }
+
+
+def _output_bytes(output) -> int:
+    """Size of what a case produced, for text or binary output."""
+    if isinstance(output, str):
+        return len(output.encode())
+    if isinstance(output, bytes):
+        return len(output)
+    return 0
+
+
+def measure(func: Callable[[], object], iterations: int, rounds: int = 3) -> Dict[str, float]:
+    """Time func over iterations calls (best of rounds) and sample its allocations."""
+    output = func()  # Warm caches and lazy imports
+    
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter_ns()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter_ns() - started
+        best = elapsed if best is None else min(best, elapsed)
+    
+    # Peak traced memory while one call runs, i.e. what it allocates on the way
+    samples = min(iterations, ALLOC_SAMPLES)
+    peak_total = 0
+    for _ in range(samples):
+        tracemalloc.start()
+        func()
+        peak_total += tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    
+    return {
+        'iterations': iterations,
+        'ns_per_op': best / iterations,
+        'alloc_bytes_per_op': peak_total / samples,
+        'output_bytes': _output_bytes(output),
+    }
+
+
+def run_benchmarks(iterations: int = 1000, names: Optional[List[str]] = None,
+                   progress: Optional[Callable[[str], None]] = None) -> dict:
+    """Run the selected benchmarks and return a JSON-serialisable report."""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='bass-senpai-bench-') as tmp:
+        workdir = Path(tmp)
+        (workdir / 'bin').mkdir()
+        _fake_playerctl(workdir / 'bin')
+        saved_path = os.environ.get('PATH', '')
+        os.environ['PATH'] = f"{workdir / 'bin'}{os.pathsep}{saved_path}"
+        try:
+            cases = build_cases(workdir)
+            for name, func in cases.items():
+                if names and name not in names:
+                    continue
+                if progress:
+                    progress(name)
+                results[name] = measure(func, max(1, iterations // CASE_WEIGHTS.get(name, 1)))
+            # Only worth the extra renders when a text-art case was asked for
+            encodings = encoding_sizes(workdir) if any(name.startswith('render_textart') for name in results) else {}
+        finally:
+            os.environ['PATH'] = saved_path
+    
+    return {
+        'format': BENCH_FORMAT,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'iterations': iterations,
+        'results': results,
+        'encodings': encodings,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> List[Tuple[str, float]]:
+    """Benchmarks whose ns/op grew by more than threshold percent, with the change."""
+    regressions = []
+    for name, result in report['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before or not before.get('ns_per_op'):
+            continue
+        change = (result['ns_per_op'] / before['ns_per_op'] - 1) * 100
+        if change > threshold:
+            regressions.append((name, change))
+    return regressions
+
+
+def format_report(report: dict, baseline: Optional[dict] = None) -> str:
+    """Human readable table of a report, with changes against a baseline."""
+    lines = [f"{'benchmark':<22}{'calls':>8}{'ns/op':>14}{'alloc B/op':>12}{'out B':>9}"
+             + (f"{'vs base':>10}" if baseline else '')]
+    for name, result in report['results'].items():
+        line = (f"{name:<22}{result['iterations']:>8}{result['ns_per_op']:>14,.0f}"
+                f"{result['alloc_bytes_per_op']:>12,.0f}{result['output_bytes']:>9}")
+        before = (baseline or {}).get('results', {}).get(name)
+        if before and before.get('ns_per_op'):
+            line += f"{(result['ns_per_op'] / before['ns_per_op'] - 1) * 100:>+9.1f}%"
+        lines.append(line)
+    
+    encodings = report.get('encodings')
+    if encodings:
+        lines.append('')
+        lines.append(f"{'bytes/frame ' + 'x'.join(map(str, ENCODING_TIER)):<22}"
+                     + ''.join(f'{encoding:>12}' for encoding in ENCODINGS))
+        for cover, sizes in encodings.items():
+            lines.append(f'{cover:<22}' + ''.join(f'{sizes[encoding]:>12,}' for encoding in ENCODINGS))
+    return '\n'.join(lines)
+
+
+def bench_main(args) -> int:
+    """Run ``bass-senpai bench``."""
+    unknown = set(args.names or ()) - set(BENCHMARKS)
+    if unknown:
+        print(f"Unknown benchmark(s): {', '.join(sorted(unknown))}; choose from {', '.join(BENCHMARKS)}")
+        return 2
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    
+    report = run_benchmarks(args.iterations, args.names,
+                            progress=lambda name: print(f"running {name}...", file=sys.stderr))
+    
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_report(report, baseline))
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+    
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        for name, change in regressions:
+            print(f"Regression: {name} is {change:.1f}% slower than the baseline", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
@@ -0,0 +1,275 @@
+"""Size-bounded on-disk artwork cache bookkeeping."""
+import fcntl
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Set, Tuple
+
+# Default limits for the artwork cache directory
+DISK_CACHE_BYTES = 200 * 1024 * 1024
+DISK_CACHE_FILES = 4000
+
+# Seconds between index writes caused only by access-time updates
+INDEX_FLUSH_INTERVAL = 60.0
+
+# Files added between index writes; flush() (on close) writes the rest
+INDEX_FLUSH_ADDS = 32
+
+INDEX_NAME = 'index'
+INDEX_HEADER = 'bass-senpai-cache 1'
+LOCK_NAME = 'index.lock'
+
+
+def default_cache_dir() -> Path:
+    """Where artwork is cached unless another directory is given."""
+    return Path.home() / ".cache" / "bass-senpai" / "artwork"
+
+
+class DiskCache:
+    """LRU bookkeeping for the files in the artwork cache directory.
+    
+    Files are grouped into entries by the part of their name before the
+    first dot, so a cached JPEG and everything derived from it (raw RGB
+    for Kitty, pre-scaled sizes) are evicted together. Sizes, access times
+    and file names live in a small text index, one ``stem bytes atime
+    suffixes`` line per entry, so eviction never needs a directory scan.
+    The index is rebuilt from a scan only when it is missing or unreadable.
+    Several processes may share a directory: flush() merges the index on
+    disk with the entries this process added, touched or evicted, under an
+    flock, so neither side's changes are lost. Adds and touches are only
+    written every INDEX_FLUSH_ADDS files or INDEX_FLUSH_INTERVAL seconds;
+    owners call flush() when they are done.
+    A ``read_only`` cache only reads the index and never changes the
+    directory, for processes that share one another process maintains.
+    """
+    
+    def __init__(self, directory: Path, max_bytes: int = DISK_CACHE_BYTES, max_files: int = DISK_CACHE_FILES,
+                 read_only: bool = False):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.read_only = read_only
+        self.index_path = self.directory / INDEX_NAME
+        # stem -> [bytes, atime, [file name suffixes]]
+        self._entries: Dict[str, list] = {}
+        # Stems added or touched, and stems evicted, since the last flush
+        self._changed: Set[str] = set()
+        self._removed: Set[str] = set()
+        self._dirty = False
+        self._adds = 0
+        self._flushed = time.monotonic()
+        self._lock = threading.Lock()
+        if not self._load() and not read_only:
+            self._scan()
+            self.flush()
+    
+    @staticmethod
+    def _split(path: Path) -> Tuple[str, str]:
+        """(stem, suffix) of a cache file name, split at the first dot."""
+        stem, dot, suffix = Path(path).name.partition('.')
+        return stem, dot + suffix
+    
+    def _read_index(self) -> Optional[Dict[str, list]]:
+        """Entries in the index file; None if it is missing or unreadable."""
+        entries: Dict[str, list] = {}
+        try:
+            with open(self.index_path) as f:
+                if f.readline().rstrip('\n') != INDEX_HEADER:
+                    return None
+                for line in f:
+                    stem, size, atime, suffixes = line.split()
+                    entries[stem] = [int(size), int(atime), suffixes.split(',')]
+        except (OSError, ValueError):
+            return None
+        return entries
+    
+    def _load(self) -> bool:
+        """Read the index; False if it is missing or unreadable."""
+        entries = self._read_index()
+        if entries is None:
+            return False
+        self._entries = entries
+        return True
+    
+    def _scan(self):
+        """Rebuild the entries from the directory contents."""
+        entries: Dict[str, list] = {}
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name in (INDEX_NAME, LOCK_NAME) or item.name.endswith('.tmp') or not item.is_file():
+                    continue
+                stat = item.stat()
+                stem, suffix = self._split(item.name)
+                entry = entries.setdefault(stem, [0, 0, []])
+                entry[0] += stat.st_size
+                entry[1] = max(entry[1], int(stat.st_atime), int(stat.st_mtime))
+                entry[2].append(suffix)
+        self._removed.update(set(self._entries) - set(entries))
+        self._changed.update(entries)
+        self._entries = entries
+        self._dirty = True
+    
+    def _merge(self, on_disk: Dict[str, list]) -> Dict[str, list]:
+        """The index on disk with this process's changes applied.
+        
+        Entries this process neither changed nor evicted are taken from
+        disk, so ones another process evicted are dropped here too.
+        """
+        merged = {stem: entry for stem, entry in on_disk.items() if stem not in self._removed}
+        for stem in self._changed:
+            ours = self._entries.get(stem)
+            if ours is None:
+                continue
+            theirs = merged.get(stem)
+            if theirs is not None and set(theirs[2]) != set(ours[2]):
+                # Both processes derived files from it; recount what exists
+                suffixes = [suffix for suffix in dict.fromkeys(ours[2] + theirs[2])
+                            if (self.directory / (stem + suffix)).exists()]
+                size = sum((self.directory / (stem + suffix)).stat().st_size for suffix in suffixes)
+                ours = [size, ours[1], suffixes]
+            if theirs is not None:
+                ours[1] = max(ours[1], theirs[1])
+            merged[stem] = ours
+        return merged
+    
+    def flush(self):
+        """Write the index if anything changed since the last write."""
+        with self._lock:
+            if not self._dirty or self.read_only:
+                return
+        tmp_path = self.index_path.with_name(f'{INDEX_NAME}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            with open(self.directory / LOCK_NAME, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                with self._lock:
+                    on_disk = self._read_index()
+                    if on_disk is not None:
+                        self._entries = self._merge(on_disk)
+                    lines = [INDEX_HEADER]
+                    lines.extend(f'{stem} {size} {atime} {",".join(suffixes)}'
+                                 for stem, (size, atime, suffixes) in self._entries.items())
+                    self._changed.clear()
+                    self._removed.clear()
+                    self._dirty = False
+                    self._adds = 0
+                    self._flushed = time.monotonic()
+                tmp_path.write_text('\n'.join(lines) + '\n')
+                os.replace(tmp_path, self.index_path)
+        except OSError:
+            pass
+    
+    def touch(self, path: Path):
+        """Record an access to the entry holding path."""
+        if self.read_only:
+            return
+        with self._lock:
+            entry = self._entries.get(self._split(path)[0])
+            if entry is None:
+                return
+            entry[1] = int(time.time())
+            self._changed.add(self._split(path)[0])
+            self._dirty = True
+            due = time.monotonic() - self._flushed >= INDEX_FLUSH_INTERVAL
+        if due:
+            self.flush()
+    
+    def add(self, path: Path):
+        """Account a file just written into the cache, evicting old entries if over the limits."""
+        if self.read_only:
+            return
+        try:
+            size = Path(path).stat().st_size
+        except OSError:
+            return
+        stem, suffix = self._split(path)
+        with self._lock:
+            entry = self._entries.setdefault(stem, [0, 0, []])
+            if suffix not in entry[2]:
+                entry[0] += size
+                entry[2].append(suffix)
+            entry[1] = int(time.time())
+            self._changed.add(stem)
+            self._removed.discard(stem)
+            self._dirty = True
+            self._adds += 1
+            due = self._adds >= INDEX_FLUSH_ADDS or time.monotonic() - self._flushed >= INDEX_FLUSH_INTERVAL
+        if due:
+            # Merge first so the limits count what other processes added
+            self.flush()
+        self._evict(self.max_bytes, self.max_files, keep=stem)
+    
+    def prune(self, max_bytes: Optional[int] = None, max_files: Optional[int] = None,
+              keep: Optional[str] = None) -> Tuple[int, int]:
+        """Evict least recently used entries until within the limits.
+        
+        Args:
+            max_bytes: Size limit, defaults to the configured one
+            max_files: File count limit, defaults to the configured one
+            keep: Stem of an entry that must not be evicted (the one in use)
+        
+        Returns:
+            (entries removed, bytes freed)
+        """
+        if self.read_only:
+            return 0, 0
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_files = self.max_files if max_files is None else max_files
+        removed = self._evict(max_bytes, max_files, keep)
+        if removed[0]:
+            self.flush()
+        return removed
+    
+    def _evict(self, max_bytes: int, max_files: int, keep: Optional[str]) -> Tuple[int, int]:
+        """Delete least recently used entries over the limits, leaving the index write to the caller."""
+        victims = []
+        freed = 0
+        with self._lock:
+            total_bytes = sum(entry[0] for entry in self._entries.values())
+            total_files = sum(len(entry[2]) for entry in self._entries.values())
+            if total_bytes > max_bytes or total_files > max_files:
+                for stem, entry in sorted(self._entries.items(), key=lambda item: item[1][1]):
+                    if total_bytes <= max_bytes and total_files <= max_files:
+                        break
+                    if stem == keep:
+                        continue
+                    victims.append((stem, entry[2]))
+                    total_bytes -= entry[0]
+                    total_files -= len(entry[2])
+                    freed += entry[0]
+                for stem, _ in victims:
+                    del self._entries[stem]
+                    self._changed.discard(stem)
+                    self._removed.add(stem)
+                self._dirty = self._dirty or bool(victims)
+        
+        for stem, suffixes in victims:
+            for suffix in suffixes:
+                try:
+                    (self.directory / (stem + suffix)).unlink()
+                except OSError:
+                    pass
+        return len(victims), freed
+    
+    def rescan(self):
+        """Re-read the directory, keeping the recorded access times."""
+        with self._lock:
+            known = {stem: entry[1] for stem, entry in self._entries.items()}
+            self._scan()
+            for stem, entry in self._entries.items():
+                entry[1] = max(entry[1], known.get(stem, 0))
+        self.flush()
+    
+    def stats(self) -> Dict[str, int]:
+        """Entry, file and byte counts plus the configured limits."""
+        with self._lock:
+            atimes = [entry[1] for entry in self._entries.values()]
+            return {
+                'entries': len(self._entries),
+                'files': sum(len(entry[2]) for entry in self._entries.values()),
+                'bytes': sum(entry[0] for entry in self._entries.values()),
+                'max_files': self.max_files,
+                'max_bytes': self.max_bytes,
+                'oldest_access': min(atimes) if atimes else 0,
+                'newest_access': max(atimes) if atimes else 0,
+            }
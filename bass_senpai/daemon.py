@@ -0,0 +1,491 @@
+"""Shared backend daemon and lightweight attached viewers for bass-senpai."""
+import json
+import os
+import queue
+import selectors
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, List, Set, Tuple
+from .mpris import PlaybackClock, create_client, FOLLOW_RESTART_DELAY, FOLLOW_RESTART_MAX_DELAY
+from .scheduler import UpdateScheduler, PLAYING_POLL_INTERVAL
+from .artwork import ArtworkHandler
+from .cache import DISK_CACHE_BYTES, DISK_CACHE_FILES
+from .main import BassSenpai
+
+# A position further than this from the extrapolated one counts as a seek
+SEEK_TOLERANCE = 2.0
+
+# Longest message line accepted from a viewer
+MAX_MESSAGE_BYTES = 4096
+
+
+def default_socket_path() -> Path:
+    """Per-user socket the daemon listens on unless another path is given."""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return Path(runtime_dir) / 'bass-senpai.sock'
+    return Path(f'/tmp/bass-senpai-{os.getuid()}.sock')
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    """One newline-terminated JSON message."""
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+class Viewer:
+    """One attached viewer connection, as seen by the daemon."""
+    
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.buffer = b''
+        self.tier: Optional[Tuple[int, int, str]] = None  # (width, height, mode) it renders
+
+
+class Daemon:
+    """Collects metadata and prepares artwork once for any number of viewers.
+    
+    Viewers connect to a Unix socket and receive newline-delimited JSON
+    ``state`` messages whenever the track, status or player changes or the
+    position jumps; they extrapolate the position themselves in between.
+    Each viewer reports the artwork tier (cells and render mode) it draws,
+    and the daemon fetches every new cover and pre-scales it for all
+    reported tiers. A viewer only gets the art URL once its own tier is
+    in the cache (and loses it again while a new size is prepared), so
+    viewers only memory-map pixels and never download or decode.
+    """
+    
+    def __init__(self, socket_path: Optional[Path] = None, backend: str = 'auto', follow: bool = False,
+                 poll_interval: float = PLAYING_POLL_INTERVAL, all_players: bool = False,
+                 player: Optional[List[str]] = None, cache_max_bytes: int = DISK_CACHE_BYTES,
+                 cache_max_files: int = DISK_CACHE_FILES, cache_dir: Optional[Path] = None):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.mpris = create_client(backend, follow=follow, all_players=all_players, pinned=player)
+        self.artwork = ArtworkHandler(cache_dir, cache_max_bytes=cache_max_bytes, cache_max_files=cache_max_files)
+        self.scheduler = UpdateScheduler(poll_interval, poll_interval)
+        self.running = False
+        self.polls = 0
+        self.viewers: Dict[int, Viewer] = {}
+        self.metadata: Optional[Dict[str, Any]] = None
+        self._clock = PlaybackClock()
+        self._art_url: Optional[str] = None  # Cover of the current track
+        self._prepared: Set[Tuple[int, int, str]] = set()  # Tiers of the cover queued or done
+        self._art_tiers: Set[Tuple[int, int, str]] = set()  # Tiers of the cover in the cache
+        self._finished: queue.Queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bass-senpai-daemon-art')
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_w.setblocking(False)
+        self._poll_requested = False
+        self._listener: Optional[socket.socket] = None
+    
+    def wake(self):
+        """Poll the backend soon; safe from threads and signal handlers."""
+        self._poll_requested = True
+        self._interrupt()
+    
+    def _interrupt(self):
+        """Make the select loop return."""
+        try:
+            self._wake_w.send(b'.')
+        except (BlockingIOError, OSError):
+            pass
+    
+    def _bind(self) -> bool:
+        """Listen on the socket path, replacing a stale socket file."""
+        if self.socket_path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.socket_path))
+            except OSError:
+                self.socket_path.unlink()
+            else:
+                print(f"Error: a bass-senpai daemon is already listening on {self.socket_path}")
+                return False
+            finally:
+                probe.close()
+        
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)  # Only this user may attach
+        try:
+            listener.bind(str(self.socket_path))
+        finally:
+            os.umask(old_umask)
+        listener.listen()
+        listener.setblocking(False)
+        self._listener = listener
+        return True
+    
+    def serve(self) -> int:
+        """Run until SIGINT/SIGTERM or stop()."""
+        if not self.mpris.available:
+            print("Error: no MPRIS backend available (install playerctl or jeepney).")
+            return 1
+        if not self._bind():
+            return 1
+        
+        self._selector.register(self._listener, selectors.EVENT_READ, 'accept')
+        self._selector.register(self._wake_r, selectors.EVENT_READ, 'wake')
+        self.mpris.on_change = self.wake
+        handle_signals = threading.current_thread() is threading.main_thread()
+        if handle_signals:
+            previous = {signum: signal.signal(signum, lambda *_: self.stop())
+                        for signum in (signal.SIGINT, signal.SIGTERM)}
+        print(f"bass-senpai daemon listening on {self.socket_path}", flush=True)
+        
+        self.running = True
+        try:
+            self._poll()
+            while self.running:
+                self._step(self.scheduler.seconds_until_poll())
+        finally:
+            if handle_signals:
+                for signum, handler in previous.items():
+                    signal.signal(signum, handler)
+            self._shutdown()
+        return 0
+    
+    def stop(self):
+        """Ask serve() to return."""
+        self.running = False
+        self._interrupt()
+    
+    def _step(self, timeout: Optional[float]):
+        """Handle socket activity for up to timeout seconds, then poll if due."""
+        for key, _ in self._selector.select(timeout):
+            if key.data == 'accept':
+                self._accept()
+            elif key.data == 'wake':
+                try:
+                    self._wake_r.recv(4096)
+                except BlockingIOError:
+                    pass
+            else:
+                self._read(key.data)
+        
+        while not self._finished.empty():
+            self._artwork_finished(*self._finished.get())
+        
+        if self._poll_requested or self.scheduler.seconds_until_poll() <= 0:
+            self._poll()
+    
+    def _poll(self):
+        """Read metadata and tell the viewers if anything they can't predict changed."""
+        self._poll_requested = False
+        self.polls += 1
+        metadata = self.mpris.get_metadata()
+        self.scheduler.observe(metadata)
+        if not self._changed(metadata):
+            return
+        
+        self.metadata = metadata
+        if metadata:
+            self._clock.sync(metadata['position'], metadata['status'])
+        art_url = metadata.get('art_url') if metadata else None
+        if art_url != self._art_url:
+            self._art_url = art_url
+            self._prepared = set()
+            self._art_tiers = set()
+            if art_url:
+                self._prepare(art_url, self._tiers())
+        self._broadcast()
+    
+    def _changed(self, metadata: Optional[Dict[str, Any]]) -> bool:
+        """Whether metadata differs from the last broadcast beyond clock drift."""
+        if (metadata is None) != (self.metadata is None):
+            return True
+        if metadata is None:
+            return False
+        if {k: v for k, v in metadata.items() if k != 'position'} != \
+                {k: v for k, v in self.metadata.items() if k != 'position'}:
+            return True
+        return abs(metadata['position'] - self._clock.current(metadata['length'])) > SEEK_TOLERANCE
+    
+    def _tiers(self) -> List[Tuple[int, int, str]]:
+        """Distinct artwork tiers the connected viewers render."""
+        return sorted({viewer.tier for viewer in self.viewers.values() if viewer.tier})
+    
+    def _prepare(self, art_url: str, tiers: List[Tuple[int, int, str]]):
+        """Fetch and pre-scale a cover on the worker thread."""
+        def job():
+            path = self.artwork.prepare(art_url, tiers)
+            self._finished.put((art_url, tiers, path is not None))
+            self._interrupt()
+        self._prepared.update(tiers)
+        self._executor.submit(job)
+    
+    def _artwork_finished(self, art_url: str, tiers: List[Tuple[int, int, str]], ok: bool):
+        """A prepare job is done: announce the cover to the viewers of its tiers."""
+        if art_url != self._art_url:
+            return
+        if not ok:
+            # Let the next view report retry
+            self._prepared.difference_update(tiers)
+            return
+        self._art_tiers.update(tiers)
+        for viewer in list(self.viewers.values()):
+            if viewer.tier in tiers:
+                self._send_state(viewer)
+    
+    def _state_message(self, viewer: Viewer) -> Dict[str, Any]:
+        """Current state for a viewer; the cover is withheld until its tier is prepared."""
+        metadata = None
+        if self.metadata:
+            metadata = dict(self.metadata)
+            metadata['position'] = self._clock.current(metadata['length'])
+            if viewer.tier not in self._art_tiers:
+                metadata['art_url'] = None
+        return {'type': 'state', 'metadata': metadata, 'time': time.time()}
+    
+    def _send_state(self, viewer: Viewer):
+        """Send the current state to one viewer."""
+        self._send(viewer, _encode(self._state_message(viewer)))
+    
+    def _broadcast(self):
+        """Send the current state to every viewer."""
+        for viewer in list(self.viewers.values()):
+            self._send_state(viewer)
+    
+    def _send(self, viewer: Viewer, data: bytes):
+        """Send to one viewer, dropping it if it went away or stopped reading."""
+        try:
+            viewer.sock.sendall(data)
+        except OSError:
+            self._drop(viewer)
+    
+    def _accept(self):
+        """Register a new viewer and send it the current state."""
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        viewer = Viewer(sock)
+        self.viewers[sock.fileno()] = viewer
+        self._selector.register(sock, selectors.EVENT_READ, viewer)
+        # Sends block briefly rather than buffering unboundedly for slow viewers
+        sock.settimeout(1.0)
+        self._send_state(viewer)
+    
+    def _read(self, viewer: Viewer):
+        """Read messages from a viewer."""
+        try:
+            data = viewer.sock.recv(4096)
+        except (BlockingIOError, socket.timeout):
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._drop(viewer)
+            return
+        
+        viewer.buffer += data
+        if len(viewer.buffer) > MAX_MESSAGE_BYTES and b'\n' not in viewer.buffer:
+            self._drop(viewer)
+            return
+        *lines, viewer.buffer = viewer.buffer.split(b'\n')
+        for line in lines:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(message, dict) and message.get('type') == 'view':
+                self._set_view(viewer, message)
+    
+    def _set_view(self, viewer: Viewer, message: Dict[str, Any]):
+        """Record the tier a viewer renders and pre-scale the current cover for it."""
+        try:
+            tier = (int(message['width']), int(message['height']), str(message['mode']))
+        except (KeyError, TypeError, ValueError):
+            return
+        if tier[2] not in ('h', 'k'):
+            return
+        if tier == viewer.tier:
+            return
+        viewer.tier = tier
+        if self._art_url and tier not in self._prepared:
+            self._prepare(self._art_url, [tier])
+        if self._art_url:
+            # Withdraw the cover until this tier is ready, so the viewer never decodes it
+            self._send_state(viewer)
+    
+    def _drop(self, viewer: Viewer):
+        """Forget a viewer and close its socket."""
+        if self.viewers.pop(viewer.sock.fileno(), None) is None:
+            return
+        try:
+            self._selector.unregister(viewer.sock)
+        except (KeyError, ValueError):
+            pass
+        viewer.sock.close()
+    
+    def _shutdown(self):
+        """Close every connection and remove the socket file."""
+        for viewer in list(self.viewers.values()):
+            self._drop(viewer)
+        if self._listener is not None:
+            self._selector.unregister(self._listener)
+            self._listener.close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+        self._selector.close()
+        self._executor.shutdown(wait=False)
+        self.mpris.close()
+        self.artwork.close()
+
+
+class SocketMPRISClient:
+    """MPRIS client interface backed by a bass-senpai daemon.
+    
+    A reader thread keeps the last ``state`` message and extrapolates the
+    position locally, so get_metadata() is an in-memory read. If the
+    daemon goes away the client keeps reconnecting with a backoff.
+    """
+    
+    event_driven = True
+    
+    def __init__(self, socket_path: Optional[Path] = None):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.on_change: Optional[Callable[[], None]] = None
+        self.messages = 0
+        self._latest: Optional[Dict[str, Any]] = None
+        self._clock = PlaybackClock()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._view: Optional[Tuple[int, int, str]] = None
+        self._reader: Optional[threading.Thread] = None
+        self._sock = self._connect()
+        self.available = self._sock is not None
+    
+    def _connect(self) -> Optional[socket.socket]:
+        """Open a connection to the daemon, or None if none is listening."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(self.socket_path))
+        except OSError:
+            sock.close()
+            return None
+        return sock
+    
+    def get_metadata(self) -> Optional[Dict[str, Any]]:
+        """Last state from the daemon with the position extrapolated to now."""
+        self._ensure_reader()
+        with self._lock:
+            if not self._latest:
+                return None
+            metadata = dict(self._latest)
+            metadata['position'] = self._clock.current(metadata['length'])
+        return metadata
+    
+    def get_playback_status(self) -> str:
+        """Get current playback status."""
+        metadata = self.get_metadata()
+        return metadata['status'] if metadata else "Stopped"
+    
+    def send_view(self, width: int, height: int, mode: str):
+        """Tell the daemon which artwork tier this viewer renders."""
+        self._view = (width, height, mode)
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.sendall(_encode({'type': 'view', 'width': width, 'height': height, 'mode': mode}))
+            except OSError:
+                pass
+    
+    def _ensure_reader(self):
+        """Start the reader thread on first use."""
+        if self._reader is not None or self._closed.is_set():
+            return
+        self._reader = threading.Thread(target=self._read_loop, name='bass-senpai-attach', daemon=True)
+        self._reader.start()
+    
+    def _apply(self, message: Dict[str, Any]):
+        """Take over one state message."""
+        metadata = message.get('metadata')
+        with self._lock:
+            self._latest = metadata
+            if metadata:
+                position = metadata['position']
+                if metadata['status'] == 'Playing':
+                    # Time spent in transit, measured on the shared wall clock
+                    position += max(0.0, time.time() - message.get('time', time.time()))
+                self._clock.sync(position, metadata['status'])
+    
+    def _read_loop(self):
+        """Apply state messages, reconnecting whenever the daemon goes away."""
+        delay = FOLLOW_RESTART_DELAY
+        while not self._closed.is_set():
+            sock = self._sock
+            if sock is not None:
+                if self._view is not None:
+                    self.send_view(*self._view)
+                for line in sock.makefile('rb'):
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        continue
+                    if message.get('type') == 'state':
+                        self.messages += 1
+                        self._apply(message)
+                        delay = FOLLOW_RESTART_DELAY
+                        if self.on_change is not None:
+                            self.on_change()
+                sock.close()
+                self._sock = None
+                with self._lock:
+                    self._latest = None
+                if self.on_change is not None:
+                    self.on_change()
+            
+            if self._closed.wait(delay):
+                break
+            delay = min(delay * 2, FOLLOW_RESTART_MAX_DELAY)
+            self._sock = self._connect()
+    
+    def close(self):
+        """Disconnect and stop the reader thread."""
+        self._closed.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._reader is not None:
+            self._reader.join(timeout=2)
+
+
+class AttachedBassSenpai(BassSenpai):
+    """Viewer that draws state from a daemon instead of querying players itself.
+    
+    Metadata comes from SocketMPRISClient and artwork only from the shared
+    cache the daemon fills, so a pane costs no player queries, downloads or
+    (for tiers the daemon has prepared) decodes. The cache is opened
+    read-only: only the daemon writes files and maintains the index.
+    """
+    
+    read_only_cache = True
+    
+    def __init__(self, socket_path: Optional[Path] = None, *args, **kwargs):
+        super().__init__(*args, client=SocketMPRISClient(socket_path), **kwargs)
+        self._view: Optional[Tuple[int, int, str]] = None
+    
+    def _check_backend(self) -> bool:
+        """Report a missing daemon; returns False if we cannot run."""
+        if not self.mpris.available:
+            print(f"Error: no bass-senpai daemon is listening on {self.mpris.socket_path}.")
+            print("Start one with: bass-senpai --daemon")
+            return False
+        return True
+    
+    def _draw(self, state, right_panel: str):
+        """Report the artwork tier to the daemon when it changes, then draw."""
+        view = (self.ui.artwork_width, self.ui.artwork_height, 'k' if self.artwork.is_kitty else 'h')
+        if view != self._view:
+            self._view = view
+            self.mpris.send_view(*view)
+        super()._draw(state, right_panel)
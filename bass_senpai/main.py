@@ -2,27 +2,96 @@
 import sys
 import time
 import signal
-from typing import Optional
-from .mpris import MPRISClient
-from .artwork import ArtworkHandler
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Iterable, TYPE_CHECKING
+from .mpris import DBusMPRISClient, PlaybackClock, create_client
+from .scheduler import UpdateScheduler, PLAYING_POLL_INTERVAL
+from .state import TrackState, PANELS
+from .cache import DiskCache, DISK_CACHE_BYTES, DISK_CACHE_FILES, default_cache_dir
+from .stats import FrameStats, STATS_DUMP_INTERVAL
 from .ui import TerminalUI
+from .status import StatusLine, DEFAULT_FORMAT, FIELDS
+
+if TYPE_CHECKING:
+    from .artwork import ArtworkHandler
+
+# Panels that can be redrawn by patching rows of the previous frame
+FAST_PANELS = frozenset(('progress', 'time'))
 
 
 class BassSenpai:
     """Main application class for bass-senpai."""
     
-    def __init__(self, update_interval: float = 1.0):
+    # Use the artwork cache without downloading into or maintaining it
+    read_only_cache = False
+    
+    def __init__(self, update_interval: float = 1.0, follow: bool = False, backend: str = 'auto',
+                 poll_interval: float = PLAYING_POLL_INTERVAL, kitty_transfer: str = 'auto',
+                 cache_max_bytes: int = DISK_CACHE_BYTES, cache_max_files: int = DISK_CACHE_FILES,
+                 cache_dir: Optional[Path] = None, stats_overlay: bool = False,
+                 stats_file: Optional[Path] = None, trace_file: Optional[Path] = None,
+                 stats_interval: float = STATS_DUMP_INTERVAL, all_players: bool = False,
+                 player: Optional[List[str]] = None, encoding: str = 'auto',
+                 frame_bytes: Optional[int] = None, client=None):
         """Initialize bass-senpai.
         
         Args:
-            update_interval: Time in seconds between updates
+            update_interval: Time in seconds between redraws while playing
+            follow: Stream metadata from one long-lived playerctl process
+            backend: MPRIS backend, 'auto', 'dbus' or 'playerctl'
+            poll_interval: Time in seconds between metadata polls while
+                playing (event-driven backends are read on every redraw)
+            kitty_transfer: Kitty transmission medium ('auto', 'direct',
+                'file', 'temp' or 'shm')
+            cache_max_bytes: Size limit of the on-disk artwork cache
+            cache_max_files: File count limit of the on-disk artwork cache
+            cache_dir: Artwork cache directory (default: ~/.cache/bass-senpai/artwork)
+            stats_overlay: Draw frame timing percentiles at the bottom of the screen
+            stats_file: Write the timing summary as JSON here every stats_interval
+            trace_file: Write Chrome trace events here every stats_interval
+            all_players: Track every MPRIS player and list the inactive ones
+            player: Player names to show, in order of preference
+            encoding: Text-art colour encoding ('auto', 'truecolor', '256' or '16')
+            frame_bytes: Byte budget for a text-art frame; 'auto' picks the
+                richest encoding that fits
+            client: MPRIS client to use instead of creating one for backend
         """
+        from .artwork import ArtworkHandler  # PIL and requests; not needed by the status line
+        
         self.update_interval = update_interval
-        self.mpris = MPRISClient()
-        self.artwork = ArtworkHandler()
+        if client is None:
+            client = create_client(backend, follow=follow, all_players=all_players, pinned=player)
+        self.mpris = client
+        self.artwork = ArtworkHandler(cache_dir, background=True, kitty_transfer=kitty_transfer,
+                                      cache_max_bytes=cache_max_bytes, cache_max_files=cache_max_files,
+                                      encoding=encoding, frame_bytes=frame_bytes,
+                                      read_only=self.read_only_cache)
         self.ui = TerminalUI()
         self.running = False
-        self.last_track_id = None
+        self.metadata = None
+        self.clock = PlaybackClock()
+        
+        # Frame timing instrumentation
+        self.stats = FrameStats(trace=trace_file is not None)
+        self.stats_overlay = stats_overlay
+        self.stats_file = stats_file
+        self.trace_file = trace_file
+        self.stats_interval = stats_interval
+        self._stats_dumped = time.monotonic()
+        
+        # What the last frame was drawn from, for per-panel redraws
+        self._drawn_state: Optional[TrackState] = None
+        self._drawn_layout = None
+        self._right_panel = None
+        self._right_lines: List[str] = []
+        self._frame_lines: List[str] = []
+        
+        if self.mpris.event_driven:
+            poll_interval = update_interval
+        self.scheduler = UpdateScheduler(update_interval, poll_interval)
+        self.mpris.on_change = self.scheduler.wake
+        self.artwork.on_ready = lambda: self.scheduler.wake(poll=False)
         
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -31,26 +100,32 @@ class BassSenpai:
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals."""
         self.running = False
+        self.scheduler.wake(poll=False)
     
-    def _get_track_id(self, metadata: Optional[dict]) -> Optional[str]:
-        """Generate unique ID for current track."""
-        if not metadata:
-            return None
-        
-        artist = metadata.get('artist', '')
-        title = metadata.get('title', '')
-        album = metadata.get('album', '')
-        
-        return f"{artist}|{title}|{album}"
+    def _resize_handler(self, signum, frame):
+        """Handle terminal resize by redrawing immediately."""
+        self.scheduler.wake(poll=False, resize=True)
     
-    def run(self):
-        """Run the main application loop."""
-        if not self.mpris.playerctl_available:
+    def _check_backend(self) -> bool:
+        """Report a missing MPRIS backend; returns False if we cannot run."""
+        if isinstance(self.mpris, DBusMPRISClient) and not self.mpris.available:
+            print("Error: could not connect to the D-Bus session bus.")
+            print("The dbus backend needs the 'jeepney' package: pip install jeepney")
+            return False
+        
+        if not self.mpris.available:
             print("Error: playerctl is not available.")
             print("Please install playerctl to use bass-senpai.")
             print("\nOn Ubuntu/Debian: sudo apt install playerctl")
             print("On Arch Linux: sudo pacman -S playerctl")
             print("On macOS: brew install playerctl")
+            return False
+        
+        return True
+    
+    def run(self):
+        """Run the main application loop."""
+        if not self._check_backend():
             return 1
         
         # Initialize terminal
@@ -60,53 +135,250 @@ class BassSenpai:
         self.running = True
         
         try:
-            while self.running:
-                self._update()
-                time.sleep(self.update_interval)
+            self._loop()
         
         except KeyboardInterrupt:
             pass
         
         finally:
             # Cleanup
+            self.mpris.close()
+            self.artwork.close()
+            self.scheduler.close()
+            self._dump_stats()
+            sys.stdout.write(self.artwork.release_kitty())
             self.ui.show_cursor()
             self.ui.clear_screen()
             print("\nBass-senpai stopped.")
         
         return 0
     
-    def _update(self):
-        """Update display with current track information."""
-        # Update dimensions dynamically
-        self.ui._update_dimensions()
-        
-        # Get current metadata
-        metadata = self.mpris.get_metadata()
-        
-        # Determine if track changed
-        track_id = self._get_track_id(metadata)
-        track_changed = track_id != self.last_track_id
+    def _loop(self):
+        """Blocking update loop driven by the scheduler."""
+        signal.signal(signal.SIGWINCH, self._resize_handler)
         
-        if track_changed:
-            self.last_track_id = track_id
+        self._update()
+        while self.running:
+            tick = self.scheduler.wait()
+            if self.running:
+                self._update(poll=tick.poll)
+    
+    def _poll_metadata(self):
+        """Fetch fresh metadata and feed the playback clock and scheduler."""
+        with self.stats.phase('metadata'):
+            self.metadata = self.mpris.get_metadata()
+        if self.metadata:
+            self.clock.sync(self.metadata['position'], self.metadata['status'])
+        self.scheduler.observe(self.metadata)
+    
+    def _current_state(self) -> Optional[TrackState]:
+        """Last polled metadata with the position extrapolated to now."""
+        state = TrackState.from_metadata(self.metadata)
+        if state:
+            state.position = self.clock.current(state.length)
+        return state
+    
+    def _draw(self, state: Optional[TrackState], right_panel: str):
+        """Redraw the panels that changed since the last frame and display it.
         
-        # Get dynamic artwork dimensions
-        artwork_height = self.ui.artwork_height
-        artwork_width = self.ui.artwork_width
+        When only the position moved and the layout and artwork are the
+        same, just the progress and time rows of the last frame are rebuilt.
+        """
+        layout = (self.ui.term_width, self.ui.term_height, self.ui.artwork_width, self.ui.artwork_height)
+        if layout != self._drawn_layout or right_panel != self._right_panel:
+            dirty = PANELS
+        elif state is None or self._drawn_state is None:
+            dirty = PANELS if state is not self._drawn_state else frozenset()
+        else:
+            dirty = state.dirty_panels(self._drawn_state)
         
-        # Render left panel (track info)
-        left_panel = self.ui.render_track_info(metadata, artwork_width + 2)
+        if not dirty and not self.stats_overlay:
+            return
         
-        # Render right panel (artwork)
-        art_url = metadata.get('art_url') if metadata else None
-        right_panel = self.artwork.render(art_url, artwork_width, artwork_height)
+        if dirty and dirty <= FAST_PANELS:
+            with self.stats.phase('track_info'):
+                rows = self.ui.render_panel_lines(state, dirty, self.ui.artwork_width + 2)
+            with self.stats.phase('layout'):
+                for row, left in rows.items():
+                    right = self._right_lines[row] if row < len(self._right_lines) else ''
+                    self._frame_lines[row] = self.ui.render_split_line(left, right)
+        elif dirty:
+            # Render left panel (track info) and combine it with the artwork
+            with self.stats.phase('track_info'):
+                left_panel = self.ui.render_track_info(state, self.ui.artwork_width + 2)
+            with self.stats.phase('layout'):
+                combined = self.ui.render_split_layout(left_panel, right_panel)
+                self._frame_lines = combined.split('\n')
+                self._right_lines = right_panel.split('\n')
         
-        # Combine panels
-        combined = self.ui.render_split_layout(left_panel, right_panel)
+        self._drawn_state = state
+        self._drawn_layout = layout
+        self._right_panel = right_panel
         
         # Display
-        self.ui.display(combined)
+        lines = self._with_overlay(self._frame_lines) if self.stats_overlay else self._frame_lines
+        with self.stats.phase('display'):
+            self.ui.display('\n'.join(lines))
+    
+    def _with_overlay(self, lines: List[str]) -> List[str]:
+        """Frame lines with the timing overlay on the bottom rows of the screen."""
+        overlay = self.stats.overlay_lines(self.ui.term_width)
+        height = max(self.ui.term_height - len(overlay), 0)
+        body = lines[:height] + [''] * (height - len(lines))
+        return body + overlay[:self.ui.term_height]
+    
+    def _collect_counters(self):
+        """Copy byte and cache counters from the UI and artwork handler into the stats."""
+        counters = self.stats.counters
+        counters['bytes_written'] = self.ui.bytes_written
+        counters['render_cache_hits'] = self.artwork.render_cache.hits
+        counters['render_cache_misses'] = self.artwork.render_cache.misses
+        counters['disk_cache_hits'] = self.artwork.disk_hits
+        counters['disk_cache_misses'] = self.artwork.disk_misses
+    
+    def _dump_stats(self):
+        """Write the stats and trace files, if configured."""
+        self._stats_dumped = time.monotonic()
+        if self.stats_file:
+            self._collect_counters()
+            self.stats.write_json(self.stats_file)
+        if self.trace_file:
+            self.stats.write_trace(self.trace_file)
     
+    def _frame_done(self):
+        """Bookkeeping after every update: counters and periodic dumps."""
+        self.stats.count('frames')
+        if self.stats_overlay:
+            self._collect_counters()
+        if (self.stats_file or self.trace_file) and time.monotonic() - self._stats_dumped >= self.stats_interval:
+            self._dump_stats()
+    
+    def _update(self, poll: bool = True):
+        """Update display with current track information.
+        
+        Args:
+            poll: Fetch fresh metadata; otherwise redraw the last metadata
+                with the position extrapolated by the playback clock
+        """
+        with self.stats.phase('frame'):
+            # Update dimensions dynamically
+            self.ui._update_dimensions()
+            
+            if poll:
+                self._poll_metadata()
+            
+            state = self._current_state()
+            
+            # Render right panel (artwork) at the dynamic artwork dimensions
+            art_url = state.art_url if state else None
+            with self.stats.phase('artwork'):
+                right_panel = self.artwork.render(art_url, self.ui.artwork_width, self.ui.artwork_height)
+            
+            self._draw(state, right_panel)
+        self._frame_done()
+
+
+def _format_size(size: int) -> str:
+    """Human readable byte count."""
+    return f"{size / (1024 * 1024):.1f} MiB"
+
+
+def read_art_urls(lines: Iterable[str]) -> List[str]:
+    """Artwork URLs from a list of URLs or a dump of playerctl metadata output.
+    
+    Understands one URL per line, METADATA_FORMAT lines (the URL is the
+    last ``|`` field) and the key/value table printed by ``playerctl
+    metadata`` (``mpris:artUrl`` rows). Duplicates are dropped.
+    """
+    urls = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if '|' in line:
+            url = line.rsplit('|', 1)[1].strip()
+        elif 'mpris:artUrl' in line.split():
+            url = line.split()[-1]
+        else:
+            url = line
+        if url.startswith(('http://', 'https://', 'file://')):
+            urls[url] = None
+    return list(urls)
+
+
+def warm_cache(artwork: 'ArtworkHandler', urls: List[str], jobs: int = 4) -> dict:
+    """Download and ingest every URL not in the cache yet, ``jobs`` at a time."""
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        received = list(pool.map(artwork.prefetch, urls))
+    artwork.disk_cache.flush()
+    elapsed = time.monotonic() - started
+    
+    fetched = [size for size in received if size]
+    return {
+        'total': len(urls),
+        'skipped': received.count(0),
+        'fetched': len(fetched),
+        'failed': [url for url, size in zip(urls, received) if size is None],
+        'bytes': sum(fetched),
+        'seconds': elapsed,
+    }
+
+
+def _cache_warm(args, directory: Path) -> int:
+    """``bass-senpai cache warm``: prefetch covers listed in files or on stdin."""
+    lines = []
+    for source in args.sources or ['-']:
+        if source == '-':
+            lines.extend(sys.stdin)
+        else:
+            with open(source) as f:
+                lines.extend(f)
+    urls = read_art_urls(lines)
+    
+    from .artwork import ArtworkHandler
+    artwork = ArtworkHandler(cache_dir=directory, workers=args.jobs,
+                             cache_max_bytes=args.cache_size * 1024 * 1024, cache_max_files=args.cache_files)
+    try:
+        result = warm_cache(artwork, urls, args.jobs)
+    finally:
+        artwork.close()
+    
+    seconds = max(result['seconds'], 1e-6)
+    print(f"Covers: {result['total']} listed, {result['skipped']} already cached, "
+          f"{result['fetched']} fetched, {len(result['failed'])} failed")
+    if result['fetched']:
+        print(f"Throughput: {result['fetched'] / seconds:.1f} covers/s, "
+              f"{_format_size(int(result['bytes'] / seconds))}/s over {result['seconds']:.1f}s")
+    for url in result['failed']:
+        print(f"Failed: {url}")
+    return 1 if result['failed'] else 0
+
+
+def cache_main(args) -> int:
+    """Run the ``bass-senpai cache`` subcommands."""
+    directory = args.cache_dir or default_cache_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    if args.cache_command == 'warm':
+        return _cache_warm(args, directory)
+    cache = DiskCache(directory, args.cache_size * 1024 * 1024, args.cache_files)
+    
+    if args.cache_command == 'prune':
+        # Pick up files the index doesn't know about before deciding what to drop
+        cache.rescan()
+        max_bytes = args.max_size * 1024 * 1024 if args.max_size is not None else None
+        removed, freed = cache.prune(max_bytes, args.max_files)
+        print(f"Removed {removed} entries, freed {_format_size(freed)}")
+    
+    stats = cache.stats()
+    print(f"Cache directory: {cache.directory}")
+    print(f"Entries: {stats['entries']} ({stats['files']} files, limit {stats['max_files']})")
+    print(f"Size: {_format_size(stats['bytes'])} (limit {_format_size(stats['max_bytes'])})")
+    if stats['entries']:
+        oldest = time.strftime('%Y-%m-%d %H:%M', time.localtime(stats['oldest_access']))
+        newest = time.strftime('%Y-%m-%d %H:%M', time.localtime(stats['newest_access']))
+        print(f"Accessed: {oldest} .. {newest}")
+    return 0
 
 
 def main():
@@ -120,9 +392,24 @@ def main():
 Examples:
   bass-senpai              Start with default 1 second update interval
   bass-senpai --interval 2  Update every 2 seconds
+  bass-senpai --follow      Stream metadata from a single playerctl process
+  bass-senpai --backend dbus  Read players straight from the session bus
+  bass-senpai --asyncio     Run fetching, artwork and drawing as asyncio tasks
+  bass-senpai --frame-bytes 8000  Fall back to 256/16 colours when text-art is too big
+  bass-senpai --all-players  Follow whichever player started playing last
+  bass-senpai --player spotify,firefox  Show Spotify, else Firefox
+  bass-senpai --daemon      Collect metadata and artwork once for many panes
+  bass-senpai --attach      Draw from a running daemon (one per pane)
+  bass-senpai --stats --trace-file trace.json  Show frame timings, save a Chrome trace
+  bass-senpai cache stats   Show artwork cache usage
+  bass-senpai cache prune   Evict least recently used artwork beyond the limits
+  bass-senpai cache warm urls.txt  Prefetch covers (URLs or playerctl metadata dumps)
+  bass-senpai bench --json base.json  Time the hot paths and save the results
+  bass-senpai status --format '{icon} {title} {percent}%'  One line per change, for tmux or polybar
+  bass-senpai status --json  Waybar custom module output
 
 Requirements:
-  - playerctl must be installed for MPRIS support
+  - playerctl (or the optional jeepney package) for MPRIS support
   - Kitty terminal recommended for pixel-perfect album artwork
   - Falls back to colored text-art in other terminals
         """
@@ -132,7 +419,140 @@ Requirements:
         '--interval',
         type=float,
         default=1.0,
-        help='Update interval in seconds (default: 1.0)'
+        help='Redraw interval in seconds while playing (default: 1.0)'
+    )
+    
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=PLAYING_POLL_INTERVAL,
+        help=f'Seconds between metadata polls while playing (default: {PLAYING_POLL_INTERVAL})'
+    )
+    
+    parser.add_argument(
+        '--follow',
+        action='store_true',
+        help='Keep one playerctl --follow process instead of polling each update'
+    )
+    
+    parser.add_argument(
+        '--backend',
+        choices=['auto', 'dbus', 'playerctl'],
+        default='auto',
+        help='MPRIS backend: native D-Bus (needs jeepney) or playerctl (default: auto)'
+    )
+    
+    parser.add_argument(
+        '--all-players',
+        action='store_true',
+        help='Track every player from one event stream, show the most recently playing one '
+             'and list the others'
+    )
+    
+    parser.add_argument(
+        '--player',
+        type=lambda value: [name for name in value.split(',') if name],
+        metavar='NAME[,NAME...]',
+        help='Only show these players, the first one running wins (like playerctl --player)'
+    )
+    
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Run the shared backend: poll players and prepare artwork for attached viewers'
+    )
+    
+    parser.add_argument(
+        '--attach',
+        action='store_true',
+        help='Draw state pushed by a running --daemon instead of querying players'
+    )
+    
+    parser.add_argument(
+        '--socket',
+        type=Path,
+        metavar='PATH',
+        help='Unix socket of the daemon (default: $XDG_RUNTIME_DIR/bass-senpai.sock)'
+    )
+    
+    parser.add_argument(
+        '--kitty-transfer',
+        choices=['auto', 'direct', 'file', 'temp', 'shm'],
+        default='auto',
+        help='How Kitty receives artwork: inline base64, or a local file/temp file/'
+             'shared memory the terminal reads itself (default: auto, direct over SSH)'
+    )
+    
+    parser.add_argument(
+        '--encoding',
+        choices=['auto', 'truecolor', '256', '16'],
+        default='auto',
+        help='Text-art colours: 24-bit, xterm 256-colour or 16-colour escapes '
+             '(default: auto, truecolor unless over --frame-bytes)'
+    )
+    
+    parser.add_argument(
+        '--frame-bytes',
+        type=int,
+        metavar='BYTES',
+        help='Byte budget for the text-art of a frame; with --encoding auto the richest '
+             'encoding that fits is used (e.g. 8000 over slow SSH)'
+    )
+    
+    parser.add_argument(
+        '--asyncio',
+        action='store_true',
+        help='Use the asyncio runtime (resize via SIGWINCH, non-blocking fetches)'
+    )
+    
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=DISK_CACHE_BYTES // (1024 * 1024),
+        metavar='MB',
+        help=f'Size limit of the artwork cache in MiB (default: {DISK_CACHE_BYTES // (1024 * 1024)})'
+    )
+    
+    parser.add_argument(
+        '--cache-files',
+        type=int,
+        default=DISK_CACHE_FILES,
+        metavar='N',
+        help=f'File count limit of the artwork cache (default: {DISK_CACHE_FILES})'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        help='Artwork cache directory (default: ~/.cache/bass-senpai/artwork)'
+    )
+    
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Show per-phase frame timing percentiles and counters at the bottom of the screen'
+    )
+    
+    parser.add_argument(
+        '--stats-file',
+        type=Path,
+        metavar='FILE',
+        help='Periodically write frame timing percentiles and counters to FILE as JSON'
+    )
+    
+    parser.add_argument(
+        '--trace-file',
+        type=Path,
+        metavar='FILE',
+        help='Periodically write recent frame phases to FILE as Chrome trace events'
+    )
+    
+    parser.add_argument(
+        '--stats-interval',
+        type=float,
+        default=STATS_DUMP_INTERVAL,
+        metavar='SECONDS',
+        help=f'Seconds between --stats-file/--trace-file writes (default: {STATS_DUMP_INTERVAL:g})'
     )
     
     parser.add_argument(
@@ -141,15 +561,109 @@ Requirements:
         version='bass-senpai 1.0.0'
     )
     
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    cache_parser = subparsers.add_parser('cache', help='Inspect or prune the artwork cache')
+    cache_commands = cache_parser.add_subparsers(dest='cache_command', metavar='action')
+    cache_commands.required = True
+    cache_commands.add_parser('stats', help='Show entries, files and size of the cache')
+    prune_parser = cache_commands.add_parser('prune', help='Evict least recently used artwork')
+    prune_parser.add_argument('--max-size', type=int, metavar='MB', help='Prune down to this size instead of --cache-size')
+    prune_parser.add_argument('--max-files', type=int, metavar='N', help='Prune down to this many files instead of --cache-files')
+    warm_parser = cache_commands.add_parser('warm', help='Prefetch artwork for a list of art URLs')
+    warm_parser.add_argument('sources', nargs='*', metavar='FILE',
+                             help='Files of art URLs or playerctl metadata output (default: stdin)')
+    warm_parser.add_argument('--jobs', '-j', type=int, default=4, metavar='N', help='Parallel downloads (default: 4)')
+    bench_parser = subparsers.add_parser('bench', help='Time the rendering and metadata hot paths')
+    bench_parser.add_argument('names', nargs='*', metavar='NAME', help='Benchmarks to run (default: all)')
+    bench_parser.add_argument('--iterations', '-n', type=int, default=1000, help='Calls per benchmark (default: 1000)')
+    bench_parser.add_argument('--json', metavar='FILE', help="Also write the results as JSON ('-' prints only JSON)")
+    bench_parser.add_argument('--compare', metavar='FILE', help='JSON results of an earlier run to compare against')
+    bench_parser.add_argument('--threshold', type=float, default=20.0, metavar='PCT',
+                              help='Slowdown versus --compare that counts as a regression (default: 20)')
+    status_parser = subparsers.add_parser('status', help='Print a status line whenever it changes, for bars')
+    status_parser.add_argument('--format', dest='line_format', default=DEFAULT_FORMAT, metavar='FORMAT',
+                               help=f"Line template over {{{'}, {'.join(FIELDS)}}} (default: '{DEFAULT_FORMAT}')")
+    status_parser.add_argument('--json', action='store_true',
+                               help='Print JSON objects (text, tooltip, class, percentage and the track fields)')
+    status_parser.add_argument('--granularity', type=float, default=1.0, metavar='PCT',
+                               help='Progress step in percent for {percent} and {bar} (default: 1)')
+    status_parser.add_argument('--bar-width', type=int, default=10, metavar='N', help='Cells of {bar} (default: 10)')
+    status_parser.add_argument('--max-width', type=int, metavar='N', help='Truncate the text to N columns')
+    status_parser.add_argument('--once', action='store_true', help='Print the current line and exit')
+    
     args = parser.parse_args()
     
+    if args.command == 'cache':
+        return cache_main(args)
+    if args.command == 'bench':
+        from .bench import bench_main
+        return bench_main(args)
+    if args.command == 'status':
+        if args.granularity <= 0:
+            print("Error: --granularity must be greater than 0")
+            return 1
+        return StatusLine(
+            line_format=args.line_format,
+            json_output=args.json,
+            granularity=args.granularity,
+            bar_width=args.bar_width,
+            max_width=args.max_width,
+            backend=args.backend,
+            follow=args.follow,
+            poll_interval=args.poll_interval,
+            all_players=args.all_players,
+            player=args.player
+        ).run(once=args.once)
+    
     # Validate interval
     if args.interval < 0.1:
         print("Error: Update interval must be at least 0.1 seconds")
         return 1
     
+    if args.daemon:
+        from .daemon import Daemon
+        return Daemon(
+            socket_path=args.socket,
+            backend=args.backend,
+            follow=args.follow,
+            poll_interval=args.poll_interval,
+            all_players=args.all_players,
+            player=args.player,
+            cache_max_bytes=args.cache_size * 1024 * 1024,
+            cache_max_files=args.cache_files,
+            cache_dir=args.cache_dir
+        ).serve()
+    
     # Create and run application
-    app = BassSenpai(update_interval=args.interval)
+    app_class = BassSenpai
+    extra = {}
+    if args.attach:
+        from .daemon import AttachedBassSenpai
+        app_class = AttachedBassSenpai
+        extra['socket_path'] = args.socket
+    elif args.asyncio:
+        from .aio import AsyncBassSenpai
+        app_class = AsyncBassSenpai
+    
+    app = app_class(
+        **extra,
+        update_interval=args.interval,
+        follow=args.follow,
+        backend=args.backend,
+        poll_interval=args.poll_interval,
+        kitty_transfer=args.kitty_transfer,
+        encoding=args.encoding,
+        frame_bytes=args.frame_bytes,
+        cache_max_bytes=args.cache_size * 1024 * 1024,
+        cache_max_files=args.cache_files,
+        cache_dir=args.cache_dir,
+        stats_overlay=args.stats,
+        stats_file=args.stats_file,
+        trace_file=args.trace_file,
+        stats_interval=args.stats_interval,
+        all_players=args.all_players,
+        player=args.player
+    )
     return app.run()
 
 
@@ -1,37 +1,216 @@
-"""MPRIS integration for bass-senpai using playerctl."""
+"""MPRIS integration for bass-senpai using playerctl or the D-Bus session bus."""
+import shutil
+import socket
 import subprocess
-import json
-from typing import Optional, Dict, Any
+import threading
+import time
+from typing import Optional, Dict, Any, Callable, List
+
+try:
+    from jeepney import DBusAddress, MatchRule, HeaderFields, Properties, message_bus
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg
+except ImportError:  # jeepney is optional, playerctl is the fallback
+    open_dbus_connection = None
+
+# Format string shared by one-shot queries and the --follow stream
+METADATA_FORMAT = "{{artist}}|{{title}}|{{album}}|{{status}}|{{position}}|{{mpris:length}}|{{mpris:artUrl}}"
+
+# Multi-player stream lines start with the player they belong to
+PLAYER_FORMAT = "{{playerInstance}}|{{playerName}}|" + METADATA_FORMAT
+
+# Delay bounds (seconds) before restarting a dead --follow child
+FOLLOW_RESTART_DELAY = 0.5
+FOLLOW_RESTART_MAX_DELAY = 10.0
+
+# Seconds of extrapolation before the position is re-read from the player
+DRIFT_CHECK_INTERVAL = 10.0
+
+
+class PlaybackClock:
+    """Extrapolates playback position between player updates.
+    
+    Stores the last known position together with the playback rate, status
+    and the monotonic time it was observed, so the current position can be
+    computed locally at any frame rate without asking the player.
+    """
+    
+    def __init__(self):
+        self.position = 0.0
+        self.rate = 1.0
+        self.status = 'Stopped'
+        self.anchor = time.monotonic()
+    
+    def sync(self, position: Optional[float] = None, status: Optional[str] = None,
+             rate: Optional[float] = None, now: Optional[float] = None):
+        """Record fresh player state; omitted fields keep extrapolating."""
+        if now is None:
+            now = time.monotonic()
+        if position is None:
+            position = self.current(now=now)
+        self.position = position
+        self.anchor = now
+        if status is not None:
+            self.status = status
+        if rate is not None:
+            self.rate = rate
+    
+    def current(self, length: float = 0, now: Optional[float] = None) -> float:
+        """Get the extrapolated position in seconds, clamped to length."""
+        position = self.position
+        if self.status == 'Playing':
+            if now is None:
+                now = time.monotonic()
+            position += (now - self.anchor) * self.rate
+        if length > 0:
+            position = min(position, length)
+        return max(0.0, position)
+    
+    def drift_check_due(self, interval: Optional[float] = None,
+                        now: Optional[float] = None) -> bool:
+        """Whether a playing clock has run unsynced for longer than interval."""
+        wait = self.seconds_until_drift_check(interval, now)
+        return wait is not None and wait <= 0
+    
+    def seconds_until_drift_check(self, interval: Optional[float] = None,
+                                  now: Optional[float] = None) -> Optional[float]:
+        """Time left before a drift check is due, or None while not playing."""
+        if self.status != 'Playing':
+            return None
+        if interval is None:
+            interval = DRIFT_CHECK_INTERVAL
+        if now is None:
+            now = time.monotonic()
+        return max(0.0, self.anchor + interval - now)
+
+
+def choose_player(players: List[Dict[str, Any]], pinned: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """Pick the player to display.
+    
+    With ``pinned`` names (as for ``playerctl --player``) the first one
+    present wins; a name matches its instances too (``firefox`` matches
+    ``firefox.instance_1_42``). Otherwise a Playing player is preferred,
+    and among several the one whose status changed last, i.e. the most
+    recently started (or, if none plays, the most recently paused) player.
+    Players are dicts with 'name', 'clock' and 'last_active' keys, plus
+    'instance' when the instance name differs from the player name.
+    """
+    if pinned:
+        for name in pinned:
+            for player in players:
+                candidate = player.get('instance', player['name'])
+                if name in (player['name'], candidate) or candidate.startswith(name + '.'):
+                    return player
+        return None
+    
+    playing = [player for player in players if player['clock'].status == 'Playing']
+    return max(playing or players, key=lambda player: player['last_active'], default=None)
+
+
+def note_status(player: Dict[str, Any], status: Optional[str]):
+    """Record a status change of a player for choose_player()."""
+    previous = player['clock'].status
+    if status is not None and status != previous and 'Playing' in (status, previous):
+        player['last_active'] = time.monotonic()
+
+
+def other_players(players: List[Dict[str, Any]], active: Optional[Dict[str, Any]]) -> List[tuple]:
+    """(name, status) of every player except the active one, for the compact list."""
+    return [(player['name'], player['clock'].status) for player in players if player is not active]
 
 
 class MPRISClient:
     """Client for interacting with MPRIS via playerctl."""
     
-    def __init__(self):
+    def __init__(self, follow: bool = False):
+        """Initialize MPRIS client.
+        
+        Args:
+            follow: Keep one long-lived ``playerctl --follow`` child and serve
+                metadata from its output instead of spawning a process per call
+        """
         self.playerctl_available = self._check_playerctl()
+        self.follow = follow
+        self.restarts = 0
+        self.on_change: Optional[Callable[[], None]] = None
+        self._latest: Optional[Dict[str, Any]] = None
+        self._clock = PlaybackClock()
+        self._drift_check: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._process: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+    
+    @property
+    def available(self) -> bool:
+        """Whether this backend can provide metadata at all."""
+        return self.playerctl_available
+    
+    @property
+    def event_driven(self) -> bool:
+        """Whether get_metadata() is a cheap in-memory read that calls on_change."""
+        return self.follow
     
     def _check_playerctl(self) -> bool:
-        """Check if playerctl is available."""
+        """Check if playerctl is available.
+        
+        Only looks it up on PATH: running ``playerctl --version`` cost a
+        process spawn (and up to a 2 s timeout) before the first frame, and a
+        broken install shows up as failing metadata queries anyway.
+        """
+        return shutil.which("playerctl") is not None
+    
+    def _parse_metadata(self, output: str) -> Optional[Dict[str, Any]]:
+        """Parse one line of METADATA_FORMAT output into a metadata dict."""
+        output = output.strip()
+        if not output:
+            return None
+        
+        parts = output.split('|')
+        if len(parts) < 7:
+            return None
+        
+        artist, title, album, status, position, length, art_url = parts[:7]
+        
+        # Convert position and length from microseconds to seconds
         try:
-            subprocess.run(
-                ["playerctl", "--version"],
-                capture_output=True,
-                timeout=2
-            )
-            return True
-        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.CalledProcessError):
-            return False
+            position_sec = int(position) / 1000000 if position else 0
+            length_sec = int(length) / 1000000 if length else 0
+        except (ValueError, ZeroDivisionError):
+            position_sec = 0
+            length_sec = 0
+        
+        return {
+            'artist': artist or 'Unknown Artist',
+            'title': title or 'Unknown Title',
+            'album': album or 'Unknown Album',
+            'status': status or 'Stopped',
+            'position': position_sec,
+            'length': length_sec,
+            'art_url': art_url or None
+        }
     
     def get_metadata(self) -> Optional[Dict[str, Any]]:
         """Get current track metadata from MPRIS."""
         if not self.playerctl_available:
             return None
         
+        if self.follow:
+            self._ensure_follower()
+            with self._lock:
+                if not self._latest:
+                    return None
+                metadata = dict(self._latest)
+                metadata['position'] = self._clock.current(metadata['length'])
+                drift_check_due = self._clock.drift_check_due()
+            if drift_check_due:
+                self._start_drift_check()
+            return metadata
+        
         try:
             # Get all metadata at once for efficiency
             result = subprocess.run(
-                ["playerctl", "metadata", "--format", 
-                 "{{artist}}|{{title}}|{{album}}|{{status}}|{{position}}|{{mpris:length}}|{{mpris:artUrl}}"],
+                ["playerctl", "metadata", "--format", METADATA_FORMAT],
                 capture_output=True,
                 text=True,
                 timeout=1
@@ -40,42 +219,118 @@ class MPRISClient:
             if result.returncode != 0:
                 return None
             
-            output = result.stdout.strip()
-            if not output:
-                return None
+            return self._parse_metadata(result.stdout)
+        
+        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.CalledProcessError):
+            return None
+    
+    def _ensure_follower(self):
+        """Start the background --follow reader if it is not running yet."""
+        if self._reader is not None or self._closed.is_set():
+            return
+        
+        self._reader = threading.Thread(
+            target=self._follow_loop,
+            name='bass-senpai-playerctl-follow',
+            daemon=True
+        )
+        self._reader.start()
+    
+    def _follow_loop(self):
+        """Read the --follow stream, restarting playerctl whenever it exits."""
+        delay = FOLLOW_RESTART_DELAY
+        
+        while not self._closed.is_set():
+            try:
+                process = subprocess.Popen(
+                    ["playerctl", "--follow", "metadata", "--format", METADATA_FORMAT],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1
+                )
+            except OSError:
+                process = None
             
-            parts = output.split('|')
-            if len(parts) < 7:
-                return None
+            if process is not None:
+                self._process = process
+                for line in process.stdout:
+                    # playerctl prints an empty line when the player goes away
+                    metadata = self._parse_metadata(line)
+                    with self._lock:
+                        self._latest = metadata
+                        if metadata:
+                            self._clock.sync(metadata['position'], metadata['status'])
+                    delay = FOLLOW_RESTART_DELAY
+                    if self.on_change is not None:
+                        self.on_change()
+                
+                process.stdout.close()
+                process.wait()
+                self._process = None
             
-            artist, title, album, status, position, length, art_url = parts[:7]
+            with self._lock:
+                self._latest = None
             
-            # Convert position and length from microseconds to seconds
+            # Child died (player crash, bus restart, ...): back off and respawn
+            if self._closed.wait(delay):
+                break
+            delay = min(delay * 2, FOLLOW_RESTART_MAX_DELAY)
+            self.restarts += 1
+    
+    def _start_drift_check(self):
+        """Re-read the position in the background once the clock is stale."""
+        if self._drift_check is not None and self._drift_check.is_alive():
+            return
+        
+        self._drift_check = threading.Thread(
+            target=self._run_drift_check,
+            name='bass-senpai-drift-check',
+            daemon=True
+        )
+        self._drift_check.start()
+    
+    def _run_drift_check(self):
+        """Resynchronise the playback clock with ``playerctl position``."""
+        try:
+            result = subprocess.run(
+                ["playerctl", "position"],
+                capture_output=True,
+                text=True,
+                timeout=1
+            )
+            position = float(result.stdout.strip()) if result.returncode == 0 else None
+        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.CalledProcessError, ValueError):
+            position = None
+        
+        with self._lock:
+            # Restart the drift timer even on failure so we don't retry every frame
+            self._clock.sync(position)
+    
+    def close(self):
+        """Stop the --follow child and its reader thread."""
+        self._closed.set()
+        
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
             try:
-                position_sec = int(position) / 1000000 if position else 0
-                length_sec = int(length) / 1000000 if length else 0
-            except (ValueError, ZeroDivisionError):
-                position_sec = 0
-                length_sec = 0
-            
-            return {
-                'artist': artist or 'Unknown Artist',
-                'title': title or 'Unknown Title',
-                'album': album or 'Unknown Album',
-                'status': status or 'Stopped',
-                'position': position_sec,
-                'length': length_sec,
-                'art_url': art_url or None
-            }
+                process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                process.kill()
         
-        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.CalledProcessError):
-            return None
+        if self._reader is not None:
+            self._reader.join(timeout=2)
     
     def get_playback_status(self) -> str:
         """Get current playback status."""
         if not self.playerctl_available:
             return "Stopped"
         
+        if self.follow:
+            metadata = self.get_metadata()
+            return metadata['status'] if metadata else "Stopped"
+        
         try:
             result = subprocess.run(
                 ["playerctl", "status"],
@@ -90,3 +345,441 @@ class MPRISClient:
         
         except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.CalledProcessError):
             return "Stopped"
+
+
+class MultiPlayerMPRISClient(MPRISClient):
+    """playerctl backend that tracks every player from one --follow stream.
+    
+    Runs ``playerctl --all-players --follow`` with the player instance in
+    front of each line and keeps a PlaybackClock per player, so switching
+    between players (one starts playing, another pauses) is a local
+    decision by choose_player() and never spawns a process. Only a player
+    exiting, which playerctl reports as an empty line, costs one
+    ``playerctl --list-all`` to find out which one left.
+    """
+    
+    def __init__(self, pinned: Optional[List[str]] = None, list_players: bool = False):
+        """Initialize the multi-player client.
+        
+        Args:
+            pinned: Player names to show, in order of preference (see choose_player)
+            list_players: Add the other players to the metadata as 'players'
+        """
+        super().__init__(follow=True)
+        self.pinned = pinned
+        self.list_players = list_players
+        self._players: Dict[str, Dict[str, Any]] = {}
+        self._drift_player: Optional[str] = None
+    
+    def get_metadata(self) -> Optional[Dict[str, Any]]:
+        """Metadata of the active player, from the in-memory state."""
+        if not self.playerctl_available:
+            return None
+        
+        self._ensure_follower()
+        with self._lock:
+            player = choose_player(list(self._players.values()), self.pinned)
+            if player is None:
+                return None
+            metadata = dict(player['metadata'])
+            metadata['position'] = player['clock'].current(metadata['length'])
+            if self.list_players:
+                metadata['players'] = other_players(list(self._players.values()), player)
+            drift_check_due = player['clock'].drift_check_due()
+            self._drift_player = player['instance']
+        if drift_check_due:
+            self._start_drift_check()
+        return metadata
+    
+    def _apply_line(self, line: str):
+        """Update the player a stream line belongs to."""
+        instance, _, rest = line.strip().partition('|')
+        if not instance:
+            self._prune_players()
+            return
+        name, _, rest = rest.partition('|')
+        metadata = self._parse_metadata(rest)
+        with self._lock:
+            if metadata is None:
+                self._players.pop(instance, None)
+                return
+            player = self._players.get(instance)
+            if player is None:
+                player = self._players[instance] = {
+                    'instance': instance, 'name': name or instance, 'clock': PlaybackClock(),
+                    'last_active': 0.0,
+                }
+            note_status(player, metadata['status'])
+            player['metadata'] = metadata
+            player['clock'].sync(metadata['position'], metadata['status'])
+    
+    def _prune_players(self):
+        """Drop players that are no longer running."""
+        try:
+            result = subprocess.run(["playerctl", "--list-all"], capture_output=True, text=True, timeout=1)
+            running = set(result.stdout.split()) if result.returncode == 0 else set()
+        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.CalledProcessError):
+            return
+        with self._lock:
+            for instance in list(self._players):
+                if instance not in running:
+                    del self._players[instance]
+    
+    def _follow_loop(self):
+        """Read the --all-players stream, restarting playerctl whenever it exits."""
+        delay = FOLLOW_RESTART_DELAY
+        
+        while not self._closed.is_set():
+            try:
+                process = subprocess.Popen(
+                    ["playerctl", "--all-players", "--follow", "metadata", "--format", PLAYER_FORMAT],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1
+                )
+            except OSError:
+                process = None
+            
+            if process is not None:
+                self._process = process
+                for line in process.stdout:
+                    self._apply_line(line)
+                    delay = FOLLOW_RESTART_DELAY
+                    if self.on_change is not None:
+                        self.on_change()
+                
+                process.stdout.close()
+                process.wait()
+                self._process = None
+            
+            with self._lock:
+                self._players.clear()
+            
+            if self._closed.wait(delay):
+                break
+            delay = min(delay * 2, FOLLOW_RESTART_MAX_DELAY)
+            self.restarts += 1
+    
+    def _run_drift_check(self):
+        """Resynchronise the active player's clock with ``playerctl position``."""
+        instance = self._drift_player
+        try:
+            result = subprocess.run(
+                ["playerctl", f"--player={instance}", "position"],
+                capture_output=True,
+                text=True,
+                timeout=1
+            )
+            position = float(result.stdout.strip()) if result.returncode == 0 else None
+        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.CalledProcessError, ValueError):
+            position = None
+        
+        with self._lock:
+            player = self._players.get(instance)
+            if player is not None:
+                player['clock'].sync(position)
+
+
+MPRIS_PREFIX = 'org.mpris.MediaPlayer2.'
+MPRIS_PATH = '/org/mpris/MediaPlayer2'
+PLAYER_INTERFACE = 'org.mpris.MediaPlayer2.Player'
+
+
+class DBusMPRISClient:
+    """Client reading MPRIS players directly from the D-Bus session bus.
+    
+    A background thread subscribes to ``PropertiesChanged``, ``Seeked`` and
+    ``NameOwnerChanged`` and keeps the state of every player in memory, so
+    ``get_metadata()`` never talks to the bus and an idle viewer does no work
+    between track changes. While a player is Playing its position is
+    extrapolated locally and re-read every DRIFT_CHECK_INTERVAL seconds.
+    Requires the optional ``jeepney`` package.
+    """
+    
+    event_driven = True
+    
+    def __init__(self, pinned: Optional[List[str]] = None, list_players: bool = False):
+        """Initialize the D-Bus client.
+        
+        Args:
+            pinned: Player names to show, in order of preference (see choose_player)
+            list_players: Add the other players to the metadata as 'players'
+        """
+        self.pinned = pinned
+        self.list_players = list_players
+        self.available = self._check_bus()
+        self.messages = 0  # Signals received from the bus
+        self.calls = 0     # Method calls issued to players
+        self.on_change: Optional[Callable[[], None]] = None
+        self._players: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._closed = threading.Event()
+        self._conn = None
+        self._listener: Optional[threading.Thread] = None
+    
+    def _check_bus(self) -> bool:
+        """Check that jeepney is installed and a session bus is reachable."""
+        if open_dbus_connection is None:
+            return False
+        try:
+            conn = open_dbus_connection(bus='SESSION')
+        except Exception:
+            return False
+        conn.close()
+        return True
+    
+    def get_metadata(self) -> Optional[Dict[str, Any]]:
+        """Get current track metadata from the in-memory player state."""
+        if not self.available:
+            return None
+        
+        self._ensure_listener()
+        with self._lock:
+            player = self._active_player()
+            if player is None:
+                return None
+            metadata = self._to_metadata(player)
+            if self.list_players:
+                metadata['players'] = other_players(list(self._players.values()), player)
+            return metadata
+    
+    def get_playback_status(self) -> str:
+        """Get current playback status."""
+        metadata = self.get_metadata()
+        return metadata['status'] if metadata else "Stopped"
+    
+    def close(self):
+        """Disconnect from the bus and stop the listener thread."""
+        self._closed.set()
+        conn = self._conn
+        if conn is not None:
+            try:
+                # Wakes the listener out of its blocking receive()
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._listener is not None:
+            self._listener.join(timeout=2)
+    
+    def _ensure_listener(self):
+        """Start the signal listener and wait briefly for the initial sync."""
+        if self._listener is not None or self._closed.is_set():
+            return
+        
+        self._listener = threading.Thread(
+            target=self._listen,
+            name='bass-senpai-dbus',
+            daemon=True
+        )
+        self._listener.start()
+        self._ready.wait(timeout=1)
+    
+    def _active_player(self) -> Optional[Dict[str, Any]]:
+        """Pick the player to display (see choose_player)."""
+        return choose_player(list(self._players.values()), self.pinned)
+    
+    def _to_metadata(self, player: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert raw player state into the metadata dict used by the UI."""
+        raw = player['metadata']
+        
+        def text(key: str) -> str:
+            value = raw.get(key, ('s', ''))[1]
+            if isinstance(value, list):
+                value = ', '.join(value)
+            return value or ''
+        
+        clock = player['clock']
+        length_us = raw.get('mpris:length', ('x', 0))[1] or 0
+        length = length_us / 1000000
+        position = clock.current(length)
+        
+        return {
+            'artist': text('xesam:artist') or 'Unknown Artist',
+            'title': text('xesam:title') or 'Unknown Title',
+            'album': text('xesam:album') or 'Unknown Album',
+            'status': clock.status or 'Stopped',
+            'position': position,
+            'length': length,
+            'art_url': text('mpris:artUrl') or None
+        }
+    
+    def _listen(self):
+        """Own the bus connection: initial sync, then dispatch signals."""
+        try:
+            conn = open_dbus_connection(bus='SESSION')
+        except Exception:
+            self._ready.set()
+            return
+        self._conn = conn
+        
+        try:
+            # Catch-all queue so signals arriving during method calls are kept
+            queue = conn.filter(MatchRule(type='signal')).queue
+            
+            owner_rule = MatchRule(
+                type='signal', sender='org.freedesktop.DBus',
+                interface='org.freedesktop.DBus', member='NameOwnerChanged'
+            )
+            owner_rule.add_arg_condition(0, MPRIS_PREFIX.rstrip('.'), kind='namespace')
+            props_rule = MatchRule(
+                type='signal', interface='org.freedesktop.DBus.Properties',
+                member='PropertiesChanged', path=MPRIS_PATH
+            )
+            props_rule.add_arg_condition(0, PLAYER_INTERFACE)
+            seeked_rule = MatchRule(
+                type='signal', interface=PLAYER_INTERFACE,
+                member='Seeked', path=MPRIS_PATH
+            )
+            for rule in (owner_rule, props_rule, seeked_rule):
+                conn.send_and_get_reply(message_bus.AddMatch(rule))
+            
+            names = unwrap_msg(conn.send_and_get_reply(message_bus.ListNames()))[0]
+            for name in names:
+                if not name.startswith(MPRIS_PREFIX):
+                    continue
+                try:
+                    owner = unwrap_msg(conn.send_and_get_reply(message_bus.GetNameOwner(name)))[0]
+                except Exception:
+                    continue  # Player exited between ListNames and now
+                self._add_player(conn, name, owner)
+            self._ready.set()
+            
+            while not self._closed.is_set():
+                try:
+                    # Only wake up on our own while something is playing
+                    msg = conn.recv_until_filtered(queue, timeout=self._next_drift_check())
+                except TimeoutError:
+                    self._check_drift(conn)
+                    continue
+                self.messages += 1
+                self._dispatch(conn, msg)
+                if self.on_change is not None:
+                    self.on_change()
+        
+        except Exception:
+            # Connection closed (shutdown or bus went away)
+            pass
+        
+        finally:
+            self._ready.set()
+            with self._lock:
+                self._players.clear()
+            conn.close()
+            self._conn = None
+    
+    def _call(self, conn, bus_name: str, method: str, *args):
+        """Issue one Properties call to a player and return the reply body."""
+        self.calls += 1
+        props = Properties(DBusAddress(MPRIS_PATH, bus_name=bus_name, interface=PLAYER_INTERFACE))
+        return unwrap_msg(conn.send_and_get_reply(getattr(props, method)(*args), timeout=1))
+    
+    def _add_player(self, conn, bus_name: str, owner: str):
+        """Fetch the full property set of a newly seen player."""
+        try:
+            props = self._call(conn, bus_name, 'get_all')[0]
+        except Exception:
+            return
+        
+        clock = PlaybackClock()
+        clock.sync(
+            props.get('Position', ('x', 0))[1] / 1000000,
+            props.get('PlaybackStatus', ('s', 'Stopped'))[1],
+            props.get('Rate', ('d', 1.0))[1]
+        )
+        with self._lock:
+            self._players[owner] = {
+                'bus_name': bus_name,
+                'name': bus_name[len(MPRIS_PREFIX):],
+                'metadata': props.get('Metadata', ('a{sv}', {}))[1],
+                'clock': clock,
+                # A player found playing counts as just started
+                'last_active': time.monotonic() if clock.status == 'Playing' else 0.0,
+            }
+    
+    def _refresh_position(self, conn, owner: str):
+        """Re-read Position after a track or status change."""
+        player = self._players.get(owner)
+        if player is None:
+            return
+        try:
+            position = self._call(conn, player['bus_name'], 'get', 'Position')[0][1] / 1000000
+        except Exception:
+            position = None
+        with self._lock:
+            player['clock'].sync(position)
+    
+    def _next_drift_check(self) -> Optional[float]:
+        """Seconds until the earliest drift check, None when nothing plays."""
+        waits = [
+            player['clock'].seconds_until_drift_check()
+            for player in list(self._players.values())
+        ]
+        waits = [wait for wait in waits if wait is not None]
+        return min(waits) if waits else None
+    
+    def _check_drift(self, conn):
+        """Re-read Position for every playing player whose clock is stale."""
+        for owner, player in list(self._players.items()):
+            if player['clock'].drift_check_due():
+                self._refresh_position(conn, owner)
+    
+    def _dispatch(self, conn, msg):
+        """Apply one incoming signal to the player state."""
+        member = msg.header.fields.get(HeaderFields.member)
+        sender = msg.header.fields.get(HeaderFields.sender)
+        
+        if member == 'NameOwnerChanged':
+            name, old_owner, new_owner = msg.body
+            if not name.startswith(MPRIS_PREFIX):
+                return
+            if old_owner:
+                with self._lock:
+                    self._players.pop(old_owner, None)
+            if new_owner:
+                self._add_player(conn, name, new_owner)
+        
+        elif member == 'PropertiesChanged':
+            interface, changed, _invalidated = msg.body
+            player = self._players.get(sender)
+            if interface != PLAYER_INTERFACE or player is None:
+                return
+            with self._lock:
+                clock = player['clock']
+                if 'PlaybackStatus' in changed:
+                    note_status(player, changed['PlaybackStatus'][1])
+                    clock.sync(status=changed['PlaybackStatus'][1])
+                if 'Rate' in changed:
+                    clock.sync(rate=changed['Rate'][1])
+                if 'Metadata' in changed:
+                    player['metadata'] = changed['Metadata'][1]
+            if 'PlaybackStatus' in changed or 'Metadata' in changed:
+                self._refresh_position(conn, sender)
+        
+        elif member == 'Seeked':
+            player = self._players.get(sender)
+            if player is None:
+                return
+            with self._lock:
+                player['clock'].sync(msg.body[0] / 1000000)
+
+
+def create_client(backend: str = 'auto', follow: bool = False, all_players: bool = False,
+                  pinned: Optional[List[str]] = None):
+    """Create the MPRIS client for the requested backend.
+    
+    Args:
+        backend: ``'dbus'``, ``'playerctl'`` or ``'auto'`` (D-Bus when
+            jeepney and a session bus are available, playerctl otherwise)
+        follow: Use the streaming mode of the playerctl backend
+        all_players: Track every player and list the others in the metadata
+        pinned: Player names to show, in order of preference
+    """
+    if backend in ('auto', 'dbus'):
+        client = DBusMPRISClient(pinned=pinned, list_players=all_players)
+        if client.available or backend == 'dbus':
+            return client
+    if all_players or pinned:
+        return MultiPlayerMPRISClient(pinned=pinned, list_players=all_players)
+    return MPRISClient(follow=follow)
@@ -0,0 +1,82 @@
+"""Colour encodings for text-art: truecolor, xterm 256-colour and 16-colour SGR."""
+from functools import lru_cache
+from typing import List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Richest first; a byte budget walks down this list until the frame fits
+ENCODINGS = ('truecolor', '256', '16')
+
+# xterm's default colours for SGR 30-37 and 90-97
+ANSI_16 = (
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+)
+
+# Channel levels of the 6x6x6 cube (16-231); 232-255 are greys 8, 18, ..., 238
+CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+# Bits per channel of the lookup table index (32768 entries)
+LUT_BITS = 5
+
+# SGR parameters per palette index, for foreground and background
+FG_256 = tuple(f'38;5;{index}' for index in range(256))
+BG_256 = tuple(f'48;5;{index}' for index in range(256))
+FG_16 = tuple(f'3{index}' if index < 8 else f'9{index - 8}' for index in range(16))
+BG_16 = tuple(f'4{index}' if index < 8 else f'10{index - 8}' for index in range(16))
+
+
+def xterm_colours(encoding: str) -> List[Tuple[Tuple[int, int, int], int]]:
+    """(rgb, SGR palette index) of every colour an encoding may use.
+    
+    The 256-colour encoding only uses the cube and grey ramp, whose values
+    are fixed, and not 0-15, which terminal themes redefine.
+    """
+    if encoding == '16':
+        return [(rgb, index) for index, rgb in enumerate(ANSI_16)]
+    colours = [((CUBE_LEVELS[index // 36], CUBE_LEVELS[index // 6 % 6], CUBE_LEVELS[index % 6]), 16 + index)
+               for index in range(216)]
+    colours += [((8 + 10 * step,) * 3, 232 + step) for step in range(24)]
+    return colours
+
+
+@lru_cache(maxsize=None)
+def lookup_table(encoding: str) -> bytes:
+    """Nearest palette index for every colour reduced to LUT_BITS per channel.
+    
+    Built once per encoding by letting PIL map a swatch of all 32768
+    reduced colours onto the palette, so per-frame quantization is a table
+    lookup per pixel.
+    """
+    from PIL import Image
+    
+    colours = xterm_colours(encoding)
+    palette = Image.new('P', (1, 1))
+    flat = [channel for rgb, _ in colours for channel in rgb]
+    palette.putpalette(flat + flat[:3] * (256 - len(colours)))
+    
+    shift = 8 - LUT_BITS
+    half = 1 << (shift - 1)
+    size = 1 << (3 * LUT_BITS)
+    swatch = bytearray()
+    for key in range(size):
+        swatch += bytes((((key >> (2 * LUT_BITS)) << shift) + half,
+                         (((key >> LUT_BITS) & ((1 << LUT_BITS) - 1)) << shift) + half,
+                         ((key & ((1 << LUT_BITS) - 1)) << shift) + half))
+    slots = Image.frombytes('RGB', (size, 1), bytes(swatch)).quantize(palette=palette, dither=Image.Dither.NONE)
+    
+    # Palette slot -> xterm index (padding slots repeat the first colour)
+    codes = bytes(index for _, index in colours) + bytes((colours[0][1],)) * (256 - len(colours))
+    return slots.tobytes().translate(codes)
+
+
+def palette_indices(img: 'Image.Image', encoding: str) -> List[int]:
+    """xterm palette index of every pixel of img, in raster order."""
+    table = lookup_table(encoding)
+    shift = 8 - LUT_BITS
+    data = img.convert('RGB').tobytes()
+    return [table[(r >> shift) << (2 * LUT_BITS) | (g >> shift) << LUT_BITS | (b >> shift)]
+            for r, g, b in zip(data[0::3], data[1::3], data[2::3])]
@@ -0,0 +1,59 @@
+"""Pre-scaled raw RGB pixel files that can be memory-mapped."""
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# magic, version, width, height, channels, source mtime (ns), payload bytes
+PIXEL_HEADER = struct.Struct('<4sHHHHqI')
+PIXEL_MAGIC = b'BSPX'
+PIXEL_VERSION = 1
+
+
+def write_pixels(path: Path, img: 'Image.Image', source_mtime_ns: int):
+    """Store an RGB image as header + raw pixels, atomically."""
+    data = img.tobytes()
+    header = PIXEL_HEADER.pack(PIXEL_MAGIC, PIXEL_VERSION, img.width, img.height, 3, source_mtime_ns, len(data))
+    # Per thread: background workers may write the same tier at once
+    tmp_path = Path(path).with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def map_pixels(path: Path, source_mtime_ns: Optional[int] = None) -> Optional['Image.Image']:
+    """Memory-map a pixel file as an RGB image without copying or decoding.
+    
+    Returns None if the file is missing, malformed, or was made from a
+    different version of the source image.
+    """
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    
+    if len(mapped) < PIXEL_HEADER.size:
+        mapped.close()
+        return None
+    magic, version, width, height, channels, mtime_ns, length = PIXEL_HEADER.unpack_from(mapped)
+    if (magic != PIXEL_MAGIC or version != PIXEL_VERSION or channels != 3
+            or length != width * height * 3 or len(mapped) < PIXEL_HEADER.size + length
+            or (source_mtime_ns is not None and mtime_ns != source_mtime_ns)):
+        mapped.close()
+        return None
+    
+    # The image keeps the mapping alive; pages are only read when touched
+    from PIL import Image
+    pixels = memoryview(mapped)[PIXEL_HEADER.size:PIXEL_HEADER.size + length]
+    return Image.frombuffer('RGB', (width, height), pixels, 'raw', 'RGB', 0, 1)
@@ -0,0 +1,179 @@
+"""State-driven update scheduling for bass-senpai."""
+import select
+import socket
+import time
+from typing import Optional, Dict, Any, NamedTuple
+
+# Seconds between metadata polls while Playing (position is extrapolated between polls)
+PLAYING_POLL_INTERVAL = 5.0
+
+# Upper bounds for the backoff while Paused/Stopped and while no player exists
+IDLE_MAX_INTERVAL = 5.0
+NO_PLAYER_MAX_INTERVAL = 10.0
+BACKOFF_FACTOR = 1.5
+
+# Extra wait after the expected end of a track before polling for the next one
+TRACK_END_SLACK = 0.5
+
+STATES = ('Playing', 'Paused', 'Stopped', 'NoPlayer')
+
+
+class Tick(NamedTuple):
+    """What the main loop should do after a scheduler wakeup."""
+    poll: bool
+    resized: bool
+
+
+class UpdateScheduler:
+    """Chooses when to poll metadata and when to redraw based on player state.
+    
+    While Playing the display is redrawn every ``redraw_interval`` but
+    metadata is only polled every ``poll_interval`` (or at the expected end
+    of the track, whichever comes first). While Paused, Stopped or without a
+    player the interval backs off steadily and nothing is redrawn between
+    polls. ``wake()`` interrupts the current wait, e.g. on terminal resize or
+    when an event-driven backend reports a change. The wait is a select()
+    on a self-pipe, so waking only sets flags and writes a byte and is safe
+    inside a signal handler, which a lock-based Event is not.
+    """
+    
+    def __init__(self, redraw_interval: float = 1.0, poll_interval: float = PLAYING_POLL_INTERVAL):
+        """Initialize the scheduler.
+        
+        Args:
+            redraw_interval: Seconds between redraws while Playing, also the
+                first step of the idle backoff
+            poll_interval: Seconds between metadata polls while Playing
+        """
+        self.redraw_interval = redraw_interval
+        self.poll_interval = max(poll_interval, redraw_interval)
+        self.state = 'NoPlayer'
+        self.wakeups: Dict[str, int] = {state: 0 for state in STATES}
+        self.seconds: Dict[str, float] = {state: 0.0 for state in STATES}
+        now = time.monotonic()
+        self._state_since = now
+        self._backoff = redraw_interval
+        self._next_poll = now
+        self._next_redraw = now
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._wake_poll = False
+        self._wake_resize = False
+    
+    def _state_of(self, metadata: Optional[Dict[str, Any]]) -> str:
+        """Map metadata to one of STATES."""
+        if not metadata:
+            return 'NoPlayer'
+        status = metadata.get('status', 'Stopped')
+        return status if status in STATES else 'Stopped'
+    
+    def _enter(self, state: str, now: float):
+        """Switch state, accounting the time spent in the previous one."""
+        self.seconds[self.state] += now - self._state_since
+        self._state_since = now
+        self.state = state
+        self._backoff = self.redraw_interval
+    
+    def observe(self, metadata: Optional[Dict[str, Any]], now: Optional[float] = None):
+        """Record freshly polled metadata and schedule the next poll."""
+        if now is None:
+            now = time.monotonic()
+        
+        state = self._state_of(metadata)
+        if state != self.state:
+            self._enter(state, now)
+        
+        if state == 'Playing':
+            interval = self.poll_interval
+            length = metadata.get('length', 0)
+            if length > 0:
+                remaining = max(0.0, length - metadata.get('position', 0))
+                interval = min(interval, remaining + TRACK_END_SLACK)
+            self._next_poll = now + max(interval, self.redraw_interval)
+            return
+        
+        # Nothing moves on screen while idle, so only wake up to poll
+        limit = NO_PLAYER_MAX_INTERVAL if state == 'NoPlayer' else IDLE_MAX_INTERVAL
+        self._next_poll = now + self._backoff
+        self._next_redraw = self._next_poll
+        self._backoff = min(self._backoff * BACKOFF_FACTOR, limit)
+    
+    def wake(self, poll: bool = True, resize: bool = False):
+        """Interrupt the current wait; safe to call from threads and signal handlers."""
+        if poll:
+            self._wake_poll = True
+        if resize:
+            self._wake_resize = True
+        try:
+            self._wake_w.send(b'.')
+        except OSError:
+            # Pipe full (a wakeup is already pending) or closed
+            pass
+    
+    def redraw_in(self, seconds: float):
+        """Make the next redraw while Playing due in seconds instead of on the interval."""
+        self._next_redraw = time.monotonic() + seconds
+    
+    def next_deadline(self) -> float:
+        """Monotonic time of the next scheduled wakeup."""
+        if self.state == 'Playing':
+            return min(self._next_poll, self._next_redraw)
+        return self._next_poll
+    
+    def seconds_until_poll(self) -> float:
+        """Seconds until the next metadata poll is due."""
+        return max(0.0, self._next_poll - time.monotonic())
+    
+    def wait(self) -> Tick:
+        """Sleep until the next poll/redraw is due or wake() is called."""
+        timeout = max(0.0, self.next_deadline() - time.monotonic())
+        woken = bool(select.select([self._wake_r], [], [], timeout)[0])
+        if woken:
+            self._drain()
+        
+        now = time.monotonic()
+        self.record_wakeup()
+        
+        poll = now >= self._next_poll
+        resized = False
+        if woken:
+            poll = poll or self._wake_poll
+            resized = self._wake_resize
+            self._wake_poll = False
+            self._wake_resize = False
+        
+        if self.state == 'Playing' and now >= self._next_redraw:
+            self._next_redraw += self.redraw_interval
+            if self._next_redraw <= now:
+                # Fell behind (suspend, slow frame): resync instead of bursting
+                self._next_redraw = now + self.redraw_interval
+        
+        return Tick(poll=poll, resized=resized)
+    
+    def _drain(self):
+        """Discard pending wakeup bytes."""
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except OSError:
+            pass
+    
+    def close(self):
+        """Close the self-pipe."""
+        self._wake_r.close()
+        self._wake_w.close()
+    
+    def record_wakeup(self):
+        """Count one wakeup against the current state."""
+        self.wakeups[self.state] += 1
+    
+    def wakeups_per_minute(self) -> Dict[str, float]:
+        """Wakeups per minute actually spent in each state so far."""
+        seconds = dict(self.seconds)
+        seconds[self.state] += time.monotonic() - self._state_since
+        return {
+            state: self.wakeups[state] * 60.0 / seconds[state]
+            for state in STATES
+            if seconds[state] > 0
+        }
@@ -0,0 +1,78 @@
+"""Typed track state for bass-senpai."""
+from typing import Optional, Dict, Any, FrozenSet, Tuple
+
+# Parts of the screen that can be redrawn independently
+PANELS = frozenset(('info', 'status', 'progress', 'time', 'artwork'))
+
+
+class TrackState:
+    """Snapshot of the current track and playback position.
+    
+    Replaces the metadata dict on the render path. ``dirty_panels()``
+    compares two states and names the panels whose output would differ,
+    so a tick where only the position moved can skip everything else.
+    """
+    
+    __slots__ = ('artist', 'title', 'album', 'status', 'position', 'length', 'art_url', 'players')
+    
+    def __init__(self, artist: str = 'Unknown Artist', title: str = 'Unknown Title',
+                 album: str = 'Unknown Album', status: str = 'Stopped', position: float = 0.0,
+                 length: float = 0.0, art_url: Optional[str] = None, players: Tuple[Tuple[str, str], ...] = ()):
+        self.artist = artist
+        self.title = title
+        self.album = album
+        self.status = status
+        self.position = position
+        self.length = length
+        self.art_url = art_url
+        self.players = players  # (name, status) of the other players, if listed
+    
+    @classmethod
+    def from_metadata(cls, metadata: Optional[Dict[str, Any]]) -> Optional['TrackState']:
+        """Build a state from an MPRIS metadata dict (None if no player)."""
+        if not metadata:
+            return None
+        return cls(
+            metadata.get('artist', 'Unknown Artist'),
+            metadata.get('title', 'Unknown Title'),
+            metadata.get('album', 'Unknown Album'),
+            metadata.get('status', 'Stopped'),
+            metadata.get('position', 0),
+            metadata.get('length', 0),
+            metadata.get('art_url'),
+            tuple(tuple(player) for player in metadata.get('players', ()))
+        )
+    
+    @property
+    def track_id(self) -> str:
+        """Identity of the track, independent of playback state."""
+        return f"{self.artist}|{self.title}|{self.album}"
+    
+    def dirty_panels(self, previous: Optional['TrackState']) -> FrozenSet[str]:
+        """Panels that have to be redrawn to go from ``previous`` to this state."""
+        if previous is None:
+            return PANELS
+        
+        dirty = set()
+        if ((self.artist, self.title, self.album, self.players)
+                != (previous.artist, previous.title, previous.album, previous.players)):
+            dirty.add('info')
+        if self.status != previous.status:
+            dirty.add('status')
+        if self.position != previous.position or self.length != previous.length:
+            dirty.add('progress')
+        # Timestamps only show whole seconds
+        if int(self.position) != int(previous.position) or int(self.length) != int(previous.length):
+            dirty.add('time')
+        if self.art_url != previous.art_url:
+            dirty.add('artwork')
+        return frozenset(dirty)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TrackState):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'TrackState({fields})'
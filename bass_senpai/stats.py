@@ -0,0 +1,126 @@
+"""Per-frame timing instrumentation for bass-senpai."""
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, List, Iterator
+
+# Timed phases of an update, in the order they run
+PHASES = ('metadata', 'artwork', 'track_info', 'layout', 'display', 'frame')
+
+# Samples kept per phase for the rolling percentiles
+STATS_WINDOW = 500
+
+# Phase events kept for the trace file (about 1000 frames)
+TRACE_EVENTS = 6000
+
+# Seconds between writes of --stats-file / --trace-file
+STATS_DUMP_INTERVAL = 5.0
+
+PERCENTILES = (50, 95, 99)
+
+
+class FrameStats:
+    """Rolling per-phase timings plus byte and cache counters.
+    
+    ``phase()`` times a block and keeps the last STATS_WINDOW durations per
+    phase for percentiles. With ``trace`` on, every timed block is also kept
+    as a Chrome trace event (chrome://tracing, Perfetto) in a bounded ring.
+    """
+    
+    def __init__(self, window: int = STATS_WINDOW, trace: bool = False):
+        self.samples: Dict[str, deque] = {name: deque(maxlen=window) for name in PHASES}
+        self.counters: Dict[str, int] = {}
+        self.events: Optional[deque] = deque(maxlen=TRACE_EVENTS) if trace else None
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one sample of phase name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+    
+    def record(self, name: str, start: float, end: float):
+        """Add one sample measured with time.perf_counter()."""
+        with self._lock:
+            self.samples[name].append(end - start)
+            if self.events is not None:
+                self.events.append((name, start, end, threading.get_ident()))
+    
+    def count(self, name: str, amount: int = 1):
+        """Add to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def percentiles(self, name: str) -> Dict[str, float]:
+        """Nearest-rank percentiles and maximum of a phase, in milliseconds."""
+        with self._lock:
+            values = sorted(self.samples[name])
+        if not values:
+            return {}
+        result = {f'p{point}': values[max(math.ceil(point / 100 * len(values)) - 1, 0)] * 1000
+                  for point in PERCENTILES}
+        result['max'] = values[-1] * 1000
+        result['count'] = len(values)
+        return result
+    
+    def summary(self) -> dict:
+        """Percentiles of every phase that has samples, plus the counters."""
+        phases = {name: self.percentiles(name) for name in PHASES}
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            'time': time.time(),
+            'phases': {name: values for name, values in phases.items() if values},
+            'counters': counters,
+        }
+    
+    def overlay_lines(self, width: int = 80) -> List[str]:
+        """Compact dimmed lines for drawing the stats on screen, cut to width."""
+        summary = self.summary()
+        lines = [f"{name:<10} p50 {values['p50']:7.2f}  p95 {values['p95']:7.2f}  "
+                 f"p99 {values['p99']:7.2f}  max {values['max']:7.2f} ms"
+                 for name, values in summary['phases'].items()]
+        if summary['counters']:
+            lines.append('  '.join(f'{name} {value}' for name, value in sorted(summary['counters'].items())))
+        return [f'\x1b[2m{line[:width]}\x1b[0m' for line in lines]
+    
+    def trace_events(self) -> dict:
+        """The recorded phases in Chrome trace-event JSON form."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events or ())
+        return {
+            'displayTimeUnit': 'ms',
+            'traceEvents': [
+                {'name': name, 'cat': 'bass-senpai', 'ph': 'X', 'pid': pid, 'tid': tid,
+                 'ts': round(start * 1e6, 1), 'dur': round((end - start) * 1e6, 1)}
+                for name, start, end, tid in events
+            ],
+        }
+    
+    def write_json(self, path: Path):
+        """Write summary() to path, atomically."""
+        _write_atomic(path, self.summary())
+    
+    def write_trace(self, path: Path):
+        """Write trace_events() to path, atomically."""
+        _write_atomic(path, self.trace_events())
+
+
+def _write_atomic(path: Path, data: dict):
+    """Replace path with data as JSON, so readers never see half a file."""
+    path = Path(path)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
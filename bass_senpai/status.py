@@ -0,0 +1,206 @@
+"""Headless status-line output for tmux, waybar, polybar and similar bars."""
+import json
+import math
+import signal
+import string
+import sys
+from typing import Optional, Dict, Any, List, Set
+from .mpris import PlaybackClock, create_client
+from .scheduler import UpdateScheduler, PLAYING_POLL_INTERVAL
+from .state import TrackState
+from .text import strip_ansi
+from .ui import TerminalUI
+
+DEFAULT_FORMAT = '{icon} {artist} - {title}'
+
+# Fields available to --format
+FIELDS = ('artist', 'title', 'album', 'status', 'icon', 'elapsed', 'length', 'percent', 'bar')
+
+# Longest sleep while playing when nothing shown depends on the position
+IDLE_REDRAW = 3600.0
+
+
+class StatusLine:
+    """Writes one line per visible change of the current track to a stream.
+    
+    Each line is either ``line_format`` filled in with FIELDS, or with
+    ``json_output`` a waybar-style object (text, tooltip, class,
+    percentage) that also carries the raw track fields. The progress is rounded down to
+    ``granularity`` percent and the process sleeps until the next value a
+    field in the format could show, so a bar that shows whole percents of
+    a four minute track wakes every 2.4 seconds rather than every second.
+    Never loads the artwork code.
+    """
+    
+    def __init__(self, line_format: str = DEFAULT_FORMAT, json_output: bool = False, granularity: float = 1.0,
+                 bar_width: int = 10, max_width: Optional[int] = None, backend: str = 'auto',
+                 follow: bool = False, poll_interval: float = PLAYING_POLL_INTERVAL,
+                 all_players: bool = False, player: Optional[List[str]] = None, client=None,
+                 stream=None):
+        """Initialize the status line.
+        
+        Args:
+            line_format: Text of each line, a str.format template over FIELDS
+            json_output: Write JSON objects instead of plain lines
+            granularity: Progress step in percent
+            bar_width: Cells of the {bar} field
+            max_width: Truncate the text to this many columns
+            backend, follow, poll_interval, all_players, player, client:
+                Where metadata comes from, as for BassSenpai
+            stream: Where lines are written (default: stdout)
+        """
+        self.line_format = line_format
+        self.json_output = json_output
+        self.granularity = granularity
+        self.bar_width = bar_width
+        self.max_width = max_width
+        self.stream = stream or sys.stdout
+        if client is None:
+            client = create_client(backend, follow=follow, all_players=all_players, pinned=player)
+        self.mpris = client
+        self.ui = TerminalUI()
+        self.clock = PlaybackClock()
+        self.metadata = None
+        self.running = False
+        self.lines = 0
+        self._last: Optional[str] = None
+        self._uses = self._fields_used(line_format) | ({'percent'} if json_output else set())
+        
+        self.scheduler = UpdateScheduler(1.0, poll_interval)
+        self.mpris.on_change = self.scheduler.wake
+    
+    @staticmethod
+    def _fields_used(line_format: str) -> Set[str]:
+        """FIELDS referenced by a format string."""
+        return {name.split('.')[0].split('[')[0] for _, name, _, _ in string.Formatter().parse(line_format) if name}
+    
+    def check_format(self) -> Optional[str]:
+        """Error message if the format can't be filled in, else None."""
+        unknown = self._fields_used(self.line_format) - set(FIELDS)
+        if unknown:
+            return f"unknown field(s) {', '.join(sorted(unknown))}; available: {', '.join(FIELDS)}"
+        try:
+            self.line_format.format_map(self.fields(TrackState()))
+        except (ValueError, IndexError, KeyError) as e:
+            return str(e)
+        return None
+    
+    def _percent(self, state: TrackState) -> float:
+        """Progress rounded down to the granularity."""
+        if state.length <= 0:
+            return 0
+        percent = min(100.0, state.position / state.length * 100)
+        percent = math.floor(percent / self.granularity + 1e-9) * self.granularity
+        return int(percent) if float(percent).is_integer() else round(percent, 6)
+    
+    def fields(self, state: Optional[TrackState]) -> Dict[str, Any]:
+        """Values of FIELDS for a state, empty strings without a player."""
+        if state is None:
+            return {name: '' for name in FIELDS}
+        percent = self._percent(state)
+        bar = self.ui.create_progress_bar(percent / 100 * state.length, state.length, self.bar_width)
+        return {
+            'artist': state.artist,
+            'title': state.title,
+            'album': state.album,
+            'status': state.status,
+            'icon': self.ui._get_status_icon(state.status),
+            'elapsed': self.ui.format_time(state.position),
+            'length': self.ui.format_time(state.length),
+            'percent': percent,
+            'bar': strip_ansi(bar),
+        }
+    
+    def render(self, state: Optional[TrackState]) -> str:
+        """The output line for a state, without the newline."""
+        fields = self.fields(state)
+        text = self.line_format.format_map(fields) if state else ''
+        if self.max_width:
+            text = self.ui._truncate(text, self.max_width)
+        if not self.json_output:
+            return text
+        
+        output = {
+            'text': text,
+            'tooltip': f"{state.title}\n{state.artist} - {state.album}" if state else '',
+            'class': state.status.lower() if state else 'noplayer',
+            'percentage': fields['percent'] if state else 0,
+        }
+        if state:
+            output.update(artist=state.artist, title=state.title, album=state.album,
+                          status=state.status, length=state.length)
+        return json.dumps(output, ensure_ascii=False)
+    
+    def _poll(self):
+        """Fetch metadata and feed the clock and scheduler."""
+        self.metadata = self.mpris.get_metadata()
+        if self.metadata:
+            self.clock.sync(self.metadata['position'], self.metadata['status'])
+        self.scheduler.observe(self.metadata)
+    
+    def _state(self) -> Optional[TrackState]:
+        """Polled metadata with the position extrapolated to now."""
+        state = TrackState.from_metadata(self.metadata)
+        if state:
+            state.position = self.clock.current(state.length)
+        return state
+    
+    def seconds_until_change(self, state: Optional[TrackState]) -> float:
+        """Time until the position reaches a value the output shows differently."""
+        if state is None or state.status != 'Playing' or self.clock.rate <= 0:
+            return IDLE_REDRAW
+        
+        waits = [IDLE_REDRAW]
+        if 'elapsed' in self._uses:
+            waits.append(math.floor(state.position) + 1 - state.position)
+        if self._uses & {'percent', 'bar'} and state.length > 0:
+            step = self.granularity / 100 * state.length
+            waits.append(math.floor(state.position / step + 1e-9) * step + step - state.position)
+        return max(0.01, min(waits) / self.clock.rate)
+    
+    def _emit(self):
+        """Write the line if it differs from the last one written."""
+        state = self._state()
+        line = self.render(state)
+        if line != self._last:
+            self._last = line
+            self.lines += 1
+            self.stream.write(line + '\n')
+            self.stream.flush()
+        self.scheduler.redraw_in(self.seconds_until_change(state))
+    
+    def _signal_handler(self, signum, frame):
+        """Handle shutdown signals."""
+        self.running = False
+        self.scheduler.wake(poll=False)
+    
+    def run(self, once: bool = False) -> int:
+        """Write lines until interrupted, or just the current one with once."""
+        error = self.check_format()
+        if error:
+            print(f"Error: invalid --format: {error}", file=sys.stderr)
+            return 2
+        if not self.mpris.available:
+            print("Error: no MPRIS backend available (install playerctl or jeepney).", file=sys.stderr)
+            return 1
+        
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+        self.running = not once
+        try:
+            self._poll()
+            self._emit()
+            while self.running:
+                tick = self.scheduler.wait()
+                if not self.running:
+                    break
+                if tick.poll:
+                    self._poll()
+                self._emit()
+        except BrokenPipeError:
+            # The bar went away
+            pass
+        finally:
+            self.mpris.close()
+            self.scheduler.close()
+        return 0
@@ -0,0 +1,61 @@
+"""Display-width aware text helpers for the terminal layout."""
+import re
+from functools import lru_cache
+import wcwidth
+
+# SGR/cursor sequences and Kitty graphics APCs, which take no columns
+ANSI_RE = re.compile(r'\x1b\[[0-9;]*[mGKHfJ]|\x1b_G[^\\]*\x1b\\')
+
+# Distinct strings whose widths are remembered; layout lines repeat every frame
+WIDTH_CACHE_SIZE = 4096
+
+ELLIPSIS = '...'
+
+
+def strip_ansi(text: str) -> str:
+    """Remove escape sequences, leaving only what takes up columns."""
+    return ANSI_RE.sub('', text) if '\x1b' in text else text
+
+
+@lru_cache(maxsize=WIDTH_CACHE_SIZE)
+def display_width(text: str) -> int:
+    """Columns text occupies in the terminal, ignoring escape sequences.
+    
+    Wide characters (CJK, most emoji) count as two columns. Results are
+    cached, so the title and label lines that are identical from frame to
+    frame cost a dictionary lookup after the first one.
+    """
+    clean_text = strip_ansi(text)
+    if clean_text.isascii():
+        return len(clean_text)
+    
+    width = wcwidth.wcswidth(clean_text)
+    
+    # wcwidth returns -1 if the string contains non-printable characters
+    # In that case, fall back to character count
+    return len(clean_text) if width < 0 else width
+
+
+@lru_cache(maxsize=WIDTH_CACHE_SIZE)
+def truncate(text: str, max_width: int) -> str:
+    """Cut plain text to at most max_width columns, ending in '...' if shortened.
+    
+    Never splits a wide character across the limit and keeps combining
+    marks with the character they belong to.
+    """
+    if display_width(text) <= max_width:
+        return text
+    if max_width <= len(ELLIPSIS):
+        return ELLIPSIS[:max(max_width, 0)]
+    
+    budget = max_width - len(ELLIPSIS)
+    used = 0
+    end = 0
+    for index, char in enumerate(text):
+        width = wcwidth.wcwidth(char)
+        width = 1 if width < 0 else width
+        if used + width > budget:
+            break
+        used += width
+        end = index + 1
+    return text[:end] + ELLIPSIS
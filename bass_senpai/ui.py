@@ -3,11 +3,17 @@ import sys
 import os
 import re
 import wcwidth
-from typing import Optional, Dict, Any, List
+from typing import Dict, Any, List, Union
+from .state import TrackState
+from .text import strip_ansi, display_width, truncate
 
 # Constants
 ARTWORK_BORDER_HEIGHT = 2  # Total height for top and bottom borders combined
 
+# One escape sequence (CSI or Kitty APC) or one character
+TOKEN_RE = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]|\x1b_[^\x1b]*\x1b\\|.', re.S)
+SGR_RESET = '\x1b[0m'
+
 
 class TerminalUI:
     """Handles terminal display and formatting."""
@@ -16,6 +22,9 @@ class TerminalUI:
         self.term_width = self._get_terminal_width()
         self.term_height = self._get_terminal_height()
         self.last_output = None
+        self._last_size = None
+        self.panel_rows: Dict[str, int] = {}
+        self.bytes_written = 0
         # Calculate initial artwork size
         self._calculate_artwork_size()
     
@@ -49,14 +58,20 @@ class TerminalUI:
         elif self.term_width < 120:
             self.artwork_width = 30
             self.artwork_height = 15
-        else:
+        elif self.term_width < 200 or self.term_height < 64:
             self.artwork_width = 40
             self.artwork_height = 20
+        else:
+            # Very large terminals (e.g. a dedicated fullscreen window)
+            self.artwork_width = 120
+            self.artwork_height = 60
     
     def clear_screen(self):
         """Clear the terminal screen."""
         sys.stdout.write('\x1b[2J\x1b[H')
         sys.stdout.flush()
+        # Nothing we drew is on screen any more
+        self.last_output = None
     
     def hide_cursor(self):
         """Hide the terminal cursor."""
@@ -113,7 +128,7 @@ class TerminalUI:
         
         # Calculate padding needed to center content
         total_padding = max(0, target_height - content_height)
-        top_padding = total_padding // 2
+        top_padding = self._top_padding(content_height)
         bottom_padding = total_padding - top_padding
         
         # Build final lines with vertical centering
@@ -126,17 +141,29 @@ class TerminalUI:
         
         return '\n'.join(lines)
     
-    def render_track_info(self, metadata: Optional[Dict[str, Any]], artwork_width: int = 42) -> str:
-        """Render track information panel."""
+    def _top_padding(self, content_height: int) -> int:
+        """Blank lines above content centered against the artwork."""
+        target_height = self.artwork_height + ARTWORK_BORDER_HEIGHT
+        return max(0, target_height - content_height) // 2
+    
+    def render_track_info(self, metadata: Union[TrackState, Dict[str, Any], None], artwork_width: int = 42) -> str:
+        """Render track information panel.
+        
+        Also records in ``panel_rows`` which rows hold the progress bar and
+        the timestamps, for render_panel_lines().
+        """
+        if isinstance(metadata, dict):
+            metadata = TrackState.from_metadata(metadata)
         if not metadata:
+            self.panel_rows = {}
             return self._render_no_player(artwork_width)
         
-        artist = metadata.get('artist', 'Unknown Artist')
-        title = metadata.get('title', 'Unknown Title')
-        album = metadata.get('album', 'Unknown Album')
-        status = metadata.get('status', 'Stopped')
-        position = metadata.get('position', 0)
-        length = metadata.get('length', 0)
+        artist = metadata.artist
+        title = metadata.title
+        album = metadata.album
+        status = metadata.status
+        position = metadata.position
+        length = metadata.length
         
         # Calculate left panel width
         left_width = self.term_width - artwork_width - 4
@@ -158,6 +185,11 @@ class TerminalUI:
         album_text = self._truncate(album, left_width - 8)
         content_lines.append(f"  💿 \x1b[90m{album_text}\x1b[0m")
         content_lines.append('')
+        
+        # Other players, when listed
+        if metadata.players:
+            others = '  '.join(f"{name} {self._get_status_icon(status)}" for name, status in metadata.players)
+            content_lines.append(f"  \x1b[90m{self._truncate('Also: ' + others, left_width - 4)}\x1b[0m")
         content_lines.append('')
         
         # Status with icon
@@ -168,19 +200,46 @@ class TerminalUI:
         content_lines.append('')
         
         # Progress bar
-        bar_width = min(50, left_width - 4)
-        progress_bar = self.create_progress_bar(position, length, bar_width)
-        content_lines.append(f"  {progress_bar}")
+        progress_row = len(content_lines)
+        content_lines.append(self._progress_line(position, length, left_width))
         content_lines.append('')
         
         # Time stamps
+        time_row = len(content_lines)
+        content_lines.append(self._time_line(position, length))
+        
+        top_padding = self._top_padding(len(content_lines))
+        self.panel_rows = {'progress': progress_row + top_padding, 'time': time_row + top_padding}
+        
+        # Center content vertically to match artwork height
+        return self._center_content_vertically(content_lines)
+    
+    def _progress_line(self, position: float, length: float, left_width: int) -> str:
+        """Progress bar line of the track info panel."""
+        bar_width = min(50, left_width - 4)
+        progress_bar = self.create_progress_bar(position, length, bar_width)
+        return f"  {progress_bar}"
+    
+    def _time_line(self, position: float, length: float) -> str:
+        """Timestamp line of the track info panel."""
         current_time = self.format_time(position)
         total_time = self.format_time(length)
         time_str = f"{current_time} / {total_time}"
-        content_lines.append(f"  \x1b[90m{time_str}\x1b[0m")
+        return f"  \x1b[90m{time_str}\x1b[0m"
+    
+    def render_panel_lines(self, state: TrackState, panels, artwork_width: int = 42) -> Dict[int, str]:
+        """Left-panel lines for just the 'progress' and/or 'time' panels, keyed by row.
         
-        # Center content vertically to match artwork height
-        return self._center_content_vertically(content_lines)
+        Uses the rows recorded by the last render_track_info() call, which
+        must have been made with the same terminal and artwork size.
+        """
+        left_width = self.term_width - artwork_width - 4
+        lines = {}
+        if 'progress' in panels:
+            lines[self.panel_rows['progress']] = self._progress_line(state.position, state.length, left_width)
+        if 'time' in panels:
+            lines[self.panel_rows['time']] = self._time_line(state.position, state.length)
+        return lines
     
     def _render_no_player(self, artwork_width: int) -> str:
         """Render message when no player is active."""
@@ -214,10 +273,8 @@ class TerminalUI:
         return colors.get(status, '\x1b[37m')
     
     def _truncate(self, text: str, max_length: int) -> str:
-        """Truncate text to fit width."""
-        if len(text) <= max_length:
-            return text
-        return text[:max_length - 3] + '...'
+        """Truncate text to fit max_length terminal columns."""
+        return truncate(text, max_length)
     
     def render_split_layout(self, left_content: str, right_content: str) -> str:
         """Render split layout with left and right panels."""
@@ -231,62 +288,149 @@ class TerminalUI:
         while len(right_lines) < max_height:
             right_lines.append('')
         
+        output = []
+        for left, right in zip(left_lines, right_lines):
+            output.append(self.render_split_line(left, right))
+        
+        return '\n'.join(output)
+    
+    def render_split_line(self, left: str, right: str) -> str:
+        """Render one row of the split layout."""
         # Calculate widths dynamically
         # Right panel width based on artwork width plus padding
         artwork_width = self.artwork_width + 2
         left_width = self.term_width - artwork_width - 2
         
-        output = []
-        for left, right in zip(left_lines, right_lines):
-            # Calculate actual display width (accounting for wide characters like emojis)
-            left_visible_width = self._display_width(left)
-            
-            # Pad left to fill width
-            left_padding = left_width - left_visible_width
-            if left_padding > 0:
-                left_padded = left + ' ' * left_padding
-            else:
-                left_padded = left
-            
-            output.append(left_padded + '  ' + right)
+        # Calculate actual display width (accounting for wide characters like emojis)
+        left_visible_width = self._display_width(left)
         
-        return '\n'.join(output)
+        # Pad left to fill width
+        left_padding = left_width - left_visible_width
+        if left_padding > 0:
+            left_padded = left + ' ' * left_padding
+        else:
+            left_padded = left
+        
+        return left_padded + '  ' + right
     
     def _strip_ansi(self, text: str) -> str:
         """Strip ANSI escape codes for length calculation."""
-        ansi_escape = re.compile(r'\x1b\[[0-9;]*[mGKHfJ]|\x1b_G[^\\]*\x1b\\')
-        return ansi_escape.sub('', text)
+        return strip_ansi(text)
     
     def _display_width(self, text: str) -> int:
         """Calculate the actual display width of text, accounting for wide characters.
         
-        Uses wcwidth library for proper Unicode width calculation.
-        Wide characters (like emojis) take 2 terminal columns.
+        Wide characters (like emojis) take 2 terminal columns. Widths are
+        cached per distinct line (see text.display_width).
         """
-        # First strip ANSI codes
-        clean_text = self._strip_ansi(text)
+        return display_width(text)
+    
+    def display(self, content: str):
+        """Display content, rewriting only what changed since the last frame."""
+        size = (self.term_width, self.term_height)
+        lines = content.split('\n')
+        
+        if self.last_output is None or size != self._last_size or len(lines) > self.term_height:
+            # Full redraw: home, write everything, clear the rest of the screen
+            frame = '\x1b[H' + content + '\x1b[J'
+        else:
+            frame = self._frame_diff(self.last_output.split('\n'), lines)
+        
+        if frame:
+            sys.stdout.write(frame)
+            sys.stdout.flush()
+            self.bytes_written += len(frame.encode('utf-8'))
         
-        # Use wcwidth to calculate display width
-        width = wcwidth.wcswidth(clean_text)
+        self.last_output = content
+        self._last_size = size
+    
+    def _frame_diff(self, old_lines: List[str], new_lines: List[str]) -> str:
+        """Escape sequences that turn the previous frame into the new one."""
+        parts = []
+        for row, line in enumerate(new_lines, 1):
+            previous = old_lines[row - 1] if row <= len(old_lines) else ''
+            if line != previous:
+                parts.append(self._line_diff(row, previous, line))
         
-        # wcwidth returns -1 if the string contains non-printable characters
-        # In that case, fall back to character count
-        if width < 0:
-            width = len(clean_text)
+        if len(new_lines) < len(old_lines):
+            parts.append(f'\x1b[{len(new_lines) + 1};1H\x1b[J')
         
-        return width
+        return ''.join(parts)
     
-    def display(self, content: str):
-        """Display content, replacing previous output efficiently."""
-        # Move to home position
-        sys.stdout.write('\x1b[H')
+    def _line_diff(self, row: int, old: str, new: str) -> str:
+        """Rewrite the changed span of one line in place.
         
-        # Write content
-        sys.stdout.write(content)
+        The common prefix and suffix of the two lines (split into characters
+        and escape sequences) are left on screen. The suffix only counts from
+        where both lines are in the same SGR state, so identical glyphs in new
+        colours are rewritten. The span is written at the prefix's display
+        column with the prefix's SGR state replayed. If its width changed,
+        everything up to the end of the line is rewritten.
+        """
+        old_tokens = TOKEN_RE.findall(old)
+        new_tokens = TOKEN_RE.findall(new)
         
-        # Clear to end of screen
-        sys.stdout.write('\x1b[J')
+        start = 0
+        limit = min(len(old_tokens), len(new_tokens))
+        while start < limit and old_tokens[start] == new_tokens[start]:
+            start += 1
+        # Don't split a grapheme cluster (combining marks, ZWJ, variation selectors)
+        while 0 < start and (self._joins(new_tokens, start - 1) or self._joins(new_tokens, start)
+                             or self._joins(old_tokens, start)):
+            start -= 1
         
-        sys.stdout.flush()
+        end = 0
+        limit = min(len(old_tokens), len(new_tokens)) - start
+        while end < limit and old_tokens[-1 - end] == new_tokens[-1 - end]:
+            end += 1
+        if end and self._sgr_state(old_tokens[:len(old_tokens) - end]) != self._sgr_state(new_tokens[:len(new_tokens) - end]):
+            # Same tokens drawn in other colours: only keep what follows a reset in the suffix
+            suffix = new_tokens[len(new_tokens) - end:]
+            resets = [index for index, token in enumerate(suffix) if token in (SGR_RESET, '\x1b[m')]
+            end = len(suffix) - resets[0] - 1 if resets else 0
+        while end > 0 and (self._joins(new_tokens, len(new_tokens) - end)
+                           or self._joins(new_tokens, len(new_tokens) - end - 1)
+                           or self._joins(old_tokens, len(old_tokens) - end - 1)):
+            end -= 1
         
-        self.last_output = content
+        old_span = old_tokens[start:len(old_tokens) - end]
+        new_span = new_tokens[start:len(new_tokens) - end]
+        old_width = sum(map(self._token_width, old_span))
+        new_width = sum(map(self._token_width, new_span))
+        tail = ''
+        if new_width != old_width:
+            # The suffix moved: rewrite it too and clear what the old line left behind
+            new_span = new_tokens[start:]
+            if new_width < old_width:
+                tail = '\x1b[K'
+        
+        prefix = new_tokens[:start]
+        column = sum(map(self._token_width, prefix)) + 1
+        state = self._sgr_state(prefix)
+        
+        return f'\x1b[{row};{column}H{SGR_RESET}' + ''.join(state) + ''.join(new_span) + SGR_RESET + tail
+    
+    @staticmethod
+    def _sgr_state(tokens: List[str]) -> List[str]:
+        """SGR sequences in effect after tokens, since the last reset."""
+        state = []
+        for token in tokens:
+            if token.startswith('\x1b[') and token.endswith('m'):
+                state = [] if token in (SGR_RESET, '\x1b[m') else state + [token]
+        return state
+    
+    @classmethod
+    def _joins(cls, tokens: List[str], index: int) -> bool:
+        """Whether tokens[index] is a zero-width character joined to its neighbours."""
+        if not 0 <= index < len(tokens):
+            return False
+        token = tokens[index]
+        return not token.startswith('\x1b') and cls._token_width(token) == 0
+    
+    @staticmethod
+    def _token_width(token: str) -> int:
+        """Display width of one token; escape sequences take no space."""
+        if token.startswith('\x1b') and len(token) > 1:
+            return 0
+        width = wcwidth.wcwidth(token)
+        return 1 if width < 0 else width
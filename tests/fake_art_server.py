@@ -0,0 +1,76 @@
+"""Local HTTP server serving cover art for the download tests."""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+
+class ArtServer:
+    """Serves registered bodies over HTTP/1.1 keep-alive and records every request.
+    
+    Each path maps to (body, options). Options understood:
+        etag         answer If-None-Match with 304 when it matches
+        delay        seconds to wait before answering
+        no_length    stream the body without a Content-Length header
+    """
+    
+    def __init__(self):
+        self.routes: Dict[str, Tuple[bytes, dict]] = {}
+        # (path, client port, request headers) per request
+        self.requests: List[Tuple[str, int, dict]] = []
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                server.requests.append((self.path, self.client_address[1], dict(self.headers)))
+                if self.path not in server.routes:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body, options = server.routes[self.path]
+                time.sleep(options.get('delay', 0))
+                etag = options.get('etag')
+                if etag and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/png')
+                if etag:
+                    self.send_header('ETag', etag)
+                if options.get('no_length'):
+                    self.send_header('Connection', 'close')
+                    self.end_headers()
+                    self.wfile.write(body)
+                    self.close_connection = True
+                    return
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+    
+    def __enter__(self) -> 'ArtServer':
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def add(self, path: str, body: bytes, **options) -> str:
+        """Serve body at path and return its URL."""
+        self.routes[path] = (body, options)
+        return f'http://127.0.0.1:{self.httpd.server_address[1]}{path}'
+    
+    def hits(self, path: str) -> List[Tuple[str, int, dict]]:
+        return [request for request in self.requests if request[0] == path]
@@ -0,0 +1,112 @@
+"""Private dbus-daemon and a minimal MPRIS player service for the test suite."""
+import shutil
+import socket
+import subprocess
+import threading
+
+try:
+    from jeepney import HeaderFields, MessageType, message_bus, new_method_return, new_signal, new_error
+    from jeepney import DBusAddress
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg
+except ImportError:
+    open_dbus_connection = None
+
+MPRIS_PATH = '/org/mpris/MediaPlayer2'
+PLAYER_INTERFACE = 'org.mpris.MediaPlayer2.Player'
+
+HAVE_DBUS = open_dbus_connection is not None and shutil.which('dbus-daemon') is not None
+
+
+class PrivateBus:
+    """A throwaway session bus; ``address`` goes into DBUS_SESSION_BUS_ADDRESS."""
+    
+    def __init__(self):
+        self.process = subprocess.Popen(
+            ['dbus-daemon', '--session', '--nofork', '--print-address'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+        self.address = self.process.stdout.readline().strip()
+    
+    def stop(self):
+        self.process.terminate()
+        self.process.wait(timeout=5)
+        self.process.stdout.close()
+
+
+class FakePlayer:
+    """Serves org.mpris.MediaPlayer2.Player properties on the session bus."""
+    
+    def __init__(self, name: str = 'fake', status: str = 'Playing', title: str = 'Test Title',
+                 position_us: int = 30000000):
+        self.bus_name = f'org.mpris.MediaPlayer2.{name}'
+        self.requests = 0
+        self.props = {
+            'PlaybackStatus': ('s', status),
+            'Rate': ('d', 1.0),
+            'Position': ('x', position_us),
+            'Metadata': ('a{sv}', self._metadata(title)),
+        }
+        self._send_lock = threading.Lock()
+        self.conn = open_dbus_connection(bus='SESSION')
+        unwrap_msg(self.conn.send_and_get_reply(message_bus.RequestName(self.bus_name)))
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+    
+    @staticmethod
+    def _metadata(title: str) -> dict:
+        return {
+            'xesam:title': ('s', title),
+            'xesam:artist': ('as', ['Test Artist']),
+            'xesam:album': ('s', 'Test Album'),
+            'mpris:length': ('x', 200000000),
+        }
+    
+    def _send(self, msg):
+        with self._send_lock:
+            self.conn.send_message(msg)
+    
+    def _serve(self):
+        try:
+            while True:
+                msg = self.conn.receive()
+                if msg.header.message_type != MessageType.method_call:
+                    continue
+                self.requests += 1
+                member = msg.header.fields.get(HeaderFields.member)
+                if member == 'GetAll':
+                    self._send(new_method_return(msg, 'a{sv}', (self.props,)))
+                elif member == 'Get' and msg.body[1] in self.props:
+                    self._send(new_method_return(msg, 'v', (self.props[msg.body[1]],)))
+                else:
+                    self._send(new_error(msg, 'org.freedesktop.DBus.Error.UnknownMethod'))
+        except (OSError, ConnectionError, EOFError):
+            pass
+    
+    def _emit_changed(self, changed: dict):
+        emitter = DBusAddress(MPRIS_PATH, interface='org.freedesktop.DBus.Properties')
+        self._send(new_signal(emitter, 'PropertiesChanged', 'sa{sv}as', (PLAYER_INTERFACE, changed, [])))
+    
+    def change_track(self, title: str):
+        self.props['Metadata'] = ('a{sv}', self._metadata(title))
+        self.props['Position'] = ('x', 0)
+        self._emit_changed({'Metadata': self.props['Metadata']})
+    
+    def set_status(self, status: str):
+        self.props['PlaybackStatus'] = ('s', status)
+        self._emit_changed({'PlaybackStatus': self.props['PlaybackStatus']})
+    
+    def seek(self, position_us: int):
+        self.props['Position'] = ('x', position_us)
+        emitter = DBusAddress(MPRIS_PATH, interface=PLAYER_INTERFACE)
+        self._send(new_signal(emitter, 'Seeked', 'x', (position_us,)))
+    
+    def stop(self):
+        try:
+            self.conn.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._thread.join(timeout=2)
+        self.conn.close()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Stand-in for the playerctl binary used by the test suite.
+
+Behaviour is driven by environment variables:
+    FAKE_PLAYERCTL_METADATA  file holding the current METADATA_FORMAT line
+    FAKE_PLAYERCTL_LOG       file that receives one line per invocation
+    FAKE_PLAYERCTL_EXIT      exit the --follow stream after the first line
+
+With --all-players the metadata file holds one PLAYER_FORMAT line per
+player (instance|name|...); --follow then prints only the lines that
+changed, and an empty line when a player goes away.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def install(directory: Path) -> Path:
+    """Install a ``playerctl`` shim into ``directory`` and return its path."""
+    shim = Path(directory) / 'playerctl'
+    shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{Path(__file__).resolve()}" "$@"\n')
+    shim.chmod(0o755)
+    return shim
+
+
+def _read_metadata() -> str:
+    path = os.environ.get('FAKE_PLAYERCTL_METADATA')
+    if not path or not os.path.exists(path):
+        return ''
+    with open(path) as f:
+        return f.read().strip()
+
+
+def main(argv):
+    log = os.environ.get('FAKE_PLAYERCTL_LOG')
+    if log:
+        with open(log, 'a') as f:
+            f.write(' '.join(argv) + '\n')
+    
+    if '--version' in argv:
+        print('v2.4.1')
+        return 0
+    
+    if '--all-players' in argv:
+        return _follow_all() if '--follow' in argv else 1
+    
+    if '--list-all' in argv:
+        for line in _read_metadata().splitlines():
+            print(line.split('|')[0])
+        return 0
+    
+    pinned = [arg.split('=', 1)[1] for arg in argv if arg.startswith('--player=')]
+    if pinned and 'position' in argv:
+        for line in _read_metadata().splitlines():
+            fields = line.split('|')
+            if fields[0] == pinned[0]:
+                print(int(fields[6] or 0) / 1000000)
+                return 0
+        return 1
+    
+    if '--follow' not in argv:
+        line = _read_metadata()
+        if 'status' in argv:
+            print(line.split('|')[3] if line else 'No players found')
+            return 0 if line else 1
+        if 'position' in argv:
+            if not line:
+                return 1
+            print(int(line.split('|')[4] or 0) / 1000000)
+            return 0
+        if not line:
+            return 1
+        print(line)
+        return 0
+    
+    # Follow mode: print the current line, then again whenever it changes
+    last = None
+    while True:
+        line = _read_metadata()
+        if line != last:
+            print(line, flush=True)
+            last = line
+            if os.environ.get('FAKE_PLAYERCTL_EXIT'):
+                return 0
+        time.sleep(0.02)
+
+
+
+def _follow_all():
+    """--all-players --follow: per-player lines, empty line on player exit."""
+    printed = {}
+    while True:
+        lines = {line.split('|')[0]: line for line in _read_metadata().splitlines() if line}
+        for instance, line in lines.items():
+            if printed.get(instance) != line:
+                print(line, flush=True)
+                printed[instance] = line
+        for instance in set(printed) - set(lines):
+            del printed[instance]
+            print('', flush=True)
+        time.sleep(0.02)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
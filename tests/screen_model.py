@@ -0,0 +1,100 @@
+"""Minimal terminal screen model for checking what the UI leaves on screen."""
+import re
+import wcwidth
+
+TOKEN_RE = re.compile(r'\x1b\[([0-9;?]*)([A-Za-z])|\x1b_[^\x1b]*\x1b\\|.', re.S)
+
+
+class Screen:
+    """Applies the escape sequences bass-senpai emits to a grid of cells.
+    
+    Each cell holds (text, sgr) where sgr is the tuple of SGR parameter
+    strings active when it was written. Only the sequences the UI uses are
+    understood: CUP/home, EL, ED, SGR and newlines; Kitty APCs are ignored.
+    """
+    
+    def __init__(self, cols: int, rows: int):
+        self.cols = cols
+        self.rows = rows
+        self.grid = [[(' ', ())] * cols for _ in range(rows)]
+        self.row = 0
+        self.col = 0
+        self.sgr = ()
+    
+    def feed(self, data: str):
+        for match in TOKEN_RE.finditer(data):
+            token = match.group(0)
+            final = match.group(2)
+            if final:
+                self._csi(match.group(1), final)
+            elif token.startswith('\x1b_'):
+                continue
+            elif token == '\n':
+                self.row = min(self.row + 1, self.rows - 1)
+                self.col = 0
+            else:
+                self._put(token)
+    
+    def _csi(self, params: str, final: str):
+        if final == 'H':
+            row, _, col = params.partition(';')
+            self.row = int(row or 1) - 1
+            self.col = int(col or 1) - 1
+        elif final == 'K':
+            self.grid[self.row][self.col:] = [(' ', ())] * (self.cols - self.col)
+        elif final == 'J':
+            self.grid[self.row][self.col:] = [(' ', ())] * (self.cols - self.col)
+            for row in range(self.row + 1, self.rows):
+                self.grid[row] = [(' ', ())] * self.cols
+        elif final == 'm':
+            if params in ('', '0'):
+                self.sgr = ()
+            else:
+                self.sgr = self.sgr + (params,)
+    
+    def _put(self, char: str):
+        width = wcwidth.wcwidth(char)
+        if width == 0 and self.col > 0:
+            # Combining character: attach to the previous cell
+            text, sgr = self.grid[self.row][self.col - 1]
+            self.grid[self.row][self.col - 1] = (text + char, sgr)
+            return
+        if self.col < self.cols:
+            self.grid[self.row][self.col] = (char, self.sgr)
+            if width == 2 and self.col + 1 < self.cols:
+                self.grid[self.row][self.col + 1] = ('', self.sgr)
+        self.col += max(width, 1)
+    
+    def cells(self):
+        """Cells with the SGR state reduced to the colours/attributes in effect."""
+        return [[(text, _effective(sgr)) for text, sgr in row] for row in self.grid]
+
+
+def _effective(sgr: tuple) -> tuple:
+    """Collapse a stack of SGR parameter strings to the final fg/bg/attribute values."""
+    fg = bg = None
+    attrs = set()
+    for params in sgr:
+        values = params.split(';')
+        i = 0
+        while i < len(values):
+            code = int(values[i] or 0)
+            if code in (38, 48):
+                colour = tuple(values[i + 2:i + 5])
+                if code == 38:
+                    fg = colour
+                else:
+                    bg = colour
+                i += 5
+                continue
+            if 30 <= code <= 37 or 90 <= code <= 97:
+                fg = code
+            elif 40 <= code <= 47 or 100 <= code <= 107:
+                bg = code
+            elif code == 0:
+                fg = bg = None
+                attrs = set()
+            else:
+                attrs.add(code)
+            i += 1
+    return fg, bg, frozenset(attrs)
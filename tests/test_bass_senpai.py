@@ -1,10 +1,54 @@
 """Unit tests for bass-senpai components."""
+import io
+import os
+import re
+import sys
+import base64
+import json
+import pty
+import time
+import fcntl
+import signal
+import struct
+import asyncio
+import termios
+import threading
+import subprocess
 import unittest
 import tempfile
 from pathlib import Path
-from bass_senpai.mpris import MPRISClient
-from bass_senpai.artwork import ArtworkHandler
+from unittest import mock
+from PIL import Image
+from bass_senpai.mpris import MPRISClient, DBusMPRISClient, MultiPlayerMPRISClient, PlaybackClock, create_client, choose_player
+from bass_senpai.artwork import ArtworkHandler, RenderCache, encode_halfblocks, MASTER_SIZE, REVALIDATE_AFTER
+from bass_senpai.palette import ENCODINGS
 from bass_senpai.ui import TerminalUI
+from bass_senpai.state import TrackState, PANELS
+from bass_senpai.scheduler import UpdateScheduler, IDLE_MAX_INTERVAL, NO_PLAYER_MAX_INTERVAL
+from bass_senpai.main import BassSenpai, main, read_art_urls
+from bass_senpai.cache import DiskCache
+from bass_senpai.pixels import PIXEL_HEADER, write_pixels, map_pixels
+from bass_senpai.aio import AsyncBassSenpai
+from bass_senpai.bench import run_benchmarks, compare, BENCHMARKS
+from bass_senpai.stats import FrameStats
+from bass_senpai.daemon import Daemon, SocketMPRISClient
+from bass_senpai.status import StatusLine
+from tests import fake_playerctl
+from tests.fake_mpris_player import HAVE_DBUS, PrivateBus, FakePlayer
+from tests.screen_model import Screen
+from tests.fake_art_server import ArtServer
+
+TRACK_LINE = "Test Artist|Test Title|Test Album|Playing|30000000|200000000|"
+
+
+def wait_for(predicate, timeout: float = 5.0) -> bool:
+    """Poll predicate until it returns truthy or timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
 
 
 class TestMPRISClient(unittest.TestCase):
@@ -31,6 +75,281 @@ class TestMPRISClient(unittest.TestCase):
         self.assertIsInstance(status, str)
 
 
+class TestPlaybackClock(unittest.TestCase):
+    """Test local playback position extrapolation."""
+    
+    def test_playing_extrapolates_with_rate(self):
+        """Test that a playing clock advances by elapsed time times rate."""
+        clock = PlaybackClock()
+        clock.sync(10.0, 'Playing', 1.0, now=100.0)
+        self.assertAlmostEqual(clock.current(now=102.5), 12.5)
+        clock.sync(rate=2.0, now=102.5)
+        self.assertAlmostEqual(clock.current(now=103.5), 14.5)
+    
+    def test_paused_is_frozen(self):
+        """Test that pausing freezes the extrapolated position."""
+        clock = PlaybackClock()
+        clock.sync(10.0, 'Playing', now=100.0)
+        clock.sync(status='Paused', now=105.0)
+        self.assertAlmostEqual(clock.current(now=500.0), 15.0)
+    
+    def test_clamped_to_length(self):
+        """Test that the position never runs past the track length."""
+        clock = PlaybackClock()
+        clock.sync(190.0, 'Playing', now=0.0)
+        self.assertEqual(clock.current(length=200.0, now=60.0), 200.0)
+    
+    def test_drift_check_only_while_playing(self):
+        """Test that drift checks are only due for a playing clock."""
+        clock = PlaybackClock()
+        clock.sync(0.0, 'Paused', now=0.0)
+        self.assertFalse(clock.drift_check_due(10.0, now=100.0))
+        self.assertIsNone(clock.seconds_until_drift_check(10.0, now=100.0))
+        clock.sync(status='Playing', now=100.0)
+        self.assertFalse(clock.drift_check_due(10.0, now=105.0))
+        self.assertTrue(clock.drift_check_due(10.0, now=110.0))
+
+
+class TestMPRISFollow(unittest.TestCase):
+    """Test the streaming playerctl --follow mode against a fake playerctl."""
+    
+    def setUp(self):
+        """Put a fake playerctl first on PATH."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        fake_playerctl.install(self.temp_dir)
+        self.metadata_file = self.temp_dir / 'metadata'
+        self.metadata_file.write_text(TRACK_LINE)
+        self.log_file = self.temp_dir / 'log'
+        env = {
+            'PATH': f"{self.temp_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+            'FAKE_PLAYERCTL_METADATA': str(self.metadata_file),
+            'FAKE_PLAYERCTL_LOG': str(self.log_file),
+        }
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def _spawn_count(self) -> int:
+        if not self.log_file.exists():
+            return 0
+        return sum('--follow' in line for line in self.log_file.read_text().splitlines())
+    
+    def test_polling_mode_parses_fake_output(self):
+        """Test that one-shot mode parses the fake playerctl output."""
+        client = MPRISClient()
+        metadata = client.get_metadata()
+        self.assertEqual(metadata['title'], 'Test Title')
+        self.assertEqual(metadata['position'], 30.0)
+        self.assertIsNone(metadata['art_url'])
+    
+    def test_follow_mode_uses_single_process(self):
+        """Test that repeated calls are served by one --follow child."""
+        client = MPRISClient(follow=True)
+        self.addCleanup(client.close)
+        self.assertTrue(wait_for(lambda: client.get_metadata() is not None))
+        for _ in range(50):
+            self.assertEqual(client.get_metadata()['artist'], 'Test Artist')
+        self.assertEqual(self._spawn_count(), 1)
+    
+    def test_follow_mode_picks_up_changes(self):
+        """Test that new lines from the stream replace the cached state."""
+        client = MPRISClient(follow=True)
+        self.addCleanup(client.close)
+        self.assertTrue(wait_for(lambda: client.get_metadata() is not None))
+        self.metadata_file.write_text(TRACK_LINE.replace('Test Title', 'Next Title'))
+        self.assertTrue(wait_for(lambda: client.get_metadata()['title'] == 'Next Title'))
+        self.metadata_file.write_text('')
+        self.assertTrue(wait_for(lambda: client.get_metadata() is None))
+    
+    def test_follow_mode_restarts_dead_child(self):
+        """Test that the --follow child is respawned when it exits."""
+        with mock.patch.dict(os.environ, {'FAKE_PLAYERCTL_EXIT': '1'}):
+            with mock.patch('bass_senpai.mpris.FOLLOW_RESTART_DELAY', 0.01):
+                client = MPRISClient(follow=True)
+                self.addCleanup(client.close)
+                client.get_metadata()
+                self.assertTrue(wait_for(lambda: self._spawn_count() >= 3))
+        self.assertGreaterEqual(client.restarts, 2)
+    
+    def test_follow_mode_extrapolates_position(self):
+        """Test that the position advances between stream lines."""
+        client = MPRISClient(follow=True)
+        self.addCleanup(client.close)
+        self.assertTrue(wait_for(lambda: client.get_metadata() is not None))
+        first = client.get_metadata()['position']
+        time.sleep(0.2)
+        self.assertGreater(client.get_metadata()['position'], first)
+    
+    def test_follow_mode_drift_check(self):
+        """Test that a stale clock is resynced with playerctl position."""
+        with mock.patch('bass_senpai.mpris.DRIFT_CHECK_INTERVAL', 0.05):
+            client = MPRISClient(follow=True)
+            self.addCleanup(client.close)
+            self.assertTrue(wait_for(lambda: client.get_metadata() is not None))
+            self.assertTrue(wait_for(
+                lambda: client.get_metadata() and 'position' in self.log_file.read_text()
+            ))
+    
+    def _players(self, **statuses):
+        """Write one multi-player line per player with the given status."""
+        # Atomically, so the fake never sees every player gone mid-write
+        tmp_file = self.metadata_file.with_suffix('.tmp')
+        tmp_file.write_text(''.join(
+            f"{name}.instance1|{name}|Artist|{name} song|Album|{status}|30000000|200000000|\n"
+            for name, status in statuses.items()))
+        os.replace(tmp_file, self.metadata_file)
+    
+    def test_all_players_switches_without_spawning(self):
+        """Test that the most recently started player is shown, from one stream."""
+        self._players(firefox='Playing', spotify='Paused')
+        client = create_client('playerctl', all_players=True)
+        self.addCleanup(client.close)
+        self.assertIsInstance(client, MultiPlayerMPRISClient)
+        self.assertTrue(wait_for(lambda: (client.get_metadata() or {}).get('title') == 'firefox song'))
+        self.assertTrue(wait_for(lambda: client.get_metadata()['players'] == [('spotify', 'Paused')]))
+        
+        # Spotify starts while the browser keeps playing: Spotify wins
+        self._players(firefox='Playing', spotify='Playing')
+        self.assertTrue(wait_for(lambda: client.get_metadata()['title'] == 'spotify song'))
+        self._players(firefox='Paused', spotify='Playing')
+        time.sleep(0.1)
+        self.assertEqual(client.get_metadata()['title'], 'spotify song')
+        # Back to the browser
+        self._players(firefox='Playing', spotify='Paused')
+        self.assertTrue(wait_for(lambda: client.get_metadata()['title'] == 'firefox song'))
+        self.assertEqual(len(self.log_file.read_text().splitlines()), 1)  # Only the stream
+    
+    def test_pinned_player(self):
+        """Test that --player shows the first pinned player present."""
+        self._players(firefox='Playing', spotify='Paused')
+        client = create_client('playerctl', pinned=['vlc', 'spotify'])
+        self.addCleanup(client.close)
+        self.assertTrue(wait_for(lambda: (client.get_metadata() or {}).get('title') == 'spotify song'))
+        self.assertNotIn('players', client.get_metadata())
+    
+    def test_player_exit_pruned(self):
+        """Test that a player leaving the stream is dropped."""
+        self._players(firefox='Paused', spotify='Playing')
+        client = create_client('playerctl', all_players=True)
+        self.addCleanup(client.close)
+        self.assertTrue(wait_for(lambda: (client.get_metadata() or {}).get('title') == 'spotify song'))
+        self._players(firefox='Paused')
+        self.assertTrue(wait_for(lambda: client.get_metadata()['title'] == 'firefox song'))
+        self.assertEqual(client.get_metadata()['players'], [])
+        self.metadata_file.write_text('')
+        self.assertTrue(wait_for(lambda: client.get_metadata() is None))
+    
+    def test_choose_player_policy(self):
+        """Test the selection policy on plain player dicts."""
+        def player(name, status, last_active):
+            clock = PlaybackClock()
+            clock.sync(0, status)
+            return {'name': name, 'clock': clock, 'last_active': last_active}
+        
+        players = [player('a', 'Playing', 1), player('b', 'Playing', 5), player('c', 'Paused', 9)]
+        self.assertEqual(choose_player(players)['name'], 'b')
+        self.assertEqual(choose_player(players[2:])['name'], 'c')
+        self.assertEqual(choose_player(players, ['c', 'a'])['name'], 'c')
+        self.assertIsNone(choose_player(players, ['d']))
+        self.assertIsNone(choose_player([]))
+        self.assertEqual(choose_player([player('firefox.instance_1_2', 'Paused', 0)], ['firefox'])['name'],
+                         'firefox.instance_1_2')
+    
+    def test_create_client_falls_back_to_playerctl(self):
+        """Test that auto selection falls back when no bus is reachable."""
+        with mock.patch.dict(os.environ, {'DBUS_SESSION_BUS_ADDRESS': 'unix:path=/nonexistent'}):
+            client = create_client('auto')
+        self.assertIsInstance(client, MPRISClient)
+
+
+@unittest.skipUnless(HAVE_DBUS, "needs jeepney and dbus-daemon")
+class TestDBusMPRISClient(unittest.TestCase):
+    """Test the native D-Bus backend against a private bus and fake player."""
+    
+    def setUp(self):
+        """Start a private session bus with one fake player on it."""
+        self.bus = PrivateBus()
+        self.addCleanup(self.bus.stop)
+        patcher = mock.patch.dict(os.environ, {'DBUS_SESSION_BUS_ADDRESS': self.bus.address})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.player = FakePlayer()
+        self.addCleanup(self.player.stop)
+        self.client = DBusMPRISClient()
+        self.addCleanup(self.client.close)
+    
+    def test_initial_state(self):
+        """Test that the existing player is picked up with the usual dict keys."""
+        self.assertTrue(self.client.available)
+        metadata = self.client.get_metadata()
+        self.assertEqual(metadata['title'], 'Test Title')
+        self.assertEqual(metadata['artist'], 'Test Artist')
+        self.assertEqual(metadata['length'], 200.0)
+        self.assertGreaterEqual(metadata['position'], 30.0)
+        self.assertEqual(set(metadata), {'artist', 'title', 'album', 'status', 'position', 'length', 'art_url'})
+    
+    def test_idle_viewer_does_no_work(self):
+        """Test that reading metadata between changes never touches the bus."""
+        self.client.get_metadata()
+        messages, calls, requests = self.client.messages, self.client.calls, self.player.requests
+        for _ in range(100):
+            self.client.get_metadata()
+        time.sleep(0.3)
+        self.assertEqual(self.client.messages, messages)
+        self.assertEqual(self.client.calls, calls)
+        self.assertEqual(self.player.requests, requests)
+    
+    def test_signals_update_state(self):
+        """Test that PropertiesChanged and Seeked are applied."""
+        self.client.get_metadata()
+        self.player.change_track('Next Title')
+        self.assertTrue(wait_for(lambda: self.client.get_metadata()['title'] == 'Next Title'))
+        self.player.set_status('Paused')
+        self.assertTrue(wait_for(lambda: self.client.get_playback_status() == 'Paused'))
+        self.player.seek(120000000)
+        self.assertTrue(wait_for(lambda: self.client.get_metadata()['position'] == 120.0))
+    
+    def test_drift_check_while_playing_only(self):
+        """Test that the listener re-reads Position on a timer only while playing."""
+        with mock.patch('bass_senpai.mpris.DRIFT_CHECK_INTERVAL', 0.05):
+            client = DBusMPRISClient()
+            self.addCleanup(client.close)
+            client.get_metadata()
+            calls = client.calls
+            self.assertTrue(wait_for(lambda: client.calls >= calls + 3))
+            self.player.set_status('Paused')
+            self.assertTrue(wait_for(lambda: client.get_playback_status() == 'Paused'))
+            time.sleep(0.1)
+            calls = client.calls
+            time.sleep(0.3)
+            self.assertEqual(client.calls, calls)
+    
+    def test_player_exit(self):
+        """Test that a player leaving the bus clears the state."""
+        self.client.get_metadata()
+        self.player.stop()
+        self.assertTrue(wait_for(lambda: self.client.get_metadata() is None))
+    
+    def test_most_recently_playing_player(self):
+        """Test that a player that starts playing takes over, and the others are listed."""
+        client = DBusMPRISClient(list_players=True)
+        self.addCleanup(client.close)
+        self.assertEqual(client.get_metadata()['title'], 'Test Title')
+        other = FakePlayer(name='other', status='Paused', title='Other Title')
+        self.addCleanup(other.stop)
+        self.assertTrue(wait_for(lambda: client.get_metadata()['players'] == [('other', 'Paused')]))
+        self.assertEqual(client.get_metadata()['title'], 'Test Title')
+        other.set_status('Playing')
+        self.assertTrue(wait_for(lambda: client.get_metadata()['title'] == 'Other Title'))
+        self.assertEqual(client.get_metadata()['players'], [('fake', 'Playing')])
+    
+    def test_create_client_prefers_dbus(self):
+        """Test that auto selection uses the bus when it is reachable."""
+        client = create_client('auto')
+        self.addCleanup(client.close)
+        self.assertIsInstance(client, DBusMPRISClient)
+
+
 class TestArtworkHandler(unittest.TestCase):
     """Test artwork handler functionality."""
     
@@ -60,6 +379,736 @@ class TestArtworkHandler(unittest.TestCase):
         """Test Kitty terminal detection."""
         # Should return boolean
         self.assertIsInstance(self.handler.is_kitty, bool)
+    
+    def test_ingest_reduces_huge_covers(self):
+        """Test that big JPEGs are draft-decoded and cached at no more than MASTER_SIZE."""
+        from PIL.JpegImagePlugin import JpegImageFile
+        source = Path(self.temp_dir) / 'huge.jpg'
+        Image.new('RGB', (3000, 2000), (20, 120, 200)).save(source)
+        with mock.patch.object(JpegImageFile, 'draft', autospec=True, side_effect=JpegImageFile.draft) as draft:
+            cached = self.handler.get_artwork(f'file://{source}')
+        draft.assert_called_once()
+        with Image.open(cached) as img:
+            self.assertEqual(img.size, (MASTER_SIZE[0], MASTER_SIZE[0] * 2 // 3))
+        self.assertLess(cached.stat().st_size, source.stat().st_size)
+    
+    def test_ingest_reduces_palette_covers(self):
+        """Test that huge palette (P-mode) covers are converted before reduce()."""
+        source = Path(self.temp_dir) / 'huge-palette.png'
+        Image.new('RGB', (2600, 2600), (20, 120, 200)).quantize(8).save(source)
+        cached = self.handler.get_artwork(f'file://{source}')
+        self.assertIsNotNone(cached)
+        with Image.open(cached) as img:
+            self.assertEqual(img.mode, 'RGB')
+            self.assertLessEqual(img.width, MASTER_SIZE[0])
+    
+    def test_ingest_keeps_small_covers(self):
+        """Test that covers below MASTER_SIZE keep their resolution."""
+        cached = self.handler.get_artwork(make_cover(self.temp_dir, size=(300, 200)))
+        with Image.open(cached) as img:
+            self.assertEqual(img.size, (300, 200))
+    
+    def test_frame_budget_picks_encoding(self):
+        """Test that 'auto' uses the richest encoding whose frame fits the byte budget."""
+        source = Path(self.temp_dir) / 'noise.png'
+        Image.merge('RGB', [Image.effect_noise((80, 80), 60)] * 3).save(source)
+        art_path = self.handler.get_artwork(f'file://{source}')
+        sizes = {encoding: len(self.handler.render_textart(art_path, 40, 20, encoding).encode())
+                 for encoding in ENCODINGS}
+        
+        for budget, expected in ((None, 'truecolor'), (sizes['truecolor'], 'truecolor'),
+                                 (sizes['truecolor'] - 1, '256'), (sizes['16'], '16'), (100, '16')):
+            self.handler.frame_bytes = budget
+            output = self.handler.render_textart(art_path, 40, 20)
+            self.assertEqual(self.handler.last_encoding, expected, budget)
+            self.assertEqual(len(output.encode()), sizes[expected])
+
+
+def make_cover(directory: Path, name: str = 'cover.png', size=(64, 64), color=(200, 40, 90)) -> str:
+    """Write a synthetic cover image and return its file:// URL."""
+    path = Path(directory) / name
+    Image.new('RGB', size, color).save(path)
+    return f"file://{path}"
+
+
+def legacy_halfblocks(img: Image.Image, width: int, height: int) -> list:
+    """The original per-pixel encoder, kept as the reference for visual identity."""
+    pixels = img.convert('RGB').load()
+    lines = []
+    for y in range(0, height * 2, 2):
+        line = ['║']
+        for x in range(width):
+            r1, g1, b1 = pixels[x, y]
+            r2, g2, b2 = pixels[x, y + 1]
+            line.append(f"\x1b[38;2;{r1};{g1};{b1}m\x1b[48;2;{r2};{g2};{b2}m▀\x1b[0m")
+        line.append('║')
+        lines.append(''.join(line))
+    return lines
+
+
+SGR_RE = re.compile(r'\x1b\[([0-9;]*)m')
+
+
+def cell_grid(lines: list) -> list:
+    """Interpret SGR codes and return (char, fg, bg) for every cell."""
+    grid = []
+    for line in lines:
+        fg = bg = None
+        cells = []
+        pos = 0
+        while pos < len(line):
+            match = SGR_RE.match(line, pos)
+            if not match:
+                cells.append((line[pos], fg, bg))
+                pos += 1
+                continue
+            params = [int(p) for p in match.group(1).split(';') if p] or [0]
+            i = 0
+            while i < len(params):
+                if params[i] == 0:
+                    fg = bg = None
+                    i += 1
+                elif params[i] in (38, 48):
+                    colour = tuple(params[i + 2:i + 5])
+                    if params[i] == 38:
+                        fg = colour
+                    else:
+                        bg = colour
+                    i += 5
+                else:
+                    i += 1
+            pos = match.end()
+        grid.append(cells)
+    return grid
+
+
+class TestHalfBlockEncoder(unittest.TestCase):
+    """Test the buffer-based half-block encoder against the per-pixel original."""
+    
+    def _images(self, width: int, height: int):
+        size = (width, height * 2)
+        noise = Image.effect_noise(size, 60)
+        photo = Image.merge('RGB', (noise, Image.linear_gradient('L').resize(size), noise.rotate(90)))
+        yield photo
+        yield photo.quantize(8).convert('RGB')
+        yield Image.new('RGB', size, (10, 20, 30))
+    
+    def test_visually_identical(self):
+        """Test that every cell has the same glyph and colours as before."""
+        for width, height in ((20, 10), (40, 20), (120, 60)):
+            for img in self._images(width, height):
+                old = legacy_halfblocks(img, width, height)
+                new = encode_halfblocks(img, width, height)
+                self.assertEqual(cell_grid(new), cell_grid(old))
+    
+    def test_redundant_codes_skipped(self):
+        """Test that a flat image only sets its colours once per row."""
+        img = Image.new('RGB', (40, 40), (10, 20, 30))
+        lines = encode_halfblocks(img, 40, 20)
+        self.assertEqual(lines[0], '║\x1b[38;2;10;20;30;48;2;10;20;30m' + '▀' * 40 + '\x1b[0m║')
+        self.assertLess(len(''.join(lines)), len(''.join(legacy_halfblocks(img, 40, 20))) / 10)
+    
+    def test_palette_encodings(self):
+        """Test that 256- and 16-colour output uses the nearest xterm colours."""
+        img = Image.new('RGB', (2, 2))
+        img.putdata([(255, 0, 0), (0, 0, 250), (8, 8, 8), (250, 250, 250)])
+        self.assertEqual(encode_halfblocks(img, 2, 1, '256'),
+                         ['║\x1b[38;5;196;48;5;232m▀\x1b[38;5;21;48;5;231m▀\x1b[0m║'])
+        self.assertEqual(encode_halfblocks(img, 2, 1, '16'),
+                         ['║\x1b[91;40m▀\x1b[34;107m▀\x1b[0m║'])
+        
+        for img in self._images(40, 20):
+            sizes = [len(''.join(encode_halfblocks(img, 40, 20, encoding))) for encoding in ENCODINGS]
+            self.assertEqual(sizes, sorted(sizes, reverse=True))
+
+
+class TestPixelCache(unittest.TestCase):
+    """Test the memory-mapped pre-scaled pixel cache."""
+    
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source = self.temp_dir / 'cover.png'
+        Image.effect_noise((300, 300), 60).convert('RGB').save(self.source)
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_round_trip(self):
+        """Test that a pixel file maps back to the same pixels."""
+        img = Image.effect_noise((40, 40), 60).convert('RGB')
+        path = self.temp_dir / 'a.h40x20.px'
+        write_pixels(path, img, 123)
+        mapped = map_pixels(path, 123)
+        self.assertEqual(mapped.size, (40, 40))
+        self.assertEqual(mapped.tobytes(), img.tobytes())
+        # Made from another version of the source, or not a pixel file at all
+        self.assertIsNone(map_pixels(path, 124))
+        self.assertIsNone(map_pixels(self.source))
+    
+    def test_concurrent_writers(self):
+        """Test that threads writing the same pixel file never leave a torn one."""
+        images = [Image.new('RGB', (200, 200), (value, value, value)) for value in (0, 255)]
+        path = self.temp_dir / 'a.h40x20.px'
+        names = []
+        original = os.replace
+        
+        def record(src, dst):
+            names.append(Path(src).name)
+            original(src, dst)
+        
+        def write(img):
+            for _ in range(20):
+                write_pixels(path, img, 123)
+        
+        with mock.patch('bass_senpai.pixels.os.replace', side_effect=record):
+            threads = [threading.Thread(target=write, args=(img,)) for img in images]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(set(names)), 2)
+        mapped = map_pixels(path, 123)
+        self.assertIn(mapped.tobytes(), [img.tobytes() for img in images])
+    
+    def test_hit_skips_decode(self):
+        """Test that rendering a tier again neither decodes nor resamples."""
+        handler = ArtworkHandler(cache_dir=self.temp_dir / 'cache')
+        first = handler.render_textart(self.source, 40, 20)
+        self.assertTrue((self.temp_dir / 'cache' / 'cover.h40x20.px').exists())
+        
+        handler = ArtworkHandler(cache_dir=self.temp_dir / 'cache')
+        with mock.patch('PIL.Image.open', side_effect=AssertionError('decoded')), \
+                mock.patch('PIL.Image.Image.resize', side_effect=AssertionError('resampled')):
+            self.assertEqual(handler.render_textart(self.source, 40, 20), first)
+    
+    def test_source_change_invalidates(self):
+        """Test that a rewritten source file gets freshly scaled pixels."""
+        handler = ArtworkHandler(cache_dir=self.temp_dir / 'cache')
+        before = handler.render_textart(self.source, 20, 10)
+        Image.new('RGB', (300, 300), (0, 0, 255)).save(self.source)
+        os.utime(self.source, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        self.assertNotEqual(handler.render_textart(self.source, 20, 10), before)
+        self.assertIn('\x1b[38;2;0;0;255;48;2;0;0;255m', handler.render_textart(self.source, 20, 10))
+
+
+class TestRenderCache(unittest.TestCase):
+    """Test memoization of rendered artwork output."""
+    
+    def test_lru_eviction_by_bytes(self):
+        """Test that the least recently used entries go first over the cap."""
+        cache = RenderCache(max_bytes=10)
+        cache.put('a', 'xxxx')
+        cache.put('b', 'yyyy')
+        cache.get('a')
+        cache.put('c', 'zzzz')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 'xxxx')
+        self.assertEqual(cache.size, 8)
+    
+    def test_oversized_value_not_cached(self):
+        """Test that a single value larger than the cap is skipped."""
+        cache = RenderCache(max_bytes=3)
+        cache.put('a', 'xxxx')
+        self.assertEqual(len(cache), 0)
+    
+    def test_steady_state_render_skips_decode(self):
+        """Test that re-rendering the same artwork doesn't reopen the image."""
+        temp_dir = Path(tempfile.mkdtemp())
+        handler = ArtworkHandler(cache_dir=temp_dir / 'cache')
+        handler.is_kitty = False
+        url = make_cover(temp_dir)
+        first = handler.render(url, 20, 10)
+        with mock.patch('PIL.Image.open') as image_open:
+            for _ in range(10):
+                self.assertEqual(handler.render(url, 20, 10), first)
+            image_open.assert_not_called()
+        self.assertEqual(handler.render_cache.hits, 10)
+        # A different size is a different entry
+        self.assertNotEqual(handler.render(url, 30, 15), first)
+
+
+class TestDiskCache(unittest.TestCase):
+    """Test size/count bounded LRU eviction of the artwork cache directory."""
+    
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _write(self, cache: DiskCache, name: str, size: int = 100, when: float = None) -> Path:
+        path = self.temp_dir / name
+        path.write_bytes(b'x' * size)
+        if when is None:
+            cache.add(path)
+        else:
+            with mock.patch('time.time', return_value=when):
+                cache.add(path)
+        return path
+    
+    def test_read_only_never_writes(self):
+        """Test that a read-only cache leaves the files and the index alone."""
+        owner = DiskCache(self.temp_dir, max_bytes=10000, max_files=1)
+        kept = self._write(owner, 'a.jpg')
+        owner.flush()
+        index = owner.index_path.read_bytes()
+        
+        viewer = DiskCache(self.temp_dir, max_bytes=10000, max_files=1, read_only=True)
+        self._write(viewer, 'b.jpg')
+        viewer.touch(kept)
+        viewer.prune(max_files=0)
+        viewer.flush()
+        self.assertTrue(kept.exists())
+        self.assertEqual(owner.index_path.read_bytes(), index)
+        self.assertEqual(viewer.stats()['entries'], 1)
+    
+    def test_flush_merges_other_processes(self):
+        """Test that two caches sharing a directory keep each other's entries and evictions."""
+        patcher = mock.patch('bass_senpai.cache.INDEX_FLUSH_ADDS', 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        first = DiskCache(self.temp_dir, max_bytes=10000, max_files=2)
+        self._write(first, 'a.jpg', when=1000)
+        second = DiskCache(self.temp_dir, max_bytes=10000, max_files=2)
+        self._write(first, 'b.jpg', when=2000)
+        # The second cache counts b.jpg from the first against its limit
+        self._write(second, 'c.jpg', when=3000)
+        self.assertFalse((self.temp_dir / 'a.jpg').exists())
+        second.flush()
+        self.assertEqual(DiskCache(self.temp_dir).stats()['entries'], 2)
+        
+        # The first cache must not write the evicted a.jpg back
+        with mock.patch('time.time', return_value=4000):
+            first.touch(self.temp_dir / 'b.jpg')
+        first.flush()
+        index = DiskCache(self.temp_dir)
+        self.assertEqual(index.stats()['entries'], 2)
+        self.assertEqual(index.stats()['newest_access'], 4000)
+        self.assertEqual(first.stats()['entries'], 2)
+    
+    def test_adds_batched(self):
+        """Test that adds only write the index every INDEX_FLUSH_ADDS files or on flush()."""
+        cache = DiskCache(self.temp_dir)
+        index = cache.index_path.read_bytes()
+        with mock.patch('bass_senpai.cache.INDEX_FLUSH_ADDS', 3):
+            for name in ('a.jpg', 'b.jpg'):
+                self._write(cache, name)
+            self.assertEqual(cache.index_path.read_bytes(), index)
+            self._write(cache, 'c.jpg')
+            self.assertEqual(DiskCache(self.temp_dir).stats()['entries'], 3)
+            self._write(cache, 'd.jpg')
+        self.assertEqual(DiskCache(self.temp_dir).stats()['entries'], 3)
+        cache.flush()
+        self.assertEqual(DiskCache(self.temp_dir).stats()['entries'], 4)
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest entries go first and touch() refreshes an entry."""
+        cache = DiskCache(self.temp_dir, max_bytes=10000, max_files=3)
+        a = self._write(cache, 'a.jpg', when=1000)
+        b = self._write(cache, 'b.jpg', when=2000)
+        c = self._write(cache, 'c.jpg', when=3000)
+        with mock.patch('time.time', return_value=4000):
+            cache.touch(a)
+        d = self._write(cache, 'd.jpg', when=5000)
+        self.assertFalse(b.exists())
+        self.assertTrue(a.exists() and c.exists() and d.exists())
+    
+    def test_byte_limit_evicts_derived_files(self):
+        """Test that a size limit evicts a JPEG together with its derived files."""
+        cache = DiskCache(self.temp_dir, max_bytes=1000, max_files=100)
+        old = self._write(cache, 'old.jpg', 300, when=1000)
+        derived = self._write(cache, 'old.40x20.rgb', 300, when=1000)
+        new = self._write(cache, 'new.jpg', 600, when=2000)
+        self.assertFalse(old.exists() or derived.exists())
+        self.assertTrue(new.exists())
+        self.assertEqual(cache.stats()['bytes'], 600)
+    
+    def test_index_persists_and_rebuilds(self):
+        """Test that bookkeeping survives restarts and a lost index is rebuilt."""
+        cache = DiskCache(self.temp_dir)
+        self._write(cache, 'a.jpg', 100)
+        self._write(cache, 'a.40x20.rgb', 50)
+        self._write(cache, 'b.jpg', 100)
+        cache.flush()
+        self.assertEqual(DiskCache(self.temp_dir).stats()['files'], 3)
+        
+        (self.temp_dir / 'index').unlink()
+        stats = DiskCache(self.temp_dir).stats()
+        self.assertEqual((stats['entries'], stats['files'], stats['bytes']), (2, 3, 250))
+    
+    def test_prune_to_explicit_limits(self):
+        """Test pruning below the configured limits."""
+        cache = DiskCache(self.temp_dir)
+        for index in range(5):
+            self._write(cache, f'{index}.jpg', when=1000 + index)
+        self.assertEqual(cache.prune(max_files=2), (3, 300))
+        self.assertEqual(sorted(p.name for p in self.temp_dir.glob('*.jpg')), ['3.jpg', '4.jpg'])
+    
+    def test_handler_keeps_cache_bounded(self):
+        """Test that downloads through ArtworkHandler respect the file limit."""
+        handler = ArtworkHandler(cache_dir=self.temp_dir / 'cache', cache_max_files=3)
+        for index in range(6):
+            url = make_cover(self.temp_dir, f'cover{index}.png', color=(index * 40, 0, 0))
+            self.assertIsNotNone(handler.get_artwork(url))
+        self.assertEqual(len(list((self.temp_dir / 'cache').glob('*.jpg'))), 3)
+    
+    def test_cache_command(self):
+        """Test the ``bass-senpai cache stats|prune`` command."""
+        cache = DiskCache(self.temp_dir)
+        for index in range(4):
+            self._write(cache, f'{index}.jpg', when=1000 + index)
+        cache.flush()
+        
+        def run(*argv):
+            with mock.patch('sys.argv', ['bass-senpai', '--cache-dir', str(self.temp_dir)] + list(argv)), \
+                    mock.patch('sys.stdout', new_callable=io.StringIO) as out:
+                self.assertEqual(main(), 0)
+            return out.getvalue()
+        
+        self.assertIn('Entries: 4 (4 files', run('cache', 'stats'))
+        output = run('cache', 'prune', '--max-files', '1')
+        self.assertIn('Removed 3 entries', output)
+        self.assertIn('Entries: 1 (1 files', output)
+
+
+class TestKittyImageReuse(unittest.TestCase):
+    """Test that Kitty artwork is transmitted once and then only re-placed."""
+    
+    def setUp(self):
+        """Create a Kitty-mode handler and two covers."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.handler = ArtworkHandler(cache_dir=self.temp_dir / 'cache', kitty_transfer='direct')
+        self.handler.is_kitty = True
+        self.cover_a = make_cover(self.temp_dir, 'a.png', size=(400, 400))
+        self.cover_b = make_cover(self.temp_dir, 'b.png', size=(400, 400), color=(0, 0, 255))
+    
+    def test_transmit_once_then_place(self):
+        """Test that steady-state frames are a tiny placement command."""
+        first = self.handler.render(self.cover_a, 40, 20)
+        self.assertIn('a=t,', first)
+        image_id = self.handler.kitty_image_id
+        self.assertIsNotNone(image_id)
+        second = self.handler.render(self.cover_a, 40, 20)
+        self.assertNotIn('a=t,', second)
+        self.assertIn(f'a=p,i={image_id},p=1', second)
+        self.assertLess(len(second.encode()), 100)
+        self.assertEqual(second.count('\n'), 21)
+    
+    def test_track_change_deletes_old_image(self):
+        """Test that switching artwork frees the previous image."""
+        self.handler.render(self.cover_a, 40, 20)
+        old_id = self.handler.kitty_image_id
+        output = self.handler.render(self.cover_b, 40, 20)
+        self.assertIn(f'a=d,d=I,i={old_id}', output)
+        self.assertNotEqual(self.handler.kitty_image_id, old_id)
+    
+    def test_placeholder_removes_image(self):
+        """Test that falling back to the placeholder deletes the placement."""
+        self.handler.render(self.cover_a, 40, 20)
+        output = self.handler.render(None, 40, 20)
+        self.assertIn('a=d,d=I', output)
+        self.assertIn('No Artwork', output)
+        self.assertIsNone(self.handler.kitty_image_id)
+    
+    
+    def _payload(self, output: str) -> str:
+        command = output.split('\x1b_G', 2)[1]
+        return base64.b64decode(command.split(';', 1)[1].split('\x1b', 1)[0]).decode()
+    
+    def _render_with(self, transfer: str):
+        handler = ArtworkHandler(cache_dir=self.temp_dir / 'cache', kitty_transfer=transfer)
+        handler.is_kitty = True
+        return handler, handler.render(self.cover_a, 40, 20), handler.render(self.cover_a, 40, 20)
+    
+    def test_file_transfer(self):
+        """Test that file mode points the terminal at the pixels in the pixel cache."""
+        _, first, second = self._render_with('file')
+        self.assertIn(f'f=24,s=400,v=400,t=f,O={PIXEL_HEADER.size},S={400 * 400 * 3}', first)
+        path = Path(self._payload(first))
+        self.assertEqual(path.parent, self.temp_dir / 'cache')
+        self.assertEqual(path.stat().st_size, PIXEL_HEADER.size + 400 * 400 * 3)
+        self.assertLess(len(first.encode()), 300)
+        self.assertLess(len(second.encode()), 100)
+    
+    def test_temp_transfer(self):
+        """Test that temp mode writes a marker-named temp file for the terminal."""
+        _, first, _ = self._render_with('temp')
+        self.assertIn('t=t', first)
+        path = Path(self._payload(first))
+        self.addCleanup(path.unlink)
+        self.assertIn('tty-graphics-protocol', path.name)
+        self.assertEqual(path.stat().st_size, 400 * 400 * 3)
+    
+    def test_local_media_charged_for_pixels(self):
+        """Test that path-only Kitty entries count their pixels and leave no temp files once evicted."""
+        handler = ArtworkHandler(cache_dir=self.temp_dir / 'cache', kitty_transfer='temp',
+                                 render_cache_bytes=400 * 400 * 3)
+        handler.is_kitty = True
+        first = handler.render(self.cover_a, 40, 20)
+        self.assertEqual(handler.render_cache.size, 400 * 400 * 3)
+        path = Path(self._payload(first))
+        self.assertTrue(path.exists())
+        
+        # The next cover evicts the first and replaces it on the terminal
+        second = handler.render(self.cover_b, 40, 20)
+        self.assertEqual(len(handler.render_cache), 1)
+        self.assertFalse(path.exists())
+        path = Path(self._payload(second.split('\x1b_Ga=d', 1)[1]))
+        self.assertTrue(path.exists())
+        handler.release_kitty()
+        self.assertFalse(path.exists())
+        
+        # Evicting an image the terminal no longer shows removes its transfer too
+        handler.render(self.cover_a, 40, 20)
+        handler.release_kitty()
+        third = handler.render(self.cover_b, 40, 20)
+        path = Path(self._payload(third))
+        handler.kitty_image_id = None
+        handler.render_cache.put('other', 'x' * (400 * 400 * 3))
+        self.assertFalse(path.exists())
+    
+    @unittest.skipUnless(os.path.isdir('/dev/shm'), "needs /dev/shm")
+    def test_shm_transfer(self):
+        """Test that shm mode hands over a POSIX shared memory object."""
+        _, first, _ = self._render_with('shm')
+        self.assertIn('t=s', first)
+        path = Path('/dev/shm') / self._payload(first)
+        self.addCleanup(path.unlink)
+        self.assertEqual(path.stat().st_size, 400 * 400 * 3)
+    
+    def test_auto_transfer_detection(self):
+        """Test that SSH sessions fall back to inline transmission."""
+        with mock.patch.dict(os.environ, {'SSH_CONNECTION': '1 2 3 4'}):
+            self.assertEqual(ArtworkHandler(cache_dir=self.temp_dir).kitty_transfer, 'direct')
+        env = {key: value for key, value in os.environ.items() if not key.startswith('SSH_')}
+        with mock.patch.dict(os.environ, env, clear=True):
+            self.assertEqual(ArtworkHandler(cache_dir=self.temp_dir).kitty_transfer, 'file')
+
+
+class TestBackgroundArtwork(unittest.TestCase):
+    """Test the worker-pool artwork pipeline."""
+    
+    def setUp(self):
+        """Create a background handler and a couple of covers."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.handler = ArtworkHandler(cache_dir=self.temp_dir / 'cache', background=True)
+        self.handler.is_kitty = False
+        self.addCleanup(self.handler.close)
+        self.cover_a = make_cover(self.temp_dir, 'a.png')
+        self.cover_b = make_cover(self.temp_dir, 'b.png', color=(10, 200, 10))
+    
+    def test_placeholder_until_ready(self):
+        """Test that render() returns the placeholder, then the artwork."""
+        ready = threading.Event()
+        self.handler.on_ready = ready.set
+        self.assertIn('No Artwork', self.handler.render(self.cover_a, 20, 10))
+        self.assertTrue(ready.wait(5))
+        self.assertIn('\x1b[38;2;', self.handler.render(self.cover_a, 20, 10))
+    
+    def test_single_job_per_url(self):
+        """Test that repeated renders while in flight start only one job."""
+        release = threading.Event()
+        original = self.handler._download_artwork
+        calls = []
+        
+        def slow_download(art_url):
+            calls.append(art_url)
+            release.wait(5)
+            return original(art_url)
+        
+        self.handler._download_artwork = slow_download
+        for _ in range(20):
+            self.handler.render(self.cover_a, 20, 10)
+        release.set()
+        self.assertTrue(wait_for(lambda: 'No Artwork' not in self.handler.render(self.cover_a, 20, 10)))
+        self.assertEqual(calls, [self.cover_a])
+    
+    def test_failed_job_retried(self):
+        """Test that a failed fetch is not kept as the result and is retried after a delay."""
+        original = self.handler._fetch_artwork
+        calls = []
+        
+        def failing_fetch(art_url):
+            calls.append(art_url)
+            return None if len(calls) == 1 else original(art_url)
+        
+        self.handler._fetch_artwork = failing_fetch
+        self.handler.render(self.cover_a, 20, 10)
+        self.assertTrue(wait_for(lambda: self.handler._failures))
+        self.assertEqual(self.handler._ready, {})
+        self.assertIn('No Artwork', self.handler.render(self.cover_a, 20, 10))
+        self.assertEqual(len(calls), 1)  # Not before the retry delay
+        
+        # Once the delay has passed the next render starts another job
+        key = (self.cover_a, 20, 10)
+        self.handler._failures[key] = (1, time.monotonic())
+        self.assertTrue(wait_for(lambda: 'No Artwork' not in self.handler.render(self.cover_a, 20, 10)))
+        self.assertNotIn(key, self.handler._failures)
+        self.assertEqual(len(calls), 2)
+    
+    def test_stale_job_discarded(self):
+        """Test that a job for a previous track is neither decoded nor shown."""
+        release = threading.Event()
+        original = self.handler._download_artwork
+        rendered = []
+        original_render_path = self.handler._render_path
+        
+        def slow_download(art_url):
+            if art_url == self.cover_a:
+                release.wait(5)
+            return original(art_url)
+        
+        def tracking_render_path(path, width, height):
+            rendered.append(path)
+            return original_render_path(path, width, height)
+        
+        self.handler._download_artwork = slow_download
+        self.handler._render_path = tracking_render_path
+        self.handler.render(self.cover_a, 20, 10)
+        self.handler.render(self.cover_b, 20, 10)
+        self.assertTrue(wait_for(lambda: 'No Artwork' not in self.handler.render(self.cover_b, 20, 10)))
+        release.set()
+        time.sleep(0.2)
+        self.assertEqual(rendered, [self.handler._get_cache_path(self.cover_b)])
+        self.assertNotIn(self.cover_a, [key[0] for key in self.handler._ready])
+
+
+class TestArtworkDownload(unittest.TestCase):
+    """Test HTTP artwork fetching against a local server."""
+    
+    def setUp(self):
+        """Start an art server and a handler with a fresh cache."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.server = ArtServer().__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.handler = ArtworkHandler(cache_dir=self.temp_dir / 'cache', workers=4)
+        self.addCleanup(self.handler.close)
+        buffer = io.BytesIO()
+        Image.new('RGB', (64, 64), (30, 60, 90)).save(buffer, 'PNG')
+        self.png = buffer.getvalue()
+    
+    def test_prefetch_reports_bytes_received(self):
+        """Test that prefetch() returns the bytes downloaded, not the size of the cached copy."""
+        url = self.server.add('/cover.png', self.png)
+        self.assertEqual(self.handler.prefetch(url), len(self.png))
+        self.assertNotEqual(self.handler._get_cache_path(url).stat().st_size, len(self.png))
+        self.assertEqual(self.handler.prefetch(url), 0)
+        self.assertIsNone(self.handler.prefetch(url + '-missing'))
+    
+    def test_connection_reused(self):
+        """Test that downloads share one keep-alive connection."""
+        urls = [self.server.add(f'/{i}.png', self.png) for i in range(4)]
+        for url in urls:
+            self.assertIsNotNone(self.handler.get_artwork(url))
+        ports = {port for _, port, _ in self.server.requests}
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertEqual(len(ports), 1)
+    
+    def test_revalidates_with_etag(self):
+        """Test that a stale cached cover is revalidated and a 304 keeps the file."""
+        url = self.server.add('/cover.png', self.png, etag='"v1"')
+        cached = self.handler._fetch_artwork(url)
+        mtime = cached.stat().st_mtime_ns
+        
+        # Fresh: served from disk without a request
+        self.assertEqual(self.handler._fetch_artwork(url), cached)
+        self.assertEqual(len(self.server.hits('/cover.png')), 1)
+        
+        with mock.patch('bass_senpai.artwork.time.time', return_value=time.time() + REVALIDATE_AFTER + 1):
+            self.assertEqual(self.handler._fetch_artwork(url), cached)
+        hits = self.server.hits('/cover.png')
+        self.assertEqual(len(hits), 2)
+        self.assertEqual(hits[1][2].get('If-None-Match'), '"v1"')
+        self.assertEqual(cached.stat().st_mtime_ns, mtime)
+    
+    def test_changed_cover_replaced(self):
+        """Test that a changed ETag on revalidation replaces the cached file."""
+        url = self.server.add('/cover.png', self.png, etag='"v1"')
+        cached = self.handler._fetch_artwork(url)
+        buffer = io.BytesIO()
+        Image.new('RGB', (32, 32), (250, 0, 0)).save(buffer, 'PNG')
+        self.server.add('/cover.png', buffer.getvalue(), etag='"v2"')
+        with mock.patch('bass_senpai.artwork.time.time', return_value=time.time() + REVALIDATE_AFTER + 1):
+            self.handler._fetch_artwork(url)
+        with Image.open(cached) as img:
+            self.assertEqual(img.size, (32, 32))
+    
+    def test_oversized_download_abandoned(self):
+        """Test that bodies over the cap are dropped, with or without Content-Length."""
+        self.handler.max_download_bytes = len(self.png) - 1
+        declared = self.server.add('/declared.png', self.png)
+        streamed = self.server.add('/streamed.png', self.png, no_length=True)
+        self.assertIsNone(self.handler.get_artwork(declared))
+        self.assertIsNone(self.handler.get_artwork(streamed))
+        self.assertFalse(self.handler._get_cache_path(declared).exists())
+        self.assertFalse(self.handler._get_cache_path(streamed).exists())
+    
+    def test_oversized_revalidation_keeps_cached_copy(self):
+        """Test that an over-cap 200 on revalidation falls back to the cached cover."""
+        url = self.server.add('/cover.png', self.png, etag='"v1"')
+        cached = self.handler._fetch_artwork(url)
+        meta = self.handler._meta_path(cached).read_text()
+        self.server.add('/cover.png', self.png + b'\0' * 1024, etag='"v2"')
+        self.handler.max_download_bytes = len(self.png) + 1
+        with mock.patch('bass_senpai.artwork.time.time', return_value=time.time() + REVALIDATE_AFTER + 1):
+            self.assertEqual(self.handler._fetch_artwork(url), cached)
+        self.assertEqual(len(self.server.hits('/cover.png')), 2)
+        self.assertTrue(cached.exists())
+        self.assertEqual(self.handler._meta_path(cached).read_text(), meta)
+    
+    def test_concurrent_fetches_deduplicated(self):
+        """Test that simultaneous requests for one URL download it once."""
+        url = self.server.add('/slow.png', self.png, delay=0.3)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.handler._fetch_artwork(url)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(self.server.hits('/slow.png')), 1)
+        self.assertEqual(len(set(results)), 1)
+        self.assertIsNotNone(results[0])
+    
+    def test_read_art_urls(self):
+        """Test that URL lists and playerctl metadata dumps are both understood."""
+        lines = [
+            'https://example.com/a.jpg\n',
+            'Artist|Title|Album|Playing|0|1000|https://example.com/b.jpg\n',
+            'spotify mpris:artUrl             https://example.com/c.jpg\n',
+            'spotify xesam:title              Some Song\n',
+            'Artist|Title|Album|Playing|0|1000|\n',
+            '# comment\n',
+            'https://example.com/a.jpg\n',
+        ]
+        self.assertEqual(read_art_urls(lines), [
+            'https://example.com/a.jpg', 'https://example.com/b.jpg', 'https://example.com/c.jpg'])
+    
+    def test_cache_warm_command(self):
+        """Test that ``bass-senpai cache warm`` fetches missing covers and reports failures."""
+        urls = [self.server.add(f'/{i}.png', self.png) for i in range(3)]
+        listing = self.temp_dir / 'urls.txt'
+        listing.write_text(f'{urls[0]}\nA|T|B|Playing|0|0|{urls[1]}\n{urls[2]}\n{urls[2]}-missing\n')
+        
+        def run():
+            argv = ['bass-senpai', '--cache-dir', str(self.temp_dir / 'warm'), 'cache', 'warm', '-j', '2', str(listing)]
+            with mock.patch('sys.argv', argv), mock.patch('sys.stdout', new_callable=io.StringIO) as out:
+                code = main()
+            return code, out.getvalue()
+        
+        code, output = run()
+        self.assertEqual(code, 1)
+        self.assertIn('4 listed, 0 already cached, 3 fetched, 1 failed', output)
+        self.assertIn('covers/s', output)
+        self.assertIn(f'Failed: {urls[2]}-missing', output)
+        self.assertEqual(len(list((self.temp_dir / 'warm').glob('*.jpg'))), 3)
+        
+        requests_before = len(self.server.requests)
+        code, output = run()
+        self.assertIn('4 listed, 3 already cached, 0 fetched, 1 failed', output)
+        self.assertEqual(len(self.server.requests), requests_before + 1)
 
 
 class TestTerminalUI(unittest.TestCase):
@@ -132,6 +1181,752 @@ class TestTerminalUI(unittest.TestCase):
         ui._calculate_artwork_size()
         self.assertEqual(ui.artwork_width, 40)
         self.assertEqual(ui.artwork_height, 20)
+        
+        # Test very large terminal, which also needs the rows
+        ui.term_width = 240
+        ui.term_height = 40
+        ui._calculate_artwork_size()
+        self.assertEqual(ui.artwork_width, 40)
+        ui.term_height = 70
+        ui._calculate_artwork_size()
+        self.assertEqual(ui.artwork_width, 120)
+        self.assertEqual(ui.artwork_height, 60)
+    
+    def test_truncate_by_display_width(self):
+        """Test that wide titles are cut by columns, not code points."""
+        ui = TerminalUI()
+        title = '東京事変の新しいアルバムのタイトル'
+        cut = ui._truncate(title, 20)
+        self.assertTrue(cut.endswith('...'))
+        self.assertLessEqual(ui._display_width(cut), 20)
+        self.assertEqual(ui._display_width(cut), 19)  # 8 wide characters + '...'
+        self.assertEqual(ui._truncate('Short', 20), 'Short')
+        self.assertEqual(ui._truncate('A' * 30, 20), 'A' * 17 + '...')
+        # Combining marks stay with their base character
+        self.assertEqual(ui._truncate('e\u0301' * 30, 10), 'e\u0301' * 7 + '...')
+    
+    def test_cjk_title_fits_panel(self):
+        """Test that a CJK title line doesn't run into the artwork column."""
+        ui = TerminalUI()
+        ui.term_width, ui.term_height = 100, 30
+        ui._calculate_artwork_size()
+        state = TrackState('アーティスト' * 5, '新しい曲のタイトル' * 6, 'アルバム' * 8, 'Playing', 10, 100)
+        left_width = ui.term_width - (ui.artwork_width + 2) - 4
+        for line in ui.render_track_info(state, ui.artwork_width + 2).split('\n'):
+            self.assertLessEqual(ui._display_width(line), left_width)
+    
+    def test_display_width_ignores_escapes(self):
+        """Test widths of lines with SGR codes, emoji and Kitty APCs."""
+        ui = TerminalUI()
+        self.assertEqual(ui._display_width('  \x1b[1m\x1b[35mTitle\x1b[0m'), 7)
+        self.assertEqual(ui._display_width('  👤 \x1b[36m名前\x1b[0m'), 9)
+        self.assertEqual(ui._display_width('\x1b_Ga=p,i=1;\x1b\\'), 0)
+
+
+class TestFrameDiff(unittest.TestCase):
+    """Test that display() only rewrites what changed and leaves the right screen."""
+    
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.ui = TerminalUI()
+        self.ui.term_width = 140
+        self.ui.term_height = 40
+        self.ui._calculate_artwork_size()
+        path = self.temp_dir / 'cover.png'
+        size = (self.ui.artwork_width, self.ui.artwork_height * 2)
+        Image.merge('RGB', (Image.effect_noise(size, 60),) * 3).save(path)
+        handler = ArtworkHandler(cache_dir=self.temp_dir)
+        self.artwork = handler.render_textart(path, self.ui.artwork_width, self.ui.artwork_height)
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _frame(self, position: float, title: str = 'Test Title', status: str = 'Playing') -> str:
+        metadata = {'artist': 'Test Artist', 'title': title, 'album': 'Test Album',
+                    'status': status, 'position': position, 'length': 200.0}
+        left = self.ui.render_track_info(metadata, self.ui.artwork_width + 2)
+        return self.ui.render_split_layout(left, self.artwork)
+    
+    def _display(self, frame: str) -> str:
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as out:
+            self.ui.display(frame)
+        return out.getvalue()
+    
+    def _full_screen(self, frame: str):
+        screen = Screen(self.ui.term_width, self.ui.term_height)
+        screen.feed('\x1b[H' + frame + '\x1b[J')
+        return screen.cells()
+    
+    def test_screen_matches_full_redraw(self):
+        """Test that a sequence of diffed frames leaves the same screen as a full redraw."""
+        screen = Screen(self.ui.term_width, self.ui.term_height)
+        frames = [
+            self._frame(10.0),
+            self._frame(11.0),
+            self._frame(71.0),
+            self._frame(71.0, status='Paused'),
+            self._frame(0.0, title='一曲の歌 🎵 Café'),
+            self._frame(1.0, title='Cafe\u0301 del Mar'),
+            self._frame(2.0, title='Short'),
+            self.ui.render_split_layout(self.ui.render_track_info(None, self.ui.artwork_width + 2), self.artwork),
+        ]
+        for frame in frames:
+            screen.feed(self._display(frame))
+            self.assertEqual(screen.cells(), self._full_screen(frame))
+    
+    def test_cover_change_matches_full_redraw(self):
+        """Test that rows of the same glyphs in new colours are not kept from the previous cover."""
+        screen = Screen(self.ui.term_width, self.ui.term_height)
+        handler = ArtworkHandler(cache_dir=self.temp_dir)
+        size = (self.ui.artwork_width, self.ui.artwork_height * 2)
+        for name, colours in (('blue.png', ((0, 0, 255), (255, 0, 0))), ('yellow.png', ((255, 255, 0), (0, 255, 0)))):
+            path = self.temp_dir / name
+            cover = Image.new('RGB', size, colours[0])
+            cover.paste(colours[1], (0, size[1] // 2, size[0], size[1]))
+            cover.save(path)
+            self.artwork = handler.render_textart(path, self.ui.artwork_width, self.ui.artwork_height)
+            frame = self._frame(10.0)
+            screen.feed(self._display(frame))
+            self.assertEqual(screen.cells(), self._full_screen(frame))
+    
+    def test_progress_frame_bytes(self):
+        """Test that a one-second tick writes two orders of magnitude less than a full frame."""
+        full = self._display(self._frame(10.0))
+        # 10s -> 15s moves both the time and the progress bar
+        tick = self._display(self._frame(15.0))
+        self.assertIn('\x1b[36m', tick)
+        self.assertLess(len(tick.encode()) * 100, len(full.encode()))
+        self.assertEqual(self._display(self._frame(15.0)), '')
+    
+    def test_full_redraw_after_resize_or_clear(self):
+        """Test that a size change or clear_screen() forces a full redraw."""
+        self._display(self._frame(10.0))
+        self.ui.term_width = 150
+        self.assertTrue(self._display(self._frame(10.0)).startswith('\x1b[H'))
+        with mock.patch('sys.stdout', new_callable=io.StringIO):
+            self.ui.clear_screen()
+        self.assertTrue(self._display(self._frame(10.0)).startswith('\x1b[H'))
+
+
+class TestTrackState(unittest.TestCase):
+    """Test the typed track state and its per-panel diff."""
+    
+    METADATA = {
+        'artist': 'Test Artist', 'title': 'Test Title', 'album': 'Test Album',
+        'status': 'Playing', 'position': 30.0, 'length': 200.0, 'art_url': None
+    }
+    
+    def _state(self, **changes) -> TrackState:
+        return TrackState.from_metadata(dict(self.METADATA, **changes))
+    
+    def test_from_metadata(self):
+        """Test conversion from MPRIS metadata dicts."""
+        self.assertIsNone(TrackState.from_metadata(None))
+        state = self._state()
+        self.assertEqual(state.track_id, 'Test Artist|Test Title|Test Album')
+        self.assertFalse(hasattr(state, '__dict__'))
+        self.assertEqual(state, self._state())
+    
+    def test_dirty_panels(self):
+        """Test which panels each kind of change marks dirty."""
+        state = self._state()
+        self.assertEqual(state.dirty_panels(None), PANELS)
+        self.assertEqual(self._state().dirty_panels(state), frozenset())
+        self.assertEqual(self._state(position=30.4).dirty_panels(state), {'progress'})
+        self.assertEqual(self._state(position=31.0).dirty_panels(state), {'progress', 'time'})
+        self.assertEqual(self._state(status='Paused').dirty_panels(state), {'status'})
+        self.assertEqual(self._state(title='Other').dirty_panels(state), {'info'})
+        self.assertEqual(self._state(art_url='file:///a.png').dirty_panels(state), {'artwork'})
+    
+    def test_other_players_listed(self):
+        """Test that the other players are part of the info panel."""
+        state = self._state(players=[('spotify', 'Paused'), ('vlc', 'Playing')])
+        self.assertEqual(state.players, (('spotify', 'Paused'), ('vlc', 'Playing')))
+        self.assertEqual(state.dirty_panels(self._state()), {'info'})
+        ui = TerminalUI()
+        ui.term_width, ui.term_height = 120, 40
+        self.assertIn('Also: spotify ⏸  vlc ▶', ui.render_track_info(state, 42))
+        self.assertNotIn('Also:', ui.render_track_info(self._state(), 42))
+
+
+class TestBench(unittest.TestCase):
+    """Test the microbenchmark suite."""
+    
+    def test_run_benchmarks(self):
+        """Test that every benchmark runs and reports JSON-serialisable numbers."""
+        report = run_benchmarks(iterations=2)
+        self.assertEqual(set(report['results']), set(BENCHMARKS))
+        for name, result in report['results'].items():
+            self.assertGreater(result['ns_per_op'], 0, name)
+            self.assertGreaterEqual(result['alloc_bytes_per_op'], 0, name)
+        self.assertGreater(report['results']['render_textart']['output_bytes'], 0)
+        for cover, sizes in report['encodings'].items():
+            self.assertLess(sizes['256'], sizes['truecolor'] / 3, cover)
+            self.assertLess(sizes['16'], sizes['256'], cover)
+        self.assertEqual(json.loads(json.dumps(report))['results'].keys(), report['results'].keys())
+    
+    def test_encoding_sizes_only_with_textart(self):
+        """Test that the encoding sizes are only measured when a text-art case runs."""
+        report = run_benchmarks(iterations=2, names=['render_kitty'])
+        self.assertEqual(list(report['results']), ['render_kitty'])
+        self.assertEqual(report['encodings'], {})
+        self.assertTrue(run_benchmarks(iterations=2, names=['render_textart_16'])['encodings'])
+    
+    def test_compare_flags_regressions(self):
+        """Test that only slowdowns beyond the threshold count as regressions."""
+        baseline = {'results': {'a': {'ns_per_op': 100}, 'b': {'ns_per_op': 100}}}
+        report = {'results': {'a': {'ns_per_op': 150}, 'b': {'ns_per_op': 110}, 'c': {'ns_per_op': 1}}}
+        self.assertEqual([name for name, _ in compare(report, baseline, 20)], ['a'])
+
+
+class TestFrameStats(unittest.TestCase):
+    """Test the frame timing instrumentation."""
+    
+    def test_percentiles(self):
+        """Test nearest-rank percentiles over the rolling window."""
+        stats = FrameStats(window=100)
+        for ms in range(1, 201):
+            stats.record('display', 0, ms / 1000)
+        result = stats.percentiles('display')
+        self.assertEqual(result['count'], 100)
+        self.assertAlmostEqual(result['p50'], 150)
+        self.assertAlmostEqual(result['p99'], 199)
+        self.assertAlmostEqual(result['max'], 200)
+        self.assertEqual(stats.percentiles('layout'), {})
+    
+    def test_trace_only_when_enabled(self):
+        """Test that trace events are only kept when tracing."""
+        stats = FrameStats()
+        with stats.phase('frame'):
+            pass
+        self.assertEqual(stats.trace_events()['traceEvents'], [])
+        self.assertEqual(stats.summary()['phases']['frame']['count'], 1)
+
+
+class TestUpdateScheduler(unittest.TestCase):
+    """Test state-driven update cadence."""
+    
+    PLAYING = {'status': 'Playing', 'position': 10.0, 'length': 200.0}
+    
+    def test_backoff_without_player(self):
+        """Test that polling backs off steadily up to the cap with no player."""
+        scheduler = UpdateScheduler(redraw_interval=1.0)
+        gaps = []
+        for step in range(12):
+            scheduler.observe(None, now=float(step))
+            gaps.append(scheduler.next_deadline() - step)
+        self.assertEqual(gaps[0], 1.0)
+        self.assertEqual(gaps, sorted(gaps))
+        self.assertEqual(gaps[-1], NO_PLAYER_MAX_INTERVAL)
+    
+    def test_paused_backoff_resets_on_play(self):
+        """Test that the idle backoff is capped and reset by a state change."""
+        scheduler = UpdateScheduler(redraw_interval=1.0)
+        for step in range(12):
+            scheduler.observe({'status': 'Paused'}, now=float(step))
+        self.assertEqual(scheduler.next_deadline() - 11, IDLE_MAX_INTERVAL)
+        scheduler.observe({'status': 'Stopped'}, now=20.0)
+        self.assertEqual(scheduler.next_deadline(), 21.0)
+    
+    def test_playing_redraws_fast_and_polls_slowly(self):
+        """Test that Playing polls at poll_interval but redraws sooner."""
+        scheduler = UpdateScheduler(redraw_interval=0.1, poll_interval=5.0)
+        now = time.monotonic()
+        scheduler.observe(self.PLAYING, now=now)
+        self.assertAlmostEqual(scheduler._next_poll, now + 5.0)
+        self.assertLess(scheduler.next_deadline(), now + 0.2)
+        tick = scheduler.wait()
+        self.assertFalse(tick.poll)
+    
+    def test_playing_polls_at_track_end(self):
+        """Test that the next poll is pulled in to the expected end of track."""
+        scheduler = UpdateScheduler(redraw_interval=1.0, poll_interval=10.0)
+        scheduler.observe({'status': 'Playing', 'position': 198.0, 'length': 200.0}, now=0.0)
+        self.assertAlmostEqual(scheduler._next_poll, 2.5)
+    
+    def test_wake_interrupts_wait(self):
+        """Test that wake() returns from wait() immediately."""
+        scheduler = UpdateScheduler(redraw_interval=1.0)
+        scheduler.observe({'status': 'Paused'})
+        timer = threading.Timer(0.05, scheduler.wake, kwargs={'poll': False, 'resize': True})
+        timer.start()
+        start = time.monotonic()
+        tick = scheduler.wait()
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertTrue(tick.resized)
+        self.assertFalse(tick.poll)
+    
+    def test_wake_from_signal_handler(self):
+        """Test that a signal handler can wake wait() without touching a lock."""
+        scheduler = UpdateScheduler(redraw_interval=1.0)
+        scheduler.observe({'status': 'Paused'})
+        self.addCleanup(scheduler.close)
+        previous = signal.signal(signal.SIGUSR1, lambda signum, frame: scheduler.wake(poll=False, resize=True))
+        self.addCleanup(signal.signal, signal.SIGUSR1, previous)
+        threading.Timer(0.05, os.kill, (os.getpid(), signal.SIGUSR1)).start()
+        start = time.monotonic()
+        tick = scheduler.wait()
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertTrue(tick.resized)
+        
+        # Repeated wakeups are coalesced into one pending tick
+        for _ in range(10000):
+            scheduler.wake(poll=False)
+        scheduler.wait()
+        start = time.monotonic()
+        scheduler.observe({'status': 'Paused'})
+        scheduler.wait()
+        self.assertGreater(time.monotonic() - start, 0.5)
+    
+    def test_wakeups_per_minute(self):
+        """Test that wakeups are counted per state."""
+        scheduler = UpdateScheduler(redraw_interval=0.01)
+        scheduler.observe({'status': 'Paused'})
+        for _ in range(3):
+            scheduler.wait()
+        rates = scheduler.wakeups_per_minute()
+        self.assertEqual(scheduler.wakeups['Paused'], 3)
+        self.assertGreater(rates['Paused'], 0)
+
+
+class TestBassSenpai(unittest.TestCase):
+    """Test the application update loop."""
+    
+    def setUp(self):
+        """Create an app with a mocked metadata source and display."""
+        self.app = BassSenpai(update_interval=0.1, backend='playerctl')
+        self.app.artwork = ArtworkHandler(cache_dir=Path(tempfile.mkdtemp()))
+        self.app.mpris.get_metadata = mock.Mock(return_value={
+            'artist': 'Test Artist', 'title': 'Test Title', 'album': 'Test Album',
+            'status': 'Playing', 'position': 30.0, 'length': 200.0, 'art_url': None
+        })
+        self.app.ui.display = mock.Mock()
+    
+    def test_redraw_without_poll_extrapolates(self):
+        """Test that redraws between polls reuse metadata and advance the clock."""
+        self.app._update()
+        self.app.clock.sync(30.0, now=time.monotonic() - 65)
+        self.app._update(poll=False)
+        self.assertEqual(self.app.mpris.get_metadata.call_count, 1)
+        self.assertIn('01:35', self.app.ui.display.call_args[0][0])
+    
+    def test_progress_only_fast_path(self):
+        """Test that a position-only tick patches rows instead of re-rendering panels."""
+        self.app._update()
+        with mock.patch.object(self.app.ui, 'render_track_info', wraps=self.app.ui.render_track_info) as info:
+            self.app.clock.sync(30.0, now=time.monotonic() - 65)
+            self.app._update(poll=False)
+            info.assert_not_called()
+            fast = self.app.ui.display.call_args[0][0]
+            
+            self.assertIn('01:35', fast)
+            
+            # The patched frame is what a full render of the same state produces
+            full = self.app.ui.render_split_layout(
+                self.app.ui.render_track_info(self.app._drawn_state, self.app.ui.artwork_width + 2),
+                self.app._right_panel)
+            self.assertEqual(fast, full)
+            
+            # A track change goes through the full render
+            self.app.mpris.get_metadata.return_value = dict(self.app.mpris.get_metadata.return_value, title='Next')
+            info.reset_mock()
+            self.app._update()
+            info.assert_called_once()
+    
+    def test_unchanged_state_skips_display(self):
+        """Test that a tick with nothing new doesn't redraw at all."""
+        self.app.mpris.get_metadata.return_value = dict(self.app.mpris.get_metadata.return_value, status='Paused')
+        self.app._update()
+        self.app._update()
+        self.assertEqual(self.app.ui.display.call_count, 1)
+    
+    def test_stats_overlay_and_export(self):
+        """Test that updates are timed per phase, overlaid on screen and written to files."""
+        temp_dir = Path(tempfile.mkdtemp())
+        self.app.stats = FrameStats(trace=True)
+        self.app.stats_overlay = True
+        self.app.stats_file = temp_dir / 'stats.json'
+        self.app.trace_file = temp_dir / 'trace.json'
+        self.app.stats_interval = 0
+        self.app.ui.term_width, self.app.ui.term_height = 100, 30
+        
+        self.app._update()
+        self.app._update()
+        lines = self.app.ui.display.call_args[0][0].split('\n')
+        self.assertEqual(len(lines), 30)
+        self.assertIn('frames 1', lines[-1])
+        self.assertIn('display', ''.join(lines[-8:]))
+        
+        summary = json.loads(self.app.stats_file.read_text())
+        self.assertEqual(set(summary['phases']), {'metadata', 'artwork', 'track_info', 'layout', 'display', 'frame'})
+        self.assertEqual(summary['counters']['frames'], 2)
+        self.assertIn('render_cache_misses', summary['counters'])
+        
+        events = json.loads(self.app.trace_file.read_text())['traceEvents']
+        self.assertEqual(sum(event['name'] == 'frame' for event in events), 2)
+        self.assertTrue(all(event['ph'] == 'X' and event['dur'] >= 0 for event in events))
+
+
+class TestAsyncBassSenpai(unittest.TestCase):
+    """Test the asyncio runtime."""
+    
+    METADATA = {
+        'artist': 'Test Artist', 'title': 'Test Title', 'album': 'Test Album',
+        'status': 'Playing', 'position': 30.0, 'length': 200.0, 'art_url': 'file:///nonexistent.png'
+    }
+    
+    def _run_for(self, app, seconds: float):
+        async def scenario():
+            task = asyncio.ensure_future(app._main())
+            await asyncio.sleep(seconds)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        asyncio.run(scenario())
+    
+    def test_slow_fetches_do_not_delay_redraw(self):
+        """Test that blocked metadata and artwork fetches don't stall the clock."""
+        app = AsyncBassSenpai(update_interval=0.05, backend='playerctl')
+        calls = []
+        
+        def slow_metadata():
+            calls.append(1)
+            if len(calls) > 1:
+                time.sleep(1)
+            return dict(self.METADATA)
+        
+        def slow_download(art_url):
+            time.sleep(1)
+        
+        app.mpris.get_metadata = slow_metadata
+        app.scheduler.poll_interval = 0.05
+        app.artwork = ArtworkHandler(cache_dir=Path(tempfile.mkdtemp()), background=True)
+        app.artwork._download_artwork = slow_download
+        self.addCleanup(app.artwork.close)
+        app.ui.display = mock.Mock()
+        self._run_for(app, 0.5)
+        self.assertGreaterEqual(app.ui.display.call_count, 6)
+        # Artwork never finished, so the placeholder stayed up
+        self.assertIn('No Artwork', app.ui.display.call_args[0][0])
+
+
+class TestAsyncRuntimeInPty(unittest.TestCase):
+    """Drive the --asyncio CLI inside a pseudo-terminal."""
+    
+    def _set_size(self, fd: int, cols: int, rows: int):
+        fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack('HHHH', rows, cols, 0, 0))
+    
+    def _read_until(self, needle: str, timeout: float = 10.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if needle in self.output.decode('utf-8', 'replace'):
+                return True
+            time.sleep(0.02)
+        return False
+    
+    def _reader(self):
+        while True:
+            try:
+                data = os.read(self.master, 65536)
+            except OSError:
+                return
+            if not data:
+                return
+            self.output += data
+    
+    def test_sigwinch_resize_and_clean_exit(self):
+        """Test that SIGWINCH re-lays out the frame and SIGINT exits cleanly."""
+        temp_dir = Path(tempfile.mkdtemp())
+        fake_playerctl.install(temp_dir)
+        metadata_file = temp_dir / 'metadata'
+        metadata_file.write_text(TRACK_LINE)
+        env = dict(
+            os.environ,
+            PATH=f"{temp_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+            HOME=str(temp_dir),
+            FAKE_PLAYERCTL_METADATA=str(metadata_file),
+        )
+        self.master, slave = pty.openpty()
+        self._set_size(slave, 140, 40)
+        self.output = b''
+        process = subprocess.Popen(
+            [sys.executable, '-c', 'import sys; from bass_senpai.main import main; sys.exit(main())',
+             '--asyncio', '--backend', 'playerctl', '--interval', '0.1'],
+            stdin=slave, stdout=slave, stderr=slave, env=env, cwd=Path(__file__).resolve().parent.parent
+        )
+        os.close(slave)
+        reader = threading.Thread(target=self._reader, daemon=True)
+        reader.start()
+        try:
+            self.assertTrue(self._read_until('╔' + '═' * 40 + '╗'))
+            self.assertTrue(self._read_until('Test Title'))
+            
+            self._set_size(self.master, 60, 40)
+            process.send_signal(signal.SIGWINCH)
+            self.assertTrue(self._read_until('╔' + '═' * 20 + '╗'))
+            
+            process.send_signal(signal.SIGINT)
+            self.assertEqual(process.wait(timeout=10), 0)
+            self.assertTrue(self._read_until('Bass-senpai stopped.'))
+        finally:
+            if process.poll() is None:
+                process.kill()
+            os.close(self.master)
+
+
+class FakeBackend:
+    """Stand-in MPRIS client for the daemon that counts polls."""
+    
+    available = True
+    event_driven = True
+    
+    def __init__(self, metadata):
+        self.metadata = metadata
+        self.calls = 0
+        self.on_change = None
+    
+    def get_metadata(self):
+        self.calls += 1
+        return dict(self.metadata) if self.metadata else None
+    
+    def close(self):
+        pass
+
+
+class TestDaemon(unittest.TestCase):
+    """Test the shared backend daemon and attached viewers."""
+    
+    def setUp(self):
+        """Serve a daemon with a fake backend on a private socket."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cover = make_cover(self.temp_dir)
+        self.backend = FakeBackend({
+            'artist': 'Test Artist', 'title': 'Test Title', 'album': 'Test Album',
+            'status': 'Playing', 'position': 30.0, 'length': 200.0, 'art_url': self.cover,
+        })
+        self.socket_path = self.temp_dir / 'daemon.sock'
+        with mock.patch('bass_senpai.daemon.create_client', return_value=self.backend):
+            self.daemon = Daemon(self.socket_path, poll_interval=60, cache_dir=self.temp_dir / 'cache')
+        thread = threading.Thread(target=self.daemon.serve, daemon=True)
+        with mock.patch('sys.stdout', new_callable=io.StringIO):
+            thread.start()
+            self.assertTrue(wait_for(self.socket_path.exists))
+        
+        def stop():
+            self.daemon.stop()
+            thread.join(timeout=5)
+        self.addCleanup(stop)
+    
+    def _viewer(self) -> SocketMPRISClient:
+        client = SocketMPRISClient(self.socket_path)
+        self.addCleanup(client.close)
+        self.assertTrue(client.available)
+        return client
+    
+    def test_viewers_share_one_backend(self):
+        """Test that every viewer gets pushed state from a single poll."""
+        viewers = [self._viewer() for _ in range(3)]
+        for viewer in viewers:
+            self.assertTrue(wait_for(lambda: viewer.get_metadata() is not None))
+            metadata = viewer.get_metadata()
+            self.assertEqual(metadata['title'], 'Test Title')
+            self.assertAlmostEqual(metadata['position'], 30.0, delta=1.0)
+        self.assertEqual(self.backend.calls, 1)
+        
+        self.backend.metadata['title'] = 'Next Title'
+        self.daemon.wake()
+        for viewer in viewers:
+            self.assertTrue(wait_for(lambda: viewer.get_metadata()['title'] == 'Next Title'))
+        self.assertEqual(self.backend.calls, 2)
+        
+        # Position moving as predicted is not worth a message
+        messages = [viewer.messages for viewer in viewers]
+        self.daemon.wake()
+        self.assertTrue(wait_for(lambda: self.backend.calls == 3))
+        time.sleep(0.1)
+        self.assertEqual([viewer.messages for viewer in viewers], messages)
+    
+    def test_artwork_announced_once_prepared(self):
+        """Test that the cover is withheld until pre-scaled for the viewer's tier."""
+        viewer = self._viewer()
+        cache_dir = self.temp_dir / 'cache'
+        seen = []
+        
+        def on_change():
+            metadata = viewer.get_metadata()
+            if metadata:
+                width, height, _ = viewer._view or (0, 0, 'h')
+                seen.append((metadata['art_url'], bool(list(cache_dir.glob(f'*.h{width}x{height}.px')))))
+        viewer.on_change = on_change
+        
+        self.assertTrue(wait_for(lambda: viewer.get_metadata() is not None))
+        self.assertIsNone(viewer.get_metadata()['art_url'])
+        viewer.send_view(20, 10, 'h')
+        self.assertTrue(wait_for(lambda: viewer.get_metadata()['art_url'] == self.cover))
+        
+        # A resize withdraws the cover until the new tier is ready
+        viewer.send_view(30, 15, 'h')
+        self.assertTrue(wait_for(lambda: seen[-1] == (self.cover, True) and len(seen) > 2))
+        self.assertIn((None, False), seen)
+        for art_url, tier_cached in seen:
+            if art_url:
+                self.assertTrue(tier_cached)
+        
+        # A viewer on the same cache renders from the mapped tier: no fetch, no decode
+        handler = ArtworkHandler(cache_dir=self.temp_dir / 'cache', read_only=True)
+        self.addCleanup(handler.close)
+        art_path = handler.get_artwork(self.cover)
+        self.assertIsNotNone(art_path)
+        with mock.patch('PIL.Image.open', side_effect=AssertionError('decoded')):
+            self.assertIn('\u2580', handler.render_textart(art_path, 20, 10))
+    
+    def test_viewer_without_daemon(self):
+        """Test that a viewer reports the daemon missing instead of hanging."""
+        client = SocketMPRISClient(self.temp_dir / 'missing.sock')
+        self.addCleanup(client.close)
+        self.assertFalse(client.available)
+        self.assertIsNone(client.get_metadata())
+
+
+class TestStatusLine(unittest.TestCase):
+    """Test the headless status-line output."""
+    
+    def setUp(self):
+        """Create a status line over a fake backend writing to a buffer."""
+        self.backend = FakeBackend({
+            'artist': 'Test Artist', 'title': 'Test Title', 'album': 'Test Album',
+            'status': 'Playing', 'position': 30.5, 'length': 200.0, 'art_url': None,
+        })
+        self.stream = io.StringIO()
+    
+    def _status(self, **kwargs) -> StatusLine:
+        status = StatusLine(client=self.backend, stream=self.stream, **kwargs)
+        status._poll()
+        status.clock.sync(30.5, 'Playing')
+        return status
+    
+    def test_format_fields(self):
+        """Test that format and JSON output reuse the TUI formatting."""
+        status = self._status(line_format='{icon} {artist} - {title} {elapsed}/{length} {percent}% [{bar}]')
+        self.assertEqual(status.render(status._state()),
+                         '▶ Test Artist - Test Title 00:30/03:20 15% [━─────────]')
+        
+        status = self._status(json_output=True, granularity=5)
+        output = json.loads(status.render(status._state()))
+        self.assertEqual(output['text'], '▶ Test Artist - Test Title')
+        self.assertEqual(output['class'], 'playing')
+        self.assertEqual(output['percentage'], 15)
+        
+        self.backend.metadata = None
+        status = self._status(json_output=True)
+        self.assertEqual(json.loads(status.render(status._state()))['class'], 'noplayer')
+        self.assertIn('unknown field', self._status(line_format='{nope}').check_format())
+    
+    def test_wakes_only_for_visible_changes(self):
+        """Test that the next wakeup is the next step of the fields in the format."""
+        state = TrackState(position=30.5, length=200.0, status='Playing')
+        status = self._status(line_format='{title} {percent}')
+        self.assertAlmostEqual(status.seconds_until_change(state), 1.5)
+        status = self._status(line_format='{title} {percent}', granularity=10)
+        self.assertAlmostEqual(status.seconds_until_change(state), 9.5)
+        status = self._status(line_format='{title} {elapsed}', granularity=10)
+        self.assertAlmostEqual(status.seconds_until_change(state), 0.5)
+        status = self._status(line_format='{title}')
+        self.assertGreater(status.seconds_until_change(state), 60)
+    
+    def test_writes_only_changes(self):
+        """Test that unchanged lines are not written again."""
+        status = self._status(line_format='{title} {percent}', granularity=10)
+        for _ in range(5):
+            status._poll()
+            status._emit()
+        self.assertEqual(self.stream.getvalue(), 'Test Title 10\n')
+        
+        self.backend.metadata['title'] = 'Next Title'
+        status._poll()
+        status._emit()
+        self.assertEqual(self.stream.getvalue().splitlines(), ['Test Title 10', 'Next Title 10'])
+    
+    def test_cli_does_not_load_artwork(self):
+        """Test that `bass-senpai status` runs without importing PIL or requests."""
+        temp_dir = Path(tempfile.mkdtemp())
+        fake_playerctl.install(temp_dir)
+        metadata_file = temp_dir / 'metadata'
+        metadata_file.write_text(TRACK_LINE)
+        env = dict(
+            os.environ,
+            PATH=f"{temp_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+            FAKE_PLAYERCTL_METADATA=str(metadata_file),
+        )
+        script = ('import sys; from bass_senpai.main import main; code = main(); '
+                  'print(sorted({"PIL", "requests"} & set(sys.modules))); sys.exit(code)')
+        result = subprocess.run(
+            [sys.executable, '-c', script, '--backend', 'playerctl', 'status', '--once', '--format', '{title} {percent}%'],
+            capture_output=True, text=True, env=env, cwd=Path(__file__).resolve().parent.parent, timeout=30
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.splitlines(), ['Test Title 15%', '[]'])
+
+
+class TestStartup(unittest.TestCase):
+    """Keep cold start to the first frame fast."""
+    
+    # Generous for loaded CI machines; loading PIL and requests alone used to take ~0.2 s
+    FIRST_FRAME_BUDGET = 2.0
+    IMPORT_BUDGET_US = 200000
+    
+    def test_package_exports_main(self):
+        """Test that `from bass_senpai import main` is the entry point function."""
+        import bass_senpai
+        from bass_senpai import main as entry_point
+        self.assertTrue(callable(entry_point))
+        self.assertIs(entry_point, main)
+        self.assertIs(bass_senpai.main, main)
+    
+    def test_first_frame_without_artwork_imports(self):
+        """Test that a track without artwork draws quickly and never imports PIL or requests."""
+        temp_dir = Path(tempfile.mkdtemp())
+        fake_playerctl.install(temp_dir)
+        metadata_file = temp_dir / 'metadata'
+        metadata_file.write_text(TRACK_LINE)
+        env = dict(
+            os.environ,
+            PATH=f"{temp_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+            HOME=str(temp_dir),
+            FAKE_PLAYERCTL_METADATA=str(metadata_file),
+        )
+        started = time.monotonic()
+        process = subprocess.Popen(
+            [sys.executable, '-X', 'importtime', '-c', 'import sys; from bass_senpai.main import main; sys.exit(main())',
+             '--backend', 'playerctl'],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, cwd=Path(__file__).resolve().parent.parent
+        )
+        output = b''
+        try:
+            while b'Test Title' not in output:
+                chunk = process.stdout.read1(65536)
+                if not chunk:
+                    break
+                output += chunk
+            first_frame = time.monotonic() - started
+            process.send_signal(signal.SIGINT)
+            _, stderr = process.communicate(timeout=10)
+        finally:
+            if process.poll() is None:
+                process.kill()
+        
+        self.assertIn(b'Test Title', output)
+        self.assertLess(first_frame, self.FIRST_FRAME_BUDGET)
+        
+        # "import time: self [us] | cumulative | imported package" per module
+        imports = {}
+        for line in stderr.decode().splitlines():
+            match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)', line)
+            if match:
+                imports[match.group(4)] = int(match.group(2))
+        self.assertNotIn('PIL', imports)
+        self.assertNotIn('requests', imports)
+        self.assertLess(imports['bass_senpai.main'], self.IMPORT_BUDGET_US)
 
 
 if __name__ == '__main__':